@@ -0,0 +1,189 @@
+"""
+Activity Views
+
+Field selection for GitHub activity responses.
+
+- A request names a view (summary, insights, full) or an explicit
+  `fields=` list of dotted paths, e.g. "summary,activity.commits.total",
+  checked against the response model so unknown fields are rejected
+- plan() works out which GitHub sub-fetches (ACTIVITY_SECTIONS) and whether
+  LLM refinement the selected fields depend on, so nothing else is fetched
+  or refined
+- project() copies only the selected paths out of a loaded payload, so only
+  they are serialized
+"""
+
+import typing
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional, Type
+
+from pydantic import BaseModel
+
+from github_integration import ACTIVITY_SECTIONS
+
+TOP_LEVEL_FIELDS = ("username", "user_info", "activity", "summary", "refined")
+
+VIEWS: Dict[str, List[str]] = {
+    # Profile card: counts only, no activity lists or refinement
+    "summary": ["username", "user_info", "summary"],
+    # Generated insights with the counts they were derived from
+    "insights": ["username", "summary", "refined"],
+    "full": list(TOP_LEVEL_FIELDS)
+}
+
+# Sub-fetch each summary counter comes from
+SUMMARY_SOURCES = {
+    "total_commits": "commits",
+    "total_prs": "pull_requests",
+    "total_issues": "issues",
+    "public_repos": "repositories",
+    "total_stars": "repositories"
+}
+
+
+@dataclass(frozen=True)
+class ActivityPlan:
+    """What to load for a selection of fields."""
+    sections: FrozenSet[str]
+    refine: bool
+
+
+def _unwrap_optional(annotation: Any) -> Any:
+    if typing.get_origin(annotation) is typing.Union:
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _check_path(model: Type[BaseModel], path: str) -> None:
+    """
+    Reject a dotted path that does not exist in the response model.
+
+    Nested models are checked field by field; below a dict or Any field
+    (free-form keys) anything is accepted, below other types nothing is.
+    """
+    current: Any = model
+    parts = path.split(".")
+    for depth, part in enumerate(parts):
+        if not (isinstance(current, type) and issubclass(current, BaseModel)):
+            parent = ".".join(parts[:depth])
+            raise ValueError(f"Unknown field '{path}' ('{parent}' has no sub-fields)")
+        if part not in current.model_fields:
+            prefix = ".".join(parts[:depth])
+            raise ValueError(
+                f"Unknown field '{path}' ({prefix + ' ' if prefix else ''}fields: "
+                f"{', '.join(current.model_fields)})"
+            )
+        current = _unwrap_optional(current.model_fields[part].annotation)
+        if current is Any or typing.get_origin(current) is dict or current is dict:
+            return
+
+
+def parse_fields(
+    fields: Optional[str],
+    view: str = "full",
+    model: Optional[Type[BaseModel]] = None
+) -> List[str]:
+    """
+    Resolve the requested fields.
+
+    Args:
+        fields: Comma-separated dotted paths (overrides `view` when given)
+        view: Named view from VIEWS
+        model: Response model the paths are validated against (top-level
+            names and activity sections only when omitted)
+
+    Returns:
+        Selected paths, in request order
+
+    Raises:
+        ValueError: Unknown view or field
+    """
+    if not fields:
+        if view not in VIEWS:
+            raise ValueError(f"Unknown view '{view}' (expected one of: {', '.join(VIEWS)})")
+        return VIEWS[view]
+
+    selected = []
+    for path in (part.strip() for part in fields.split(",")):
+        if not path:
+            continue
+        parts = path.split(".")
+        if parts[0] not in TOP_LEVEL_FIELDS:
+            raise ValueError(f"Unknown field '{path}' (top-level fields: {', '.join(TOP_LEVEL_FIELDS)})")
+        if parts[0] == "activity" and len(parts) > 1 and parts[1] not in ACTIVITY_SECTIONS[1:]:
+            raise ValueError(f"Unknown field '{path}' (activity sections: {', '.join(ACTIVITY_SECTIONS[1:])})")
+        if model is not None:
+            _check_path(model, path)
+        selected.append(path)
+    if not selected:
+        raise ValueError("No fields selected")
+    return selected
+
+
+def plan(fields: List[str], refine: bool = True) -> ActivityPlan:
+    """
+    Work out the sub-fetches and refinement a field selection needs.
+
+    Args:
+        fields: Paths from parse_fields
+        refine: Whether the caller allows LLM refinement
+
+    Returns:
+        ActivityPlan
+    """
+    sections = set()
+    needs_refined = False
+    for path in fields:
+        parts = path.split(".")
+        if parts[0] == "user_info":
+            sections.add("user_info")
+        elif parts[0] == "activity":
+            sections.update(parts[1:2] or ACTIVITY_SECTIONS[1:])
+        elif parts[0] == "summary":
+            if len(parts) > 1 and parts[1] in SUMMARY_SOURCES:
+                sections.add(SUMMARY_SOURCES[parts[1]])
+            elif len(parts) == 1:
+                sections.update(ACTIVITY_SECTIONS[1:])
+        elif parts[0] == "refined":
+            needs_refined = True
+
+    needs_refined = needs_refined and refine
+    if needs_refined:
+        # Refinement reads every activity section
+        sections.update(ACTIVITY_SECTIONS[1:])
+    return ActivityPlan(sections=frozenset(sections), refine=needs_refined)
+
+
+def _select(source: Dict[str, Any], target: Dict[str, Any], parts: List[str]) -> None:
+    key = parts[0]
+    if key not in source:
+        return
+    if len(parts) == 1 or not isinstance(source[key], dict):
+        target[key] = source[key]
+        return
+    child = target.setdefault(key, {})
+    # Skip when the whole parent was already selected (never write into
+    # the source, which is a cached payload)
+    if isinstance(child, dict) and child is not source[key]:
+        _select(source[key], child, parts[1:])
+
+
+def project(data: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    """
+    Copy the selected paths out of an activity payload.
+
+    Args:
+        data: Payload from the GitHub fetcher (optionally refined)
+        fields: Paths from parse_fields
+
+    Returns:
+        New dict with only the selected paths (plus "username")
+    """
+    if list(fields) == VIEWS["full"]:
+        return data
+    result: Dict[str, Any] = {"username": data.get("username")}
+    for path in fields:
+        _select(data, result, path.split("."))
+    return result
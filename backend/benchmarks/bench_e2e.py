@@ -0,0 +1,466 @@
+"""
+End-to-End Benchmark
+
+Drives every API endpoint under concurrency against local stand-ins for
+GitHub and OpenAI (mock_upstream.py, replaying the recorded fixtures in
+fixtures/github/), then micro-benchmarks the hot functions and database
+queries. Results are written as JSON so regressions show up between runs.
+
+Run from the backend directory:
+    python benchmarks/bench_e2e.py --requests 200 --concurrency 16
+    python benchmarks/bench_e2e.py --compare benchmarks/results/<previous>.json
+
+The API runs in-process (ASGI transport) by default, or behind uvicorn with
+--http. It uses a throwaway database and metadata directory, so the
+checked-in devscore.db is never touched. Mints use the placeholder Qubic
+client unless QUBIC_NODE_URL is set.
+
+Reported per endpoint: throughput, errors and p50/p95/p99 latency.
+Reported per micro-benchmark: ops/sec and p50/p95/p99 per call.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import httpx  # noqa: E402
+
+from mock_upstream import LatencyProfile, ServerThread, create_app  # noqa: E402
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# (method, path, JSON body, headers) for the i-th request of a scenario
+Call = Tuple[str, str, Optional[Dict[str, Any]], Optional[Dict[str, str]]]
+
+
+@dataclass
+class Scenario:
+    """One endpoint workload."""
+    name: str
+    call: Callable[[int], Call]
+    requests: Optional[int] = None  # Defaults to --requests
+
+
+def latency_summary(samples: List[float], scale: float) -> Dict[str, float]:
+    """Mean/p50/p95/p99/max of samples (seconds) in the given unit."""
+    from bench_llm_providers import percentile
+    return {
+        "mean": statistics.mean(samples) * scale if samples else 0.0,
+        "p50": percentile(samples, 50) * scale,
+        "p95": percentile(samples, 95) * scale,
+        "p99": percentile(samples, 99) * scale,
+        "max": max(samples) * scale if samples else 0.0
+    }
+
+
+def wallet(run_id: str, i: int) -> str:
+    """Unique Qubic-style address for this run."""
+    return f"QUBIC{run_id.upper()}{i:048X}"
+
+
+def mint_body(address: str, i: int) -> Dict[str, Any]:
+    return {
+        "wallet_address": address,
+        "score": 100 + i % 900,
+        "activity": {"commits": i % 200, "pull_requests": i % 30, "issues": i % 15, "discord_messages": i % 300}
+    }
+
+
+# Endpoint benchmark
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, requests: int, concurrency: int) -> Dict[str, Any]:
+    """Send a scenario's requests with bounded concurrency."""
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(index: int) -> None:
+        method, path, body, headers = scenario.call(index)
+        async with gate:
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body, headers=headers)
+                status = str(response.status_code) if response.status_code >= 400 else None
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - started)
+        if status:
+            errors[status] = errors.get(status, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": sum(errors.values()),
+        "error_statuses": errors,
+        "throughput_rps": requests / elapsed if elapsed else 0.0,
+        "latency_ms": latency_summary(latencies, 1000)
+    }
+
+
+async def seed(client: httpx.AsyncClient, run_id: str, users: int) -> Dict[str, List[str]]:
+    """Register users with GitHub accounts and scores, mint one NFT each and fetch their activity."""
+    wallets = [wallet(run_id, i) for i in range(users)]
+    state: Dict[str, List[str]] = {"wallets": wallets, "github": [], "tokens": [], "tx_hashes": [], "metadata": []}
+
+    for i, address in enumerate(wallets):
+        username = f"bench-{run_id}-{i}"
+        state["github"].append(username)
+        response = await client.post("/api/users/register", json={"wallet_address": address, "github_username": username})
+        response.raise_for_status()
+        (await client.get(f"/api/activity/{address}")).raise_for_status()
+
+    responses = await asyncio.gather(*(
+        client.post("/api/mint-nft", json=mint_body(address, i), headers={"Idempotency-Key": f"seed-{run_id}-{i}"})
+        for i, address in enumerate(wallets)
+    ))
+    for response in responses:
+        response.raise_for_status()
+        result = response.json()
+        state["tokens"].append(result["token_id"])
+        state["tx_hashes"].append(result["transaction_hash"])
+
+    # Warm the GitHub activity cache for the cached-path scenarios
+    await asyncio.gather(*(client.get(f"/api/github/activity/{username}") for username in state["github"]))
+
+    for token_id in state["tokens"]:
+        nft = (await client.get(f"/api/nfts/{token_id}")).json()
+        if nft.get("metadata_uri"):
+            state["metadata"].append(nft["metadata_uri"].rsplit("/", 1)[-1])
+    return state
+
+
+def build_scenarios(run_id: str, state: Dict[str, List[str]], has_indexer: bool) -> List[Scenario]:
+    """One scenario per endpoint (and per interesting path through it)."""
+    wallets, github, tokens = state["wallets"], state["github"], state["tokens"]
+    tx_hashes, metadata = state["tx_hashes"], state["metadata"] or ["missing.json"]
+    pick = lambda items, i: items[i % len(items)]  # noqa: E731
+
+    scenarios = [
+        Scenario("GET /", lambda i: ("GET", "/", None, None)),
+        Scenario("POST /api/users/register", lambda i: (
+            "POST", "/api/users/register", {"wallet_address": wallet(run_id, 100000 + i)}, None
+        )),
+        Scenario("GET /api/activity/{wallet}", lambda i: ("GET", f"/api/activity/{pick(wallets, i)}", None, None)),
+        Scenario("POST /api/calculate-score", lambda i: (
+            "POST", "/api/calculate-score", mint_body("", i)["activity"], None
+        )),
+        Scenario("POST /api/mint-nft", lambda i: (
+            "POST", "/api/mint-nft", mint_body(wallet(run_id, 200000 + i), i),
+            {"Idempotency-Key": f"bench-{run_id}-{i}"}
+        )),
+        Scenario("POST /api/mint-nft (replay)", lambda i: (
+            "POST", "/api/mint-nft", mint_body(pick(wallets, i), i % len(wallets)),
+            {"Idempotency-Key": f"seed-{run_id}-{i % len(wallets)}"}
+        )),
+        Scenario("POST /api/mint-nft/batch", lambda i: (
+            "POST", "/api/mint-nft/batch",
+            {"mints": [mint_body(wallet(run_id, 300000 + i * 10 + j), j) for j in range(10)]}, None
+        )),
+        Scenario("GET /api/mint-nft/queue", lambda i: ("GET", "/api/mint-nft/queue", None, None)),
+        Scenario("GET /api/transactions/{hash}", lambda i: (
+            "GET", f"/api/transactions/{pick(tx_hashes, i)}", None, None
+        )),
+        Scenario("GET /api/transactions/{hash}/wait", lambda i: (
+            "GET", f"/api/transactions/{pick(tx_hashes, i)}/wait?timeout=10", None, None
+        )),
+        Scenario("GET /api/nfts", lambda i: ("GET", f"/api/nfts?min_score={i % 500}&limit=50", None, None)),
+        Scenario("GET /api/nfts/owner/{wallet}", lambda i: (
+            "GET", f"/api/nfts/owner/{pick(wallets, i)}", None, None
+        )),
+        Scenario("GET /api/nfts/{token_id}", lambda i: ("GET", f"/api/nfts/{pick(tokens, i)}", None, None)),
+        Scenario("GET /api/nfts/{token_id}/metadata", lambda i: (
+            "GET", f"/api/nfts/{pick(tokens, i)}/metadata", None, None
+        )),
+        Scenario("GET /api/metadata/{name}", lambda i: ("GET", f"/api/metadata/{pick(metadata, i)}", None, None)),
+        Scenario("GET /api/indexer/status", lambda i: ("GET", "/api/indexer/status", None, None)),
+        Scenario("GET /api/wallets/{wallet}", lambda i: ("GET", f"/api/wallets/{pick(wallets, i)}", None, None)),
+        Scenario("GET /api/dashboard/{wallet}", lambda i: ("GET", f"/api/dashboard/{pick(wallets, i)}", None, None)),
+        Scenario("GET /api/leaderboard", lambda i: ("GET", "/api/leaderboard?limit=10", None, None)),
+        Scenario("POST /api/github/connect", lambda i: (
+            "POST", "/api/github/connect",
+            {"wallet_address": wallet(run_id, 400000 + i), "github_username": f"connect-{run_id}-{i}"}, None
+        )),
+        Scenario("GET /api/github/activity/{user} (cold)", lambda i: (
+            "GET", f"/api/github/activity/cold-{run_id}-{i}?refine=true", None, None
+        )),
+        Scenario("GET /api/github/activity/{user} (cached)", lambda i: (
+            "GET", f"/api/github/activity/{pick(github, i)}?refine=true", None, None
+        )),
+        Scenario("POST /api/github/sync-score/{wallet}", lambda i: (
+            "POST", f"/api/github/sync-score/{pick(wallets, i)}", None, None
+        )),
+        Scenario("GET /api/llm/status", lambda i: ("GET", "/api/llm/status", None, None)),
+        Scenario("GET /api/github/check/{wallet}", lambda i: ("GET", f"/api/github/check/{pick(wallets, i)}", None, None))
+    ]
+    if has_indexer:
+        scenarios.append(Scenario("GET /api/nfts/{token_id}/events", lambda i: (
+            "GET", f"/api/nfts/{pick(tokens, i)}/events", None, None
+        )))
+    return scenarios
+
+
+# Micro-benchmarks
+
+def micro(fn: Callable[[], Any], iterations: int) -> Dict[str, Any]:
+    """Time individual calls of fn."""
+    fn()  # Warm up caches and lazy imports
+    samples = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        call_started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - call_started)
+    elapsed = time.perf_counter() - started
+    return {
+        "iterations": iterations,
+        "ops_per_sec": iterations / elapsed if elapsed else 0.0,
+        "latency_us": latency_summary(samples, 1_000_000)
+    }
+
+
+def run_micro(api, state: Dict[str, List[str]], iterations: int) -> Dict[str, Dict[str, Any]]:
+    """Micro-benchmark score calculation, prompt formatting and the DB queries."""
+    from bench_llm_providers import load_fixtures
+    from llm_refiner import LLMRefiner
+    from llm_providers import create_provider
+    from score_engine import calculate_devscore
+
+    refiner = LLMRefiner(provider=create_provider("local"))
+    fixtures = load_fixtures()
+    address = state["wallets"][0]
+    token_id = state["tokens"][0] if state["tokens"] else ""
+
+    def leaderboard() -> None:
+        with api.get_db() as conn:
+            conn.execute(
+                """SELECT wallet_address, github_username, current_score, nft_token_id
+                   FROM users WHERE current_score > 0
+                   ORDER BY current_score DESC LIMIT ?""",
+                (10,)
+            ).fetchall()
+
+    def dashboard() -> None:
+        with api.get_db() as conn:
+            user = conn.execute("SELECT * FROM users WHERE wallet_address = ?", (address,)).fetchone()
+            conn.execute(
+                """SELECT * FROM activity_history WHERE user_id = ?
+                   ORDER BY recorded_at DESC LIMIT 1""",
+                (user["id"],)
+            ).fetchone()
+
+    def registry_get_uncached() -> None:
+        api.nft_registry.invalidate(token_ids=[token_id])
+        api.nft_registry.get(token_id)
+
+    results = {
+        "calculate_devscore": micro(lambda: calculate_devscore(150, 25, 12, 340), iterations * 10),
+        "db.leaderboard": micro(leaderboard, iterations),
+        "db.dashboard": micro(dashboard, iterations),
+        "db.registry.get (cached)": micro(lambda: api.nft_registry.get(token_id), iterations * 10),
+        "db.registry.get (uncached)": micro(registry_get_uncached, iterations),
+        "db.registry.by_owner": micro(lambda: api.nft_registry.by_owner(address), iterations),
+        "db.registry.above_score": micro(lambda: api.nft_registry.above_score(0, limit=50), iterations)
+    }
+    for name, activity in fixtures.items():
+        results[f"format_activity_detailed[{name}]"] = micro(
+            lambda activity=activity: refiner._format_activity_detailed(activity), iterations
+        )
+    return results
+
+
+# Run
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    run_id = uuid.uuid4().hex[:6]
+    workdir = tempfile.mkdtemp(prefix="devscore-bench-")
+    mock_url = f"http://127.0.0.1:{args.mock_port}"
+
+    # Point the API at the mock upstream and a throwaway state directory
+    # before it (or anything importing its modules, such as
+    # bench_llm_providers) is imported: configuration is read at import time
+    os.environ.update({
+        "GITHUB_API_URL": mock_url,
+        "GITHUB_API_TOKEN": "bench",
+        "LLM_PROVIDER": "openai_compatible",
+        "LLM_BASE_URL": f"{mock_url}/v1",
+        "METADATA_DIR": os.path.join(workdir, "metadata"),
+        "DEPLOYMENT_STATE_FILE": os.path.join(workdir, "deployments.json")
+    })
+    os.environ.setdefault("QUBIC_CONFIRMATION_SECONDS", str(args.confirmation_seconds))
+    os.chdir(workdir)
+
+    mock = create_app(
+        LatencyProfile(args.llm_latency_ms, jitter_ms=args.llm_latency_ms * 0.2),
+        LatencyProfile(args.github_latency_ms, jitter_ms=args.github_latency_ms * 0.2)
+    )
+    with ServerThread(mock, port=args.mock_port):
+        import main as api
+
+        if args.http:
+            server = ServerThread(api.app, port=args.port, lifespan="on").__enter__()
+            client = httpx.AsyncClient(base_url=server.url, timeout=60)
+        else:
+            await api.startup_event()
+            client = httpx.AsyncClient(transport=httpx.ASGITransport(app=api.app), base_url="http://bench", timeout=60)
+
+        try:
+            state = await seed(client, run_id, args.users)
+            endpoints = {}
+            for scenario in build_scenarios(run_id, state, api.chain_indexer is not None):
+                if args.only and not any(term in scenario.name for term in args.only):
+                    continue
+                result = await run_scenario(client, scenario, scenario.requests or args.requests, args.concurrency)
+                endpoints[scenario.name] = result
+                print_endpoint(scenario.name, result)
+            micro_results = {} if args.skip_micro else run_micro(api, state, args.iterations)
+        finally:
+            await client.aclose()
+            if args.http:
+                server.__exit__(None, None, None)
+            else:
+                await api.shutdown_event()
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "mode": "http" if args.http else "asgi",
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "users": args.users,
+            "github_latency_ms": args.github_latency_ms,
+            "llm_latency_ms": args.llm_latency_ms,
+            "qubic_node": os.getenv("QUBIC_NODE_URL")
+        },
+        "endpoints": endpoints,
+        "micro": micro_results
+    }
+
+
+# Reporting
+
+def print_endpoint(name: str, result: Dict[str, Any]) -> None:
+    latency = result["latency_ms"]
+    print(
+        f"{name:<44} {result['throughput_rps']:>9.1f} req/s  "
+        f"p50 {latency['p50']:>8.2f} ms  p95 {latency['p95']:>8.2f} ms  "
+        f"p99 {latency['p99']:>8.2f} ms  errors {result['errors']}"
+    )
+
+
+def print_micro(results: Dict[str, Dict[str, Any]]) -> None:
+    for name, result in results.items():
+        latency = result["latency_us"]
+        print(
+            f"{name:<44} {result['ops_per_sec']:>11.0f} ops/s  "
+            f"p50 {latency['p50']:>9.2f} us  p95 {latency['p95']:>9.2f} us  p99 {latency['p99']:>9.2f} us"
+        )
+
+
+def compare(current: Dict[str, Any], previous: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Print the change against a previous run.
+
+    Args:
+        current: Results of this run
+        previous: Results loaded from an earlier JSON file
+        threshold: Relative slowdown reported as a regression (0.1 = 10%)
+
+    Returns:
+        Names of the regressed endpoints/micro-benchmarks
+    """
+    regressions = []
+    print(f"\nCompared with {previous['meta'].get('git_commit')} ({previous['meta'].get('timestamp')}):")
+
+    def report(name: str, unit: str, before: float, after: float, lower_is_better: bool) -> None:
+        if not before:
+            return
+        change = (after - before) / before
+        slower = change > threshold if lower_is_better else change < -threshold
+        flag = "  REGRESSION" if slower else ""
+        if slower:
+            regressions.append(name)
+        print(f"  {name:<44} {before:>10.2f} -> {after:>10.2f} {unit:<6} {change:>+7.1%}{flag}")
+
+    for name, result in current["endpoints"].items():
+        before = previous.get("endpoints", {}).get(name)
+        if before:
+            report(name, "p95 ms", before["latency_ms"]["p95"], result["latency_ms"]["p95"], True)
+    for name, result in current["micro"].items():
+        before = previous.get("micro", {}).get(name)
+        if before:
+            report(name, "p50 us", before["latency_us"]["p50"], result["latency_us"]["p50"], True)
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="End-to-end API benchmark")
+    parser.add_argument("--requests", type=int, default=100, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients")
+    parser.add_argument("--users", type=int, default=20, help="Users seeded before the run")
+    parser.add_argument("--iterations", type=int, default=2000, help="Micro-benchmark iterations")
+    parser.add_argument("--github-latency-ms", type=float, default=50.0, help="Mock GitHub latency per request")
+    parser.add_argument("--llm-latency-ms", type=float, default=300.0, help="Mock OpenAI latency per completion")
+    parser.add_argument("--confirmation-seconds", type=float, default=0.5,
+                        help="Placeholder Qubic confirmation time (QUBIC_CONFIRMATION_SECONDS)")
+    parser.add_argument("--mock-port", type=int, default=8089)
+    parser.add_argument("--http", action="store_true", help="Serve the API with uvicorn instead of in-process")
+    parser.add_argument("--port", type=int, default=8099, help="API port with --http")
+    parser.add_argument("--only", nargs="+", help="Only run endpoints whose name contains one of these")
+    parser.add_argument("--skip-micro", action="store_true", help="Skip the micro-benchmarks")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/e2e-<commit>-<time>.json)")
+    parser.add_argument("--compare", help="Previous results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown flagged as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 on regressions")
+    args = parser.parse_args()
+    # The run changes into a temporary directory; resolve paths first
+    output = Path(args.output).resolve() if args.output else None
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else None
+
+    results = asyncio.run(run(args))
+    if results["micro"]:
+        print()
+        print_micro(results["micro"])
+
+    output = output or RESULTS_DIR / (
+        f"e2e-{results['meta']['git_commit'] or 'unknown'}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"\nResults written to {output}")
+
+    if baseline:
+        regressions = compare(results, baseline, args.threshold)
+        if regressions and args.fail_on_regression:
+            sys.exit(1)
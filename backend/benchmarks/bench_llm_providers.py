@@ -0,0 +1,153 @@
+"""
+LLM Provider Benchmark
+
+Compares latency and throughput of the LLM providers on canned activity
+fixtures, driving the same refinement path the API uses.
+
+Run from the backend directory:
+    python benchmarks/bench_llm_providers.py --requests 200 --concurrency 32
+
+Providers benchmarked:
+- local: in-process provider (extractive model, or llama.cpp if configured)
+- openai_compatible: HTTP provider against the mock upstream server
+  (or a real llama.cpp/vLLM server with --base-url)
+- openai: only with --include-openai and OPENAI_API_KEY set
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Any, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from llm_providers import LLMProvider, create_provider  # noqa: E402
+from llm_refiner import LLMRefiner, refinement_cache  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+
+def load_fixtures() -> Dict[str, Dict[str, Any]]:
+    """Load the canned activity fixtures by name."""
+    return {
+        path.stem: json.loads(path.read_text())
+        for path in sorted(FIXTURES_DIR.glob("activity_*.json"))
+    }
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+async def run_provider(
+    provider: LLMProvider,
+    fixtures: Dict[str, Dict[str, Any]],
+    requests: int,
+    concurrency: int
+) -> Dict[str, Any]:
+    """Drive `requests` refinements through a provider with bounded concurrency."""
+    refiner = LLMRefiner(provider=provider)
+    payloads = list(fixtures.values())
+    latencies: List[float] = []
+    failures = 0
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(index: int) -> None:
+        nonlocal failures
+        activity = dict(payloads[index % len(payloads)])
+        # Unique username per request so the refinement cache never hits
+        activity["username"] = f"{activity.get('username')}-{index}"
+        async with gate:
+            started = time.perf_counter()
+            result = await refiner.refine_activity_summary(activity, premium=True)
+            latencies.append(time.perf_counter() - started)
+            if not result.get("refined"):
+                failures += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+    await provider.aclose()
+
+    return {
+        "provider": provider.name,
+        "model": provider.model,
+        "requests": requests,
+        "concurrency": concurrency,
+        "max_provider_concurrency": provider.max_concurrency,
+        "failures": failures,
+        "throughput_rps": requests / elapsed if elapsed else 0.0,
+        "latency_ms": {
+            "mean": statistics.mean(latencies) * 1000 if latencies else 0.0,
+            "p50": percentile(latencies, 50) * 1000,
+            "p95": percentile(latencies, 95) * 1000,
+            "p99": percentile(latencies, 99) * 1000
+        }
+    }
+
+
+async def main(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    fixtures = load_fixtures()
+    results = []
+
+    providers = [create_provider("local", max_concurrency=args.provider_concurrency)]
+    if args.include_openai and os.getenv("OPENAI_API_KEY"):
+        providers.append(create_provider(
+            "openai", api_key=os.getenv("OPENAI_API_KEY"), max_concurrency=args.provider_concurrency
+        ))
+
+    for provider in providers:
+        refinement_cache.clear()
+        results.append(await run_provider(provider, fixtures, args.requests, args.concurrency))
+
+    refinement_cache.clear()
+    if args.base_url:
+        http_provider = create_provider("openai_compatible", max_concurrency=args.provider_concurrency)
+        http_provider.base_url = args.base_url.rstrip("/")
+        results.append(await run_provider(http_provider, fixtures, args.requests, args.concurrency))
+    else:
+        from mock_upstream import LatencyProfile, ServerThread, create_app
+        app = create_app(LatencyProfile(args.latency_ms, jitter_ms=args.latency_ms * 0.2))
+        with ServerThread(app, port=args.mock_port) as server:
+            http_provider = create_provider("openai_compatible", max_concurrency=args.provider_concurrency)
+            http_provider.base_url = f"{server.url}/v1"
+            results.append(await run_provider(http_provider, fixtures, args.requests, args.concurrency))
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark LLM providers")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent callers")
+    parser.add_argument("--provider-concurrency", type=int, default=8, help="Per-provider in-flight limit")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="Mock upstream base latency")
+    parser.add_argument("--mock-port", type=int, default=8089)
+    parser.add_argument("--base-url", help="Benchmark a real OpenAI-compatible server instead of the mock")
+    parser.add_argument("--include-openai", action="store_true", help="Also benchmark the OpenAI API")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(main(args))
+
+    for result in results:
+        latency = result["latency_ms"]
+        print(
+            f"{result['provider']:<18} {result['throughput_rps']:>9.1f} req/s  "
+            f"p50 {latency['p50']:>8.2f} ms  p95 {latency['p95']:>8.2f} ms  "
+            f"p99 {latency['p99']:>8.2f} ms  failures {result['failures']}"
+        )
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
@@ -0,0 +1,187 @@
+"""
+Qubic Node Benchmark
+
+Drives the mint, transfer and confirmation paths against a simulated Qubic
+node (qubic_node_sim.py), either in-process or over HTTP on loopback.
+
+Run from the backend directory:
+    python benchmarks/bench_qubic_node.py --mints 1000 --concurrency 64
+    python benchmarks/bench_qubic_node.py --mode http --latency-ms 20 --failure-rate 0.01
+
+Reported per path: throughput, p50/p95/p99 latency and failures. Mints go
+through MintQueue, so batching is measured as well.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from mint_queue import MintQueue  # noqa: E402
+from qubic_client import AsyncQubicClient, HTTPNodeClient, NFTMintRequest, QubicClient  # noqa: E402
+from qubic_node_sim import LatencyModel, SimulatedQubicNode, create_node_app  # noqa: E402
+from bench_llm_providers import percentile  # noqa: E402
+
+
+def summarize(name: str, latencies: List[float], failures: int, elapsed: float) -> Dict[str, Any]:
+    """Build a result record for one path."""
+    count = len(latencies) + failures
+    return {
+        "path": name,
+        "operations": count,
+        "failures": failures,
+        "throughput_ops": count / elapsed if elapsed else 0.0,
+        "latency_ms": {
+            "p50": percentile(latencies, 50) * 1000,
+            "p95": percentile(latencies, 95) * 1000,
+            "p99": percentile(latencies, 99) * 1000
+        }
+    }
+
+
+async def run(client: AsyncQubicClient, args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """Mint, confirm and transfer through the given client."""
+    queue = MintQueue(client, max_batch_size=args.batch_size, max_wait_ms=args.batch_window_ms)
+    gate = asyncio.Semaphore(args.concurrency)
+    owner = "QUBIC" + "A" * 56
+
+    # Mint path
+    mint_latencies: List[float] = []
+    minted: List[Dict] = []
+    submitted_at: Dict[str, float] = {}
+    mint_failures = 0
+
+    async def mint(index: int) -> None:
+        nonlocal mint_failures
+        request = NFTMintRequest(owner, index % 1000, index, index % 50, index % 20, index % 300)
+        async with gate:
+            started = time.perf_counter()
+            try:
+                result = await queue.submit(request)
+            except Exception:
+                mint_failures += 1
+                return
+            mint_latencies.append(time.perf_counter() - started)
+            minted.append(result)
+            submitted_at.setdefault(result["transaction_hash"], time.perf_counter())
+
+    started = time.perf_counter()
+    await asyncio.gather(*(mint(i) for i in range(args.mints)))
+    results = [summarize("mint", mint_latencies, mint_failures, time.perf_counter() - started)]
+    results[0]["batches"] = queue.batches
+    await queue.close()
+
+    # Confirmation path: poll all submitted bundles until final
+    confirm_latencies: List[float] = []
+    pending = set(submitted_at)
+    started = time.perf_counter()
+    deadline = started + args.confirm_timeout
+    polls = 0
+    while pending and time.perf_counter() < deadline:
+        try:
+            statuses = await client.get_transaction_statuses(list(pending))
+        except Exception:
+            statuses = {}
+        polls += 1
+        now = time.perf_counter()
+        for tx_hash, status in statuses.items():
+            if status["status"] in ("confirmed", "failed"):
+                pending.discard(tx_hash)
+                confirm_latencies.append(now - submitted_at[tx_hash])
+        if pending:
+            await asyncio.sleep(args.poll_interval)
+    results.append(summarize("confirmation", confirm_latencies, len(pending), time.perf_counter() - started))
+    results[-1]["status_polls"] = polls
+
+    # Transfer path
+    transfer_latencies: List[float] = []
+    transfer_failures = 0
+
+    async def transfer(result: Dict) -> None:
+        nonlocal transfer_failures
+        async with gate:
+            started = time.perf_counter()
+            try:
+                await client.transfer_nft(result["token_id"], owner, "QUBIC" + "B" * 56, "bench-key")
+            except Exception:
+                transfer_failures += 1
+                return
+            transfer_latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(transfer(r) for r in minted[:args.transfers]))
+    results.append(summarize("transfer", transfer_latencies, transfer_failures, time.perf_counter() - started))
+    return results
+
+
+def main(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    node = SimulatedQubicNode(
+        block_time=args.block_time,
+        latency=LatencyModel(args.latency_ms, args.latency_sigma),
+        failure_rate=args.failure_rate,
+        mempool_limit=args.mempool_limit,
+        max_txs_per_block=args.max_txs_per_block,
+        seed=args.seed
+    ).start()
+
+    try:
+        if args.mode == "inproc":
+            client = AsyncQubicClient(QubicClient(node=node))
+            results = asyncio.run(run(client, args))
+        else:
+            from mock_upstream import ServerThread
+            with ServerThread(create_node_app(node), port=args.port) as server:
+                client = AsyncQubicClient(QubicClient(node=HTTPNodeClient(server.url)))
+                results = asyncio.run(run(client, args))
+                client.client.node.close()
+    finally:
+        node.stop()
+
+    for result in results:
+        result["mode"] = args.mode
+    results.append({"path": "node", **node.status()})
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark mint/transfer/confirmation against a simulated Qubic node")
+    parser.add_argument("--mode", choices=["inproc", "http"], default="inproc")
+    parser.add_argument("--mints", type=int, default=500)
+    parser.add_argument("--transfers", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--batch-window-ms", type=float, default=20.0)
+    parser.add_argument("--block-time", type=float, default=0.2)
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Median node RPC latency")
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--mempool-limit", type=int, default=10000)
+    parser.add_argument("--max-txs-per-block", type=int, default=1000)
+    parser.add_argument("--poll-interval", type=float, default=0.1)
+    parser.add_argument("--confirm-timeout", type=float, default=30.0)
+    parser.add_argument("--port", type=int, default=8999)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = main(args)
+
+    for result in results:
+        if "latency_ms" not in result:
+            print(json.dumps(result))
+            continue
+        latency = result["latency_ms"]
+        print(
+            f"{result['path']:<13} {result['throughput_ops']:>9.1f} ops/s  "
+            f"p50 {latency['p50']:>8.2f} ms  p95 {latency['p95']:>8.2f} ms  "
+            f"p99 {latency['p99']:>8.2f} ms  failures {result['failures']}"
+        )
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
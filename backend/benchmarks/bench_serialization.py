@@ -0,0 +1,144 @@
+"""
+Serialization Benchmark
+
+Measures the cost of turning endpoint return values into response bytes,
+comparing FastAPI's default path with the one the API now uses.
+
+Run from the backend directory:
+    python benchmarks/bench_serialization.py --iterations 2000
+
+Payloads:
+- activity_small / activity_large: the canned activity fixtures refined with
+  the local provider, i.e. a full /api/github/activity response
+- nfts_1000: 1000 DevScoreNFT records, a full /api/nfts page
+
+Variants:
+- default: jsonable_encoder + json.dumps (FastAPI without a response model,
+  Starlette JSONResponse)
+- response_model: the route's compiled response-model serializer +
+  FastJSONResponse (what the API does now)
+- dumps: FastJSONResponse encoding alone, for reference
+- gzip / br: compressing the encoded body (br only when brotli is installed)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+
+def measure(fn: Callable[[], Any], iterations: int) -> Dict[str, float]:
+    """Median microseconds per call of fn."""
+    fn()
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return {"median_us": statistics.median(samples) * 1_000_000, "ops_per_sec": 1 / statistics.mean(samples)}
+
+
+def route_field(app, path: str):
+    """Response field of the GET route registered at `path`."""
+    for route in app.routes:
+        if getattr(route, "path", None) == path and "GET" in route.methods:
+            return route.response_field
+    raise KeyError(path)
+
+
+async def build_payloads() -> Dict[str, Any]:
+    from bench_llm_providers import load_fixtures
+    from llm_providers import create_provider
+    from llm_refiner import LLMRefiner
+    from qubic_client import DevScoreNFT
+
+    refiner = LLMRefiner(provider=create_provider("local"))
+    payloads = {}
+    for name, activity in load_fixtures().items():
+        payloads[name] = ("/api/github/activity/{github_username}", await refiner.enhance_activity_data(activity))
+    nfts = [
+        DevScoreNFT(
+            token_id=f"DEVSCORE-{i:08d}", owner="QUBIC" + f"{i:056d}", score=500 + i % 500,
+            commits=i % 300, pull_requests=i % 40, issues=i % 20, discord_messages=i % 900,
+            minted_at=1_700_000_000 + i, metadata_uri=f"ipfs://devscore/{i:064x}.json", transaction_hash=f"{i:064x}"
+        )
+        for i in range(1000)
+    ]
+    payloads["nfts_1000"] = ("/api/nfts", {"nfts": nfts})
+    return payloads
+
+
+def run(iterations: int) -> List[Dict[str, Any]]:
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.routing import serialize_response
+
+    import main as api
+    import responses
+    from nft_registry import nft_to_dict
+
+    loop = asyncio.new_event_loop()
+    payloads = loop.run_until_complete(build_payloads())
+    results = []
+
+    for name, (path, content) in payloads.items():
+        field = route_field(api.app, path)
+        # Without a response model the endpoints returned plain dicts
+        legacy = {"nfts": [nft_to_dict(nft) for nft in content["nfts"]]} if name.startswith("nfts") else content
+
+        def default() -> bytes:
+            return json.dumps(
+                jsonable_encoder(legacy), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+            ).encode("utf-8")
+
+        def response_model() -> bytes:
+            return responses.dumps(loop.run_until_complete(serialize_response(field=field, response_content=content)))
+
+        body = response_model()
+        variants = {
+            "default": default,
+            "response_model": response_model,
+            "dumps": lambda: responses.dumps(legacy)
+        }
+        encodings = ["gzip"] + (["br"] if responses.brotli is not None else [])
+        for encoding in encodings:
+            variants[encoding] = lambda encoding=encoding: responses.compress(body, encoding)
+
+        for variant, fn in variants.items():
+            output = fn()
+            results.append({"payload": name, "variant": variant, "bytes": len(output), **measure(fn, iterations)})
+
+    loop.close()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark response serialization")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    output = Path(args.output).resolve() if args.output else None
+    # Importing main opens devscore.db and the metadata store in the cwd
+    workdir = tempfile.mkdtemp(prefix="devscore-bench-")
+    os.environ.setdefault("METADATA_DIR", os.path.join(workdir, "metadata"))
+    os.chdir(workdir)
+
+    results = run(args.iterations)
+    for result in results:
+        print(
+            f"{result['payload']:<16} {result['variant']:<15} {result['bytes']:>9} B "
+            f"{result['median_us']:>10.1f} us {result['ops_per_sec']:>10.0f} ops/s"
+        )
+
+    if output:
+        output.write_text(json.dumps(results, indent=2))
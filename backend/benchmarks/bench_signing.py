@@ -0,0 +1,121 @@
+"""
+Signing Benchmark
+
+Measures signatures/sec of the signing subsystem against the previous
+JSON-based scheme, for single transfers and for 64-mint bundles.
+
+Run from the backend directory:
+    python benchmarks/bench_signing.py --transactions 20000 --processes 4
+
+Variants:
+- legacy: json.dumps(sort_keys=True) + sha256(f"{key}:{json}") per call,
+  plus a second JSON encoding for the transaction hash
+- single: SigningKey.sign_transaction per call (one encoding, cached key)
+- batch: sign_batch in-process
+- pool: sign_batch over a process pool (--processes > 1)
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from qubic_client import NFTMintRequest, QubicClient  # noqa: E402
+from signing import get_signing_key, sign_batch  # noqa: E402
+
+PRIVATE_KEY = hashlib.sha256(b"bench-wallet").hexdigest()
+
+
+def legacy_sign(private_key: str, transaction: Dict) -> tuple:
+    """Previous scheme: JSON-encode for the signature and again for the hash."""
+    data_str = json.dumps(transaction, sort_keys=True)
+    signature = hashlib.sha256(f"{private_key}:{data_str}".encode()).hexdigest()
+    tx_hash = hashlib.sha256(json.dumps(transaction, separators=(",", ":")).encode()).hexdigest()
+    return tx_hash, signature
+
+
+def transfers(count: int) -> List[Dict]:
+    return [
+        {
+            "type": "NFT_TRANSFER",
+            "token_id": f"{i:016X}",
+            "from": "QUBIC" + "A" * 56,
+            "to": "QUBIC" + "B" * 56,
+            "timestamp": 1700000000 + i
+        }
+        for i in range(count)
+    ]
+
+
+def mint_bundles(count: int, size: int = 64) -> List[Dict]:
+    client = QubicClient()
+    bundles = []
+    for b in range(count):
+        mints = []
+        for i in range(size):
+            request = NFTMintRequest("QUBIC" + "A" * 56, (b * size + i) % 1000, i, i % 40, i % 15, i % 300)
+            token_id = client._new_token_id(request.wallet_address, request.score)
+            mints.append({
+                "token_id": token_id,
+                "owner": request.wallet_address,
+                "metadata": client._build_nft_metadata(token_id, request, 1700000000),
+                "metadata_uri": ""
+            })
+        bundles.append({"type": "NFT_MINT_BATCH", "network": "testnet", "mints": mints})
+    return bundles
+
+
+def measure(fn: Callable[[], Any], count: int) -> float:
+    """Run fn once and return operations per second."""
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    return count / elapsed if elapsed else 0.0
+
+
+def run_workload(name: str, transactions: List[Dict], processes: int) -> List[Dict[str, Any]]:
+    key = get_signing_key(PRIVATE_KEY)
+    count = len(transactions)
+    variants = {
+        "legacy": lambda: [legacy_sign(PRIVATE_KEY, tx) for tx in transactions],
+        "single": lambda: [key.sign_transaction(tx) for tx in transactions],
+        "batch": lambda: sign_batch(PRIVATE_KEY, transactions, processes=0)
+    }
+    if processes > 1:
+        # Warm the pool so process start-up is not measured
+        sign_batch(PRIVATE_KEY, transactions[:processes], processes=processes, min_pool_batch=0)
+        variants["pool"] = lambda: sign_batch(PRIVATE_KEY, transactions, processes=processes, min_pool_batch=0)
+
+    results = []
+    for variant, fn in variants.items():
+        results.append({
+            "workload": name,
+            "variant": variant,
+            "transactions": count,
+            "signatures_per_sec": measure(fn, count)
+        })
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark transaction signing")
+    parser.add_argument("--transactions", type=int, default=20000, help="Transfer transactions to sign")
+    parser.add_argument("--bundles", type=int, default=200, help="64-mint bundles to sign")
+    parser.add_argument("--processes", type=int, default=0, help="Process pool size for the pool variant")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = run_workload("transfer", transfers(args.transactions), args.processes)
+    results += run_workload("mint_bundle_64", mint_bundles(args.bundles), args.processes)
+
+    for result in results:
+        print(f"{result['workload']:<16} {result['variant']:<8} {result['signatures_per_sec']:>12.0f} sig/s")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
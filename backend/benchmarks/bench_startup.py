@@ -0,0 +1,152 @@
+"""
+Startup Benchmark
+
+Measures how long a fresh API process takes to import and to become ready,
+i.e. the cold-start cost of a new replica.
+
+Run from the backend directory:
+    python benchmarks/bench_startup.py --runs 5
+
+Reported (median over --runs fresh processes):
+- import: `import main` in a new interpreter, plus the slowest modules by
+  cumulative import time (python -X importtime)
+- ready: from spawning uvicorn to the first successful GET /
+- startup / warm-up: the app's own timings from /metrics
+
+Runs share one throwaway working directory, so only the first run creates
+the database schema; pass --fresh-db to start every run with an empty one.
+"""
+
+import argparse
+import json
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+_IMPORTTIME = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_import(workdir: str) -> Dict[str, Any]:
+    """Import main in a new interpreter and collect -X importtime output."""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=workdir, env={**os.environ, "PYTHONPATH": str(BACKEND_DIR)},
+        capture_output=True, text=True, check=True
+    )
+    elapsed = time.perf_counter() - started
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME.match(line)
+        if match:
+            # Keep top-level entries of each import (least indented)
+            modules[match.group(4)] = (int(match.group(2)) / 1e6, len(match.group(3)))
+    return {"process_seconds": elapsed, "modules": modules}
+
+
+def measure_ready(workdir: str, timeout: float = 30.0) -> Dict[str, Any]:
+    """Spawn uvicorn and poll until the API answers."""
+    port = free_port()
+    url = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=workdir, env={**os.environ, "PYTHONPATH": str(BACKEND_DIR)},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while True:
+            if time.perf_counter() - started > timeout:
+                raise TimeoutError(f"API not ready after {timeout}s")
+            try:
+                with urllib.request.urlopen(f"{url}/", timeout=1) as response:
+                    if response.status == 200:
+                        break
+            except OSError:
+                time.sleep(0.005)
+        ready = time.perf_counter() - started
+
+        # Let the background warm-up finish, then read the app's own timings
+        time.sleep(1.0)
+        with urllib.request.urlopen(f"{url}/metrics", timeout=5) as response:
+            text = response.read().decode()
+        timings = {
+            name: float(value)
+            for name, value in re.findall(r"^devscore_startup_(\S+) (\S+)$", text, re.MULTILINE)
+        }
+        return {"ready_seconds": ready, "app": timings}
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def run(runs: int, top: int, fresh_db: bool) -> Dict[str, Any]:
+    imports: List[Dict[str, Any]] = []
+    readies: List[Dict[str, Any]] = []
+    shared_dir = tempfile.mkdtemp(prefix="devscore-startup-")
+    for _ in range(runs):
+        workdir = tempfile.mkdtemp(prefix="devscore-startup-") if fresh_db else shared_dir
+        os.environ.setdefault("METADATA_DIR", os.path.join(workdir, "metadata"))
+        imports.append(measure_import(workdir))
+        readies.append(measure_ready(workdir))
+
+    # Median cumulative import time of each first-party or top-level module
+    names = set().union(*(result["modules"] for result in imports))
+    modules = []
+    for name in names:
+        samples = [result["modules"][name] for result in imports if name in result["modules"]]
+        depth = min(indent for _, indent in samples)
+        if depth <= 3 or (BACKEND_DIR / f"{name}.py").exists():
+            modules.append((name, statistics.median(seconds for seconds, _ in samples)))
+    modules.sort(key=lambda item: item[1], reverse=True)
+
+    app_keys = set().union(*(result["app"] for result in readies))
+    return {
+        "runs": runs,
+        "import_process_seconds": statistics.median(result["process_seconds"] for result in imports),
+        "ready_seconds": statistics.median(result["ready_seconds"] for result in readies),
+        "app_timings": {
+            key: statistics.median(result["app"].get(key, 0.0) for result in readies) for key in sorted(app_keys)
+        },
+        "slowest_imports": dict(modules[:top])
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark API import and startup time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to report")
+    parser.add_argument("--fresh-db", action="store_true", help="Start every run with an empty database")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    output = Path(args.output).resolve() if args.output else None
+    results = run(args.runs, args.top, args.fresh_db)
+
+    print(f"import main (new interpreter)  {results['import_process_seconds'] * 1000:8.1f} ms")
+    print(f"spawn -> first 200 OK          {results['ready_seconds'] * 1000:8.1f} ms")
+    for key, value in results["app_timings"].items():
+        print(f"  app {key:<26} {value * 1000:8.1f} ms")
+    print("slowest imports (cumulative):")
+    for name, seconds in results["slowest_imports"].items():
+        print(f"  {name:<28} {seconds * 1000:8.1f} ms")
+
+    if output:
+        output.write_text(json.dumps(results, indent=2))
@@ -0,0 +1,190 @@
+"""
+Mock Upstream Server
+
+Local stand-in for the OpenAI chat completions API (and any
+OpenAI-compatible server such as llama.cpp or vLLM) and for the GitHub
+REST endpoints the API calls, with configurable latency, used by the
+benchmarks.
+
+GitHub responses are replayed from the recorded fixtures in
+fixtures/github/ (recorded for the user "octo-dev"; the requested username
+is substituted).
+
+Run standalone:
+    python benchmarks/mock_upstream.py --port 8089 --latency-ms 300 --github-latency-ms 80
+
+Then point the API at it:
+    LLM_PROVIDER=openai_compatible LLM_BASE_URL=http://127.0.0.1:8089/v1
+    GITHUB_API_URL=http://127.0.0.1:8089 GITHUB_API_TOKEN=mock
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request, Response
+
+GITHUB_FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures" / "github"
+# Login the GitHub fixtures were recorded for
+RECORDED_LOGIN = "octo-dev"
+
+
+class LatencyProfile:
+    """Simulated upstream latency: base + per-output-token cost + jitter."""
+
+    def __init__(self, base_ms: float = 300.0, per_token_ms: float = 0.0, jitter_ms: float = 0.0):
+        self.base_ms = base_ms
+        self.per_token_ms = per_token_ms
+        self.jitter_ms = jitter_ms
+
+    def sample(self, output_tokens: int = 0) -> float:
+        """Return a latency in seconds."""
+        jitter = random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(0.0, self.base_ms + self.per_token_ms * output_tokens + jitter) / 1000.0
+
+
+def load_github_fixtures() -> Dict[str, str]:
+    """Load the recorded GitHub responses as raw JSON text by fixture name."""
+    return {path.stem: path.read_text() for path in sorted(GITHUB_FIXTURES_DIR.glob("*.json"))}
+
+
+def create_app(
+    latency: Optional[LatencyProfile] = None,
+    github_latency: Optional[LatencyProfile] = None
+) -> FastAPI:
+    """
+    Create the mock upstream application.
+
+    Args:
+        latency: Latency profile applied to every completion
+        github_latency: Latency profile applied to every GitHub request
+
+    Returns:
+        FastAPI app serving /v1/chat/completions and the GitHub REST routes
+    """
+    app = FastAPI(title="DevScore mock upstream")
+    app.state.latency = latency or LatencyProfile()
+    app.state.github_latency = github_latency or LatencyProfile(base_ms=50.0)
+    app.state.requests = 0
+    app.state.github_requests = 0
+
+    fixtures = load_github_fixtures()
+    commits_by_repo = json.loads(fixtures["commits"])
+
+    async def replay(body: str, username: str) -> Response:
+        app.state.github_requests += 1
+        await asyncio.sleep(app.state.github_latency.sample())
+        return Response(content=body.replace(RECORDED_LOGIN, username), media_type="application/json")
+
+    @app.get("/users/{username}")
+    async def github_user(username: str):
+        return await replay(fixtures["user"], username)
+
+    @app.get("/users/{username}/repos")
+    async def github_repos(username: str):
+        return await replay(fixtures["repos"], username)
+
+    @app.get("/users/{username}/starred")
+    async def github_starred(username: str):
+        return await replay(fixtures["starred"], username)
+
+    @app.get("/repos/{owner}/{repo}/commits")
+    async def github_commits(owner: str, repo: str):
+        return await replay(json.dumps(commits_by_repo.get(repo, [])), owner)
+
+    @app.get("/search/issues")
+    async def github_search_issues(q: str = ""):
+        username = RECORDED_LOGIN
+        for term in q.split():
+            if term.startswith("author:"):
+                username = term[len("author:"):]
+        name = "search_pull_requests" if "is:pr" in q.split() else "search_issues"
+        return await replay(fixtures[name], username)
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        app.state.requests += 1
+        messages = body.get("messages", [])
+        prompt = messages[-1].get("content", "") if messages else ""
+
+        if "Format as JSON" in prompt:
+            content = json.dumps({
+                "summary": "Mock analysis of the developer profile.",
+                "technical_skills": ["Python", "TypeScript"],
+                "top_contributions": ["mock-repo (10 commits)"],
+                "development_patterns": ["Consistent small commits"],
+                "impact": "Moderate",
+                "recommendations": ["Write more documentation"],
+                "expertise_areas": ["Backend Development"]
+            })
+        else:
+            content = "Mock developer shipped steady contributions this month."
+
+        completion_tokens = max(1, len(content) // 4)
+        await asyncio.sleep(app.state.latency.sample(completion_tokens))
+
+        return {
+            "id": f"chatcmpl-mock-{app.state.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "mock-model"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": max(1, len(prompt) // 4),
+                "completion_tokens": completion_tokens,
+                "total_tokens": max(1, len(prompt) // 4) + completion_tokens
+            }
+        }
+
+    return app
+
+
+class ServerThread:
+    """Runs a uvicorn server for an ASGI app on a background thread."""
+
+    def __init__(self, app, host: str = "127.0.0.1", port: int = 8089, lifespan: str = "off"):
+        self.host = host
+        self.port = port
+        config = uvicorn.Config(app, host=host, port=port, log_level="warning", lifespan=lifespan)
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def __enter__(self) -> "ServerThread":
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.should_exit = True
+        self.thread.join(timeout=5)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the mock upstream server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--per-token-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--github-latency-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    profile = LatencyProfile(args.latency_ms, args.per_token_ms, args.jitter_ms)
+    github_profile = LatencyProfile(args.github_latency_ms, jitter_ms=args.jitter_ms)
+    uvicorn.run(create_app(profile, github_profile), host=args.host, port=args.port)
@@ -0,0 +1,407 @@
+"""
+Chain Event Indexer
+
+Tails blocks from a Qubic node and indexes DevScore contract events
+(NFTMinted, Transfer, ScoreUpdated) into the local database.
+
+- Blocks are fetched in batches starting after the last checkpoint; each
+  batch is applied in one database transaction together with the new
+  checkpoint, so a crash never leaves a half-indexed batch
+- Recent block hashes are kept so reorganisations are detected by parent
+  hash mismatch; the index is then rolled back to the common ancestor (at
+  most `reorg_depth` blocks) and the affected tokens are rebuilt from the
+  surviving events; tokens whose mint was rolled back are removed
+- Ownership and score are upserted into the `nfts` table, so the NFT
+  registry serves chain state at database speed
+
+Runs inside the API (started when a node is configured) or standalone:
+    python chain_indexer.py --node-url http://127.0.0.1:8999
+"""
+
+import asyncio
+import json
+import logging
+import os
+from typing import Callable, Dict, List, Optional, Tuple
+
+import metrics
+import tracing
+from nft_registry import NFTRegistry
+
+logger = logging.getLogger(__name__)
+
+INDEXER_BATCH_SIZE = int(os.getenv("INDEXER_BATCH_SIZE", "100"))
+INDEXER_POLL_INTERVAL_SECONDS = float(os.getenv("INDEXER_POLL_INTERVAL_SECONDS", "1.0"))
+# Deepest reorganisation the indexer can undo
+INDEXER_REORG_DEPTH = int(os.getenv("INDEXER_REORG_DEPTH", "20"))
+
+INDEXED_EVENTS = ("NFTMinted", "Transfer", "ScoreUpdated")
+
+
+def _attribute(metadata: Dict, trait_type: str, default: int = 0):
+    for attribute in metadata.get("attributes", []):
+        if attribute.get("trait_type") == trait_type:
+            return attribute.get("value", default)
+    return default
+
+
+class ChainIndexer:
+    """Indexes contract events from a node into the local database."""
+
+    def __init__(
+        self,
+        node,
+        registry: NFTRegistry,
+        db: Callable,
+        name: str = "devscore",
+        batch_size: int = INDEXER_BATCH_SIZE,
+        poll_interval: float = INDEXER_POLL_INTERVAL_SECONDS,
+        reorg_depth: int = INDEXER_REORG_DEPTH
+    ):
+        """
+        Initialize the indexer.
+
+        Args:
+            node: Node RPC client (SimulatedQubicNode or HTTPNodeClient)
+            registry: NFT registry whose cache is invalidated on updates
+            db: Database connection context manager factory (main.get_db)
+            name: Checkpoint name (one per indexed contract/network)
+            batch_size: Maximum blocks fetched and applied per round
+            poll_interval: Seconds to wait when caught up with the tip
+            reorg_depth: Number of recent block hashes kept for reorg handling
+        """
+        self.node = node
+        self.registry = registry
+        self.db = db
+        self.name = name
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.reorg_depth = reorg_depth
+
+        self._task: Optional[asyncio.Task] = None
+
+        self.blocks_indexed = 0
+        self.events_indexed = 0
+        self.reorgs = 0
+        self.last_error: Optional[str] = None
+
+    # Background loop
+
+    async def start(self) -> None:
+        """Start tailing the chain in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                indexed = await asyncio.to_thread(self.sync_once)
+                self.last_error = None
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = str(e)
+                logger.exception("Chain indexer error: %s", e)
+                indexed = 0
+            # Keep going while catching up; wait once at the tip
+            if indexed < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
+
+    # Indexing
+
+    def checkpoint(self) -> Tuple[int, Optional[str]]:
+        """Return the last indexed (height, block hash)."""
+        with self.db() as conn:
+            row = conn.execute(
+                "SELECT height, block_hash FROM indexer_checkpoints WHERE name = ?",
+                (self.name,)
+            ).fetchone()
+        return (row["height"], row["block_hash"]) if row else (-1, None)
+
+    @metrics.timed("indexer.sync", trace=False)
+    def sync_once(self) -> int:
+        """
+        Fetch and index the next batch of blocks.
+
+        Returns:
+            Number of blocks indexed (0 when caught up or after a rollback)
+        """
+        # Polling at the tip is not traced
+        with tracing.suppressed():
+            height, block_hash = self.checkpoint()
+            blocks = self.node.get_blocks(height + 1, self.batch_size)
+        if not blocks:
+            return 0
+
+        with tracing.span("indexer.sync", root=True, attributes={
+            "indexer.from_height": blocks[0]["height"],
+            "indexer.blocks": len(blocks)
+        }):
+            if block_hash is not None and blocks[0]["parent_hash"] != block_hash:
+                self._handle_reorg(height)
+                return 0
+
+            self._apply_blocks(blocks)
+        return len(blocks)
+
+    def _apply_blocks(self, blocks: List[Dict]) -> None:
+        """Index a batch of consecutive blocks and advance the checkpoint."""
+        token_ids, owners = set(), set()
+        events = 0
+        with self.db() as conn:
+            for block in blocks:
+                conn.execute(
+                    "INSERT OR REPLACE INTO indexed_blocks (height, block_hash, parent_hash) VALUES (?, ?, ?)",
+                    (block["height"], block["hash"], block["parent_hash"])
+                )
+                for index, event in enumerate(block.get("events", [])):
+                    if event.get("event") not in INDEXED_EVENTS:
+                        continue
+                    conn.execute(
+                        """INSERT INTO chain_events (height, block_hash, log_index, event, token_id, tx_hash, data)
+                           VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                        (block["height"], block["hash"], index, event["event"], event.get("token_id"),
+                         event.get("tx_hash"), json.dumps(event))
+                    )
+                    owners.update(self._apply_event(conn, event))
+                    token_ids.add(event.get("token_id"))
+                    events += 1
+
+            tip = blocks[-1]
+            conn.execute(
+                """INSERT INTO indexer_checkpoints (name, height, block_hash, updated_at)
+                   VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                   ON CONFLICT(name) DO UPDATE SET height = excluded.height,
+                       block_hash = excluded.block_hash, updated_at = CURRENT_TIMESTAMP""",
+                (self.name, tip["height"], tip["hash"])
+            )
+            conn.execute(
+                "DELETE FROM indexed_blocks WHERE height < ?",
+                (tip["height"] - self.reorg_depth,)
+            )
+            conn.commit()
+
+        self.registry.invalidate(token_ids, owners)
+        self.blocks_indexed += len(blocks)
+        self.events_indexed += events
+
+    def _apply_event(self, conn, event: Dict) -> List[str]:
+        """Upsert one event into the nfts table; return the owners it touched."""
+        token_id = event.get("token_id")
+        kind = event["event"]
+
+        if kind == "NFTMinted":
+            metadata = event.get("metadata", {})
+            conn.execute(
+                """INSERT INTO nfts (token_id, owner, score, commits, pull_requests, issues,
+                                     discord_messages, minted_at, metadata_uri, transaction_hash)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(token_id) DO UPDATE SET owner = excluded.owner,
+                       score = excluded.score, transaction_hash = excluded.transaction_hash,
+                       metadata_uri = COALESCE(NULLIF(excluded.metadata_uri, ''), nfts.metadata_uri),
+                       updated_at = CURRENT_TIMESTAMP""",
+                (token_id, event["owner"], event.get("score", 0),
+                 _attribute(metadata, "Commits"), _attribute(metadata, "Pull Requests"),
+                 _attribute(metadata, "Issues"), _attribute(metadata, "Discord Messages"),
+                 metadata.get("minted_at"), event.get("metadata_uri", ""), event.get("tx_hash"))
+            )
+            return [event["owner"]]
+
+        if kind == "Transfer":
+            conn.execute(
+                "UPDATE nfts SET owner = ?, updated_at = CURRENT_TIMESTAMP WHERE token_id = ?",
+                (event["to"], token_id)
+            )
+            return [event["from"], event["to"]]
+
+        if kind == "ScoreUpdated":
+            row = conn.execute("SELECT owner FROM nfts WHERE token_id = ?", (token_id,)).fetchone()
+            conn.execute(
+                "UPDATE nfts SET score = ?, updated_at = CURRENT_TIMESTAMP WHERE token_id = ?",
+                (event["score"], token_id)
+            )
+            return [row["owner"]] if row else []
+
+        return []
+
+    # Reorg handling
+
+    def _handle_reorg(self, height: int) -> None:
+        """Roll the index back to the last block still on the node's chain."""
+        ancestor = self._find_common_ancestor(height)
+        logger.warning("Chain reorg detected at height %d; rolling back to %d", height, ancestor)
+        self.rollback(ancestor)
+        self.reorgs += 1
+
+    def _find_common_ancestor(self, height: int) -> int:
+        """Walk back through recent indexed blocks until hashes match the node."""
+        floor = max(height - self.reorg_depth, -1)
+        with self.db() as conn:
+            rows = conn.execute(
+                "SELECT height, block_hash FROM indexed_blocks WHERE height > ? AND height <= ? ORDER BY height DESC",
+                (floor, height)
+            ).fetchall()
+        if not rows:
+            return floor
+
+        remote = {
+            block["height"]: block["hash"]
+            for block in self.node.get_blocks(rows[-1]["height"], len(rows))
+        }
+        for row in rows:
+            if remote.get(row["height"]) == row["block_hash"]:
+                return row["height"]
+        # No common block within the safe depth: rewind all of it
+        return rows[-1]["height"] - 1
+
+    def _rewind_target(self, height: int) -> Tuple[int, Optional[str]]:
+        """
+        Nearest block at or below `height` to resume from, with its hash.
+
+        Prefers an indexed block; below the retained window (deeper than
+        `reorg_depth`, assumed final) the node's block at `height` is used.
+        """
+        with self.db() as conn:
+            row = conn.execute(
+                "SELECT height, block_hash FROM indexed_blocks WHERE height <= ? ORDER BY height DESC LIMIT 1",
+                (height,)
+            ).fetchone()
+        if row:
+            return row["height"], row["block_hash"]
+        if height >= 0:
+            blocks = self.node.get_blocks(height, 1)
+            if blocks:
+                return height, blocks[0]["hash"]
+        return -1, None
+
+    @metrics.timed("indexer.rollback")
+    def rollback(self, height: int) -> None:
+        """
+        Discard everything indexed above a height and rebuild affected tokens.
+
+        Tokens whose NFTMinted event was discarded are deleted; the others
+        are rebuilt from their surviving events. The checkpoint moves to the
+        nearest known block at or below `height`.
+
+        Args:
+            height: Last height to keep
+        """
+        height, block_hash = self._rewind_target(height)
+        with self.db() as conn:
+            affected = [
+                row["token_id"] for row in conn.execute(
+                    "SELECT DISTINCT token_id FROM chain_events WHERE height > ?", (height,)
+                ).fetchall()
+            ]
+            owners = set()
+            for token_id in affected:
+                row = conn.execute("SELECT owner FROM nfts WHERE token_id = ?", (token_id,)).fetchone()
+                if row:
+                    owners.add(row["owner"])
+
+            conn.execute("DELETE FROM chain_events WHERE height > ?", (height,))
+            conn.execute("DELETE FROM indexed_blocks WHERE height > ?", (height,))
+
+            for token_id in affected:
+                events = [
+                    json.loads(row["data"]) for row in conn.execute(
+                        "SELECT data FROM chain_events WHERE token_id = ? ORDER BY height, log_index",
+                        (token_id,)
+                    ).fetchall()
+                ]
+                if not any(event["event"] == "NFTMinted" for event in events):
+                    # Never minted on the surviving chain
+                    conn.execute("DELETE FROM nfts WHERE token_id = ?", (token_id,))
+                    continue
+                # Replay the surviving events (the mint resets owner and score)
+                for event in events:
+                    owners.update(self._apply_event(conn, event))
+
+            if height >= 0:
+                conn.execute(
+                    """INSERT INTO indexer_checkpoints (name, height, block_hash, updated_at)
+                       VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                       ON CONFLICT(name) DO UPDATE SET height = excluded.height,
+                           block_hash = excluded.block_hash, updated_at = CURRENT_TIMESTAMP""",
+                    (self.name, height, block_hash)
+                )
+            else:
+                conn.execute("DELETE FROM indexer_checkpoints WHERE name = ?", (self.name,))
+            conn.commit()
+
+        self.registry.invalidate(affected, owners)
+
+    # Queries
+
+    def token_events(self, token_id: str) -> List[Dict]:
+        """
+        Get the indexed event history of a token, oldest first.
+
+        Args:
+            token_id: NFT token ID
+
+        Returns:
+            List of event dictionaries
+        """
+        with self.db() as conn:
+            rows = conn.execute(
+                "SELECT data FROM chain_events WHERE token_id = ? ORDER BY height, log_index",
+                (token_id,)
+            ).fetchall()
+        return [json.loads(row["data"]) for row in rows]
+
+    def stats(self) -> Dict:
+        """Return indexing progress and counters."""
+        height, block_hash = self.checkpoint()
+        return {
+            "name": self.name,
+            "running": self._task is not None and not self._task.done(),
+            "checkpoint_height": height,
+            "checkpoint_hash": block_hash,
+            "blocks_indexed": self.blocks_indexed,
+            "events_indexed": self.events_indexed,
+            "reorgs": self.reorgs,
+            "last_error": self.last_error,
+            "batch_size": self.batch_size,
+            "reorg_depth": self.reorg_depth
+        }
+
+
+if __name__ == "__main__":
+    import argparse
+    from main import get_db, init_db, nft_registry
+    from qubic_client import HTTPNodeClient, QUBIC_NODE_URL
+
+    parser = argparse.ArgumentParser(description="Index DevScore contract events from a Qubic node")
+    parser.add_argument("--node-url", default=QUBIC_NODE_URL, required=QUBIC_NODE_URL is None)
+    parser.add_argument("--batch-size", type=int, default=INDEXER_BATCH_SIZE)
+    parser.add_argument("--poll-interval", type=float, default=INDEXER_POLL_INTERVAL_SECONDS)
+    args = parser.parse_args()
+
+    init_db()
+    indexer = ChainIndexer(
+        HTTPNodeClient(args.node_url),
+        nft_registry,
+        get_db,
+        batch_size=args.batch_size,
+        poll_interval=args.poll_interval
+    )
+
+    async def run() -> None:
+        await indexer.start()
+        await indexer._task
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        print(json.dumps(indexer.stats()))
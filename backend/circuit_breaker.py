@@ -0,0 +1,185 @@
+"""
+Circuit Breaker
+
+Protects the API from a failing or slow upstream (e.g. OpenAI).
+
+States:
+- CLOSED: calls flow normally; outcomes are recorded in a rolling window
+- OPEN: calls are rejected immediately until the cool-down expires
+- HALF_OPEN: a limited number of probe calls decide whether to close again
+
+The breaker trips when, over the last `window_size` calls (and at least
+`min_calls`), the failure rate or the slow-call rate reaches its threshold.
+"""
+
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Dict, Optional
+
+
+class CircuitState(Enum):
+    """Circuit breaker states."""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open."""
+
+
+class CircuitBreaker:
+    """Rolling-window circuit breaker for a single upstream."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        slow_call_seconds: float = 10.0,
+        slow_call_rate_threshold: float = 0.8,
+        window_size: int = 20,
+        min_calls: int = 5,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 1
+    ):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            name: Upstream name (for status reporting)
+            failure_rate_threshold: Failure ratio that opens the circuit
+            slow_call_seconds: Calls taking longer than this count as slow
+            slow_call_rate_threshold: Slow-call ratio that opens the circuit
+            window_size: Number of recent calls considered
+            min_calls: Minimum calls in the window before tripping
+            open_seconds: Cool-down before probing in half-open state
+            half_open_max_calls: Concurrent probe calls allowed when half-open
+        """
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+
+        self._window: deque = deque(maxlen=window_size)  # (failed, slow)
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._half_open_in_flight = 0
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state, moving OPEN -> HALF_OPEN once the cool-down expires."""
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _maybe_half_open(self) -> None:
+        if self._state is CircuitState.OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = CircuitState.HALF_OPEN
+            self._half_open_in_flight = 0
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a call may proceed, reserving a probe slot if half-open.
+
+        Every allowed call must be followed by exactly one of record_success,
+        record_failure or release, otherwise a half-open probe slot leaks.
+
+        Returns:
+            True if the call may be made
+        """
+        with self._lock:
+            self._maybe_half_open()
+            if self._state is CircuitState.CLOSED:
+                return True
+            if self._state is CircuitState.HALF_OPEN and self._half_open_in_flight < self.half_open_max_calls:
+                self._half_open_in_flight += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self, duration: float) -> None:
+        """
+        Record a completed call.
+
+        Args:
+            duration: Call duration in seconds (slow calls count towards tripping)
+        """
+        slow = duration >= self.slow_call_seconds
+        with self._lock:
+            if self._state is CircuitState.HALF_OPEN:
+                self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+                if slow:
+                    self._open()
+                else:
+                    self._state = CircuitState.CLOSED
+                    self._window.clear()
+                return
+            self._window.append((False, slow))
+            self._evaluate()
+
+    def record_failure(self) -> None:
+        """Record a failed call."""
+        with self._lock:
+            if self._state is CircuitState.HALF_OPEN:
+                self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+                self._open()
+                return
+            self._window.append((True, False))
+            self._evaluate()
+
+    def release(self) -> None:
+        """
+        End an admitted call that produced no outcome (e.g. it was cancelled).
+
+        Frees the half-open probe slot without closing or re-opening the
+        circuit; nothing is recorded in the window.
+        """
+        with self._lock:
+            if self._state is CircuitState.HALF_OPEN:
+                self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+
+    def _evaluate(self) -> None:
+        calls = len(self._window)
+        if self._state is not CircuitState.CLOSED or calls < self.min_calls:
+            return
+        failures = sum(1 for failed, _ in self._window if failed)
+        slow = sum(1 for _, is_slow in self._window if is_slow)
+        if failures / calls >= self.failure_rate_threshold or slow / calls >= self.slow_call_rate_threshold:
+            self._open()
+
+    def _open(self) -> None:
+        self._state = CircuitState.OPEN
+        self._opened_at = time.monotonic()
+        self._window.clear()
+
+    def reset(self) -> None:
+        """Force the circuit closed and forget recorded calls."""
+        with self._lock:
+            self._state = CircuitState.CLOSED
+            self._window.clear()
+            self._half_open_in_flight = 0
+
+    def status(self) -> Dict[str, Any]:
+        """Return a snapshot of the breaker for diagnostics."""
+        state = self.state
+        with self._lock:
+            calls = len(self._window)
+            failures = sum(1 for failed, _ in self._window if failed)
+            retry_in: Optional[float] = None
+            if state is CircuitState.OPEN:
+                retry_in = max(0.0, self.open_seconds - (time.monotonic() - self._opened_at))
+            return {
+                "name": self.name,
+                "state": state.value,
+                "window_calls": calls,
+                "window_failures": failures,
+                "rejected": self.rejected,
+                "retry_in_seconds": retry_in
+            }
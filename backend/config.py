@@ -0,0 +1,472 @@
+"""
+Configuration
+
+Single entry point for loading the environment and the typed settings
+built from it.
+
+- load_env() reads .env into os.environ once per process; every module that
+  reads configuration imports this module first, so settings are read
+  after .env is applied regardless of import order
+- Variables already set in the environment take precedence over .env
+- python-dotenv is optional: without it only the process environment is used
+- `settings` holds the validated Settings (scoring weights, LLM, GitHub,
+  cache sizes/TTLs, timeouts, pool and batch sizes, file locations, admin
+  token); modules read it as
+  `config.settings.<section>.<field>` at use time, never copy it at import
+- reload() re-reads .env and the environment, validates, swaps `settings`
+  and calls the on_reload() callbacks, which push new values into
+  long-lived objects (caches, providers, queues). Invalid settings are
+  rejected as a whole and the current ones stay in effect
+- Fields marked restart-only keep their startup value until the worker
+  restarts; reload() reports them instead of applying them
+"""
+
+import dataclasses
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set
+
+ENV_FILE = os.getenv("DEVSCORE_ENV_FILE")  # Default: nearest .env from the backend directory up
+
+logger = logging.getLogger(__name__)
+
+_loaded = False
+# Variables set from the .env file (not by the process environment), so a
+# reload can update or drop them without overriding the real environment
+_env_file_keys: Set[str] = set()
+
+
+def load_env(path: Optional[str] = ENV_FILE) -> None:
+    """
+    Load .env into the process environment (first call only).
+
+    Args:
+        path: .env file to read (default: search upwards from this directory)
+    """
+    global _loaded
+    if _loaded:
+        return
+    _loaded = True
+    _apply_environ(_read_env_file(path))
+
+
+def _read_env_file(path: Optional[str]) -> Dict[str, str]:
+    """The environment as it would be with `path` (re)applied."""
+    try:
+        from dotenv import dotenv_values
+    except ImportError:
+        return dict(os.environ)
+    values = {key: value for key, value in dotenv_values(path).items() if value is not None}
+    environ = {key: value for key, value in os.environ.items() if key not in _env_file_keys}
+    for key, value in values.items():
+        environ.setdefault(key, value)
+    return environ
+
+
+def _apply_environ(environ: Dict[str, str]) -> None:
+    for key in set(os.environ) - environ.keys():
+        del os.environ[key]
+    for key, value in environ.items():
+        if os.environ.get(key) != value:
+            os.environ[key] = value
+            _env_file_keys.add(key)
+    _env_file_keys.intersection_update(environ)
+
+
+class SettingsError(ValueError):
+    """Raised when the environment holds invalid settings (lists every problem)."""
+
+
+def _secret(default: Optional[str] = None) -> Any:
+    return field(default=default, metadata={"secret": True})
+
+
+def _restart_only(default: Any) -> Any:
+    return field(default=default, metadata={"restart": True})
+
+
+DEFAULT_SCORE_WEIGHTS = {
+    "commit": 2,           # Each commit is worth 2 points
+    "pull_request": 5,     # PRs are worth more due to code review value
+    "issue": 3,            # Issues show community engagement
+    "discord_message": 0.5 # Community participation (capped contribution)
+}
+
+DEFAULT_MAX_SCORES = {
+    "commits": 400,        # Max 200 commits at 2 points each
+    "pull_requests": 250,  # Max 50 PRs at 5 points each
+    "issues": 150,         # Max 50 issues at 3 points each
+    "discord": 200,        # Max 400 messages at 0.5 points each
+}
+
+_BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_METADATA_DIR = os.path.join(_BACKEND_DIR, "metadata")
+DEFAULT_DEPLOYMENT_STATE_FILE = os.path.join(_BACKEND_DIR, "deployments.json")
+
+
+@dataclass(frozen=True)
+class ScoringSettings:
+    """DevScore weights and caps (SCORE_WEIGHTS / SCORE_MAX_SCORES as key=value lists)."""
+    weights: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_SCORE_WEIGHTS))
+    max_scores: Dict[str, int] = field(default_factory=lambda: dict(DEFAULT_MAX_SCORES))
+    max_total: int = 1000
+
+
+@dataclass(frozen=True)
+class LLMSettings:
+    """LLM provider, model, limits and refinement cache."""
+    provider: str = "openai"                     # openai | openai_compatible | local
+    model: Optional[str] = None                  # Provider default when unset
+    base_url: str = "http://127.0.0.1:8080/v1"   # openai_compatible only
+    api_key: Optional[str] = _secret()           # Bearer token for openai_compatible
+    openai_api_key: Optional[str] = _secret()
+    local_model_path: Optional[str] = _restart_only(None)
+    max_concurrency: int = 8                     # In-flight completions per provider
+    timeout_seconds: float = 20.0
+    max_output_tokens: int = 1500
+    prompt_token_budget: int = 1200
+    premium_only: bool = False
+    hedge_seconds: float = 0.0
+    cache_size: int = 512
+    cache_ttl_seconds: float = 3600.0
+    slow_call_seconds: float = 10.0
+    breaker_open_seconds: float = 30.0
+
+
+@dataclass(frozen=True)
+class GitHubSettings:
+    """GitHub API access and the activity response cache."""
+    api_token: Optional[str] = _secret()
+    api_url: str = "https://api.github.com"
+    timeout_seconds: float = 5.0
+    activity_cache_ttl_seconds: float = 30.0
+    activity_cache_size: int = 256
+
+
+@dataclass(frozen=True)
+class CacheSettings:
+    """In-process read caches."""
+    nft_size: int = 10000
+    # NFT entries are invalidated on every write, so the TTL only bounds
+    # staleness from writers in other processes
+    nft_ttl_seconds: float = 300.0
+    metadata_size: int = 2048
+    wallet_size: int = 10000
+    wallet_ttl_seconds: float = 2.0
+    wallet_refresh_interval_seconds: float = 1.0
+    # Hot (internally used) addresses read within this window are refreshed
+    # in the background
+    wallet_hot_window_seconds: float = 30.0
+
+
+@dataclass(frozen=True)
+class QubicSettings:
+    """Node access, mint batching and transaction signing."""
+    node_timeout_seconds: float = 10.0
+    mint_batch_size: int = 64
+    mint_batch_window_ms: float = 50.0
+    signing_pool_processes: int = 0
+    # Batches at least this large are split across the process pool (if enabled)
+    signing_pool_min_batch: int = 2048
+    signing_key_cache_size: int = _restart_only(1024)
+    tx_poll_interval_seconds: float = 1.0
+    tx_status_batch_size: int = 100
+    # Give up on transactions the node does not know about after this long
+    tx_unknown_timeout_seconds: float = 300.0
+
+
+@dataclass(frozen=True)
+class NFTSettings:
+    """NFT metadata storage and mint request deduplication."""
+    metadata_dir: str = _restart_only(DEFAULT_METADATA_DIR)
+    # Public prefix under which stored objects are served (see /api/metadata)
+    metadata_base_url: str = _restart_only("/api/metadata")
+    idempotency_window_seconds: int = 86400
+
+
+@dataclass(frozen=True)
+class DatabaseSettings:
+    """SQLite database."""
+    path: str = _restart_only("devscore.db")
+
+
+@dataclass(frozen=True)
+class DeploySettings:
+    """Contract deployments (deploy_orchestrator.py)."""
+    state_file: str = DEFAULT_DEPLOYMENT_STATE_FILE
+
+
+@dataclass(frozen=True)
+class ServerSettings:
+    """Launcher (serve.py), startup, admin access and cross-worker state."""
+    host: str = _restart_only("0.0.0.0")
+    port: int = _restart_only(8000)
+    workers: int = _restart_only(0)                    # 0: one per available CPU
+    # SQLite file shared by the workers; unset: single-worker, in-process state
+    shared_state_path: Optional[str] = _restart_only(None)
+    # Load clients and tokenizers in the background once the worker is ready
+    startup_warmup: bool = _restart_only(True)
+    # Token required by the /admin endpoints (disabled when unset)
+    admin_token: Optional[str] = _secret()
+
+
+@dataclass(frozen=True)
+class Settings:
+    """All tunable settings, grouped by subsystem."""
+    scoring: ScoringSettings = field(default_factory=ScoringSettings)
+    llm: LLMSettings = field(default_factory=LLMSettings)
+    github: GitHubSettings = field(default_factory=GitHubSettings)
+    cache: CacheSettings = field(default_factory=CacheSettings)
+    qubic: QubicSettings = field(default_factory=QubicSettings)
+    nft: NFTSettings = field(default_factory=NFTSettings)
+    database: DatabaseSettings = field(default_factory=DatabaseSettings)
+    deploy: DeploySettings = field(default_factory=DeploySettings)
+    server: ServerSettings = field(default_factory=ServerSettings)
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str] = os.environ) -> "Settings":
+        """
+        Build and validate settings from environment variables.
+
+        Args:
+            environ: Variables to read (default: the process environment)
+
+        Returns:
+            Settings
+
+        Raises:
+            SettingsError: One or more variables are malformed or out of range
+        """
+        env = _EnvReader(environ)
+        scoring = ScoringSettings(
+            weights=env.mapping("SCORE_WEIGHTS", DEFAULT_SCORE_WEIGHTS, float),
+            max_scores=env.mapping("SCORE_MAX_SCORES", DEFAULT_MAX_SCORES, int),
+            max_total=env.integer("SCORE_MAX_TOTAL", 1000, minimum=1)
+        )
+        llm = LLMSettings(
+            provider=env.choice("LLM_PROVIDER", "openai", ("openai", "openai_compatible", "local")),
+            model=env.text("LLM_MODEL"),
+            base_url=env.text("LLM_BASE_URL", "http://127.0.0.1:8080/v1"),
+            api_key=env.text("LLM_API_KEY"),
+            openai_api_key=env.text("OPENAI_API_KEY"),
+            local_model_path=env.text("LOCAL_MODEL_PATH"),
+            max_concurrency=env.integer("LLM_MAX_CONCURRENCY", 8, minimum=1),
+            timeout_seconds=env.number("LLM_TIMEOUT_SECONDS", 20.0, positive=True),
+            max_output_tokens=env.integer("LLM_MAX_OUTPUT_TOKENS", 1500, minimum=1),
+            prompt_token_budget=env.integer("LLM_PROMPT_TOKEN_BUDGET", 1200, minimum=1),
+            premium_only=env.flag("LLM_PREMIUM_ONLY", False),
+            hedge_seconds=env.number("LLM_HEDGE_SECONDS", 0.0),
+            cache_size=env.integer("LLM_CACHE_SIZE", 512, minimum=1),
+            cache_ttl_seconds=env.number("LLM_CACHE_TTL_SECONDS", 3600.0),
+            slow_call_seconds=env.number("LLM_SLOW_CALL_SECONDS", 10.0, positive=True),
+            breaker_open_seconds=env.number("LLM_BREAKER_OPEN_SECONDS", 30.0)
+        )
+        github = GitHubSettings(
+            api_token=env.text("GITHUB_API_TOKEN"),
+            api_url=env.text("GITHUB_API_URL", "https://api.github.com"),
+            timeout_seconds=env.number("GITHUB_TIMEOUT_SECONDS", 5.0, positive=True),
+            activity_cache_ttl_seconds=env.number("GITHUB_ACTIVITY_CACHE_TTL", 30.0),
+            activity_cache_size=env.integer("GITHUB_ACTIVITY_CACHE_SIZE", 256, minimum=1)
+        )
+        cache = CacheSettings(
+            nft_size=env.integer("NFT_CACHE_SIZE", 10000, minimum=1),
+            nft_ttl_seconds=env.number("NFT_CACHE_TTL_SECONDS", 300.0),
+            metadata_size=env.integer("METADATA_CACHE_SIZE", 2048, minimum=1),
+            wallet_size=env.integer("WALLET_CACHE_SIZE", 10000, minimum=1),
+            wallet_ttl_seconds=env.number("WALLET_CACHE_TTL_SECONDS", 2.0),
+            wallet_refresh_interval_seconds=env.number("WALLET_REFRESH_INTERVAL_SECONDS", 1.0, positive=True),
+            wallet_hot_window_seconds=env.number("WALLET_HOT_WINDOW_SECONDS", 30.0)
+        )
+        qubic = QubicSettings(
+            node_timeout_seconds=env.number("QUBIC_NODE_TIMEOUT_SECONDS", 10.0, positive=True),
+            mint_batch_size=env.integer("MINT_BATCH_SIZE", 64, minimum=1),
+            mint_batch_window_ms=env.number("MINT_BATCH_WINDOW_MS", 50.0),
+            signing_pool_processes=env.integer("SIGNING_POOL_PROCESSES", 0, minimum=0),
+            signing_pool_min_batch=env.integer("SIGNING_POOL_MIN_BATCH", 2048, minimum=1),
+            signing_key_cache_size=env.integer("SIGNING_KEY_CACHE_SIZE", 1024, minimum=1),
+            tx_poll_interval_seconds=env.number("TX_POLL_INTERVAL_SECONDS", 1.0, positive=True),
+            tx_status_batch_size=env.integer("TX_STATUS_BATCH_SIZE", 100, minimum=1),
+            tx_unknown_timeout_seconds=env.number("TX_UNKNOWN_TIMEOUT_SECONDS", 300.0, positive=True)
+        )
+        nft = NFTSettings(
+            metadata_dir=env.text("METADATA_DIR", DEFAULT_METADATA_DIR),
+            metadata_base_url=env.text("METADATA_BASE_URL", "/api/metadata").rstrip("/"),
+            idempotency_window_seconds=env.integer("IDEMPOTENCY_WINDOW_SECONDS", 86400, minimum=1)
+        )
+        database = DatabaseSettings(path=env.text("DATABASE_PATH", "devscore.db"))
+        deploy = DeploySettings(state_file=env.text("DEPLOYMENT_STATE_FILE", DEFAULT_DEPLOYMENT_STATE_FILE))
+        server = ServerSettings(
+            host=env.text("HOST", "0.0.0.0"),
+            port=env.integer("PORT", 8000, minimum=1),
+            workers=env.integer("WEB_CONCURRENCY", 0, minimum=0),
+            shared_state_path=env.text("SHARED_STATE_PATH"),
+            startup_warmup=env.flag("STARTUP_WARMUP", True),
+            admin_token=env.text("ADMIN_TOKEN")
+        )
+        if env.errors:
+            raise SettingsError("Invalid settings: " + "; ".join(env.errors))
+        return cls(
+            scoring=scoring, llm=llm, github=github, cache=cache, qubic=qubic, nft=nft,
+            database=database, deploy=deploy, server=server
+        )
+
+    def to_dict(self, redact: bool = True) -> Dict[str, Dict[str, Any]]:
+        """
+        Settings as nested dictionaries.
+
+        Args:
+            redact: Replace set secrets (API keys, tokens) with "***"
+
+        Returns:
+            {section: {field: value}}
+        """
+        result = {}
+        for section in dataclasses.fields(self):
+            values = {}
+            for item in dataclasses.fields(getattr(self, section.name)):
+                value = getattr(getattr(self, section.name), item.name)
+                if redact and item.metadata.get("secret") and value:
+                    value = "***"
+                values[item.name] = value
+            result[section.name] = values
+        return result
+
+
+class _EnvReader:
+    """Typed environment lookups that collect errors instead of raising."""
+
+    def __init__(self, environ: Mapping[str, str]):
+        self.environ = environ
+        self.errors: List[str] = []
+
+    def text(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        return self.environ.get(name) or default
+
+    def integer(self, name: str, default: int, minimum: Optional[int] = None) -> int:
+        raw = self.environ.get(name)
+        if not raw:
+            return default
+        try:
+            value = int(raw)
+        except ValueError:
+            self.errors.append(f"{name}={raw!r} is not an integer")
+            return default
+        if minimum is not None and value < minimum:
+            self.errors.append(f"{name}={value} must be >= {minimum}")
+        return value
+
+    def number(self, name: str, default: float, positive: bool = False) -> float:
+        raw = self.environ.get(name)
+        if not raw:
+            return default
+        try:
+            value = float(raw)
+        except ValueError:
+            self.errors.append(f"{name}={raw!r} is not a number")
+            return default
+        if value < 0 or (positive and value == 0):
+            self.errors.append(f"{name}={value} must be {'> 0' if positive else '>= 0'}")
+        return value
+
+    def flag(self, name: str, default: bool) -> bool:
+        raw = self.environ.get(name)
+        if not raw:
+            return default
+        return raw.lower() in ("1", "true", "yes")
+
+    def choice(self, name: str, default: str, choices: tuple) -> str:
+        value = self.environ.get(name) or default
+        if value not in choices:
+            self.errors.append(f"{name}={value!r} must be one of: {', '.join(choices)}")
+        return value
+
+    def mapping(self, name: str, defaults: Dict[str, Any], cast: Callable) -> Dict[str, Any]:
+        """Overrides of `defaults` from "key=value,key=value"."""
+        values = dict(defaults)
+        for item in filter(None, (part.strip() for part in (self.environ.get(name) or "").split(","))):
+            key, _, raw = item.partition("=")
+            key = key.strip()
+            if key not in defaults:
+                self.errors.append(f"{name}: unknown key {key!r} (expected: {', '.join(defaults)})")
+                continue
+            try:
+                value = cast(raw)
+            except ValueError:
+                self.errors.append(f"{name}: {key}={raw!r} is not a valid number")
+                continue
+            if value < 0:
+                self.errors.append(f"{name}: {key}={value} must be >= 0")
+            values[key] = value
+        return values
+
+
+def _diff(old: Settings, new: Settings) -> Dict[str, List[str]]:
+    changed, restart = [], []
+    for section in dataclasses.fields(old):
+        for item in dataclasses.fields(getattr(old, section.name)):
+            if getattr(getattr(old, section.name), item.name) != getattr(getattr(new, section.name), item.name):
+                (restart if item.metadata.get("restart") else changed).append(f"{section.name}.{item.name}")
+    return {"changed": changed, "restart_required": restart}
+
+
+def _keep_restart_only(old: Settings, new: Settings) -> Settings:
+    sections = {}
+    for section in dataclasses.fields(new):
+        current = getattr(old, section.name)
+        kept = {
+            item.name: getattr(current, item.name)
+            for item in dataclasses.fields(current)
+            if item.metadata.get("restart")
+        }
+        sections[section.name] = dataclasses.replace(getattr(new, section.name), **kept)
+    return Settings(**sections)
+
+
+load_env()
+
+settings = Settings.from_env()
+
+_listeners: List[Callable[[Settings], None]] = []
+_reload_lock = threading.Lock()
+
+
+def on_reload(callback: Callable[[Settings], None]) -> None:
+    """
+    Call `callback(new_settings)` after every successful reload().
+
+    Args:
+        callback: Applies new settings to objects built from the old ones
+    """
+    _listeners.append(callback)
+
+
+def reload(path: Optional[str] = ENV_FILE) -> Dict[str, List[str]]:
+    """
+    Re-read .env and the environment and apply the new settings.
+
+    Args:
+        path: .env file to read (default: same as load_env)
+
+    Returns:
+        {"changed": [...], "restart_required": [...]} dotted field names
+
+    Raises:
+        SettingsError: New settings are invalid (current settings are kept)
+    """
+    global settings
+    with _reload_lock:
+        environ = _read_env_file(path)
+        new = Settings.from_env(environ)
+        _apply_environ(environ)
+        old = settings
+        diff = _diff(old, new)
+        settings = _keep_restart_only(old, new)
+        for callback in _listeners:
+            try:
+                callback(settings)
+            except Exception:
+                logger.exception("Failed to apply reloaded settings in %s", getattr(callback, "__qualname__", callback))
+    logger.info("Settings reloaded: changed=%s restart_required=%s", diff["changed"], diff["restart_required"])
+    return diff
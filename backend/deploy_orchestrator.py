@@ -0,0 +1,306 @@
+"""
+Deployment Orchestrator
+
+Runs Nostromo contract deployments as asyncio state machines, several
+networks at once.
+
+- Each deployment moves PENDING -> VERIFYING -> DEPLOYING -> CONFIRMED
+  (or FAILED); deployments to different networks run concurrently
+- Every transition is persisted to a JSON state file, so a restart can
+  resume() unfinished deployments (waiting on an already submitted
+  transaction instead of deploying twice)
+- Transitions are published as events to subscriber queues
+
+Deploy to simulated testnet and mainnet stand-ins:
+    python deploy_orchestrator.py --networks testnet mainnet --block-time 0.5
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional
+
+import config
+import metrics
+from nostromo_integration import (
+    DEPLOY_POLL_SECONDS,
+    DEPLOY_TIMEOUT_SECONDS,
+    PLACEHOLDER_DEPLOY_SECONDS,
+    PLACEHOLDER_VERIFY_SECONDS,
+    DeploymentConfig,
+    DeploymentResult,
+    DeploymentStatus,
+    NostromoClient,
+    deployment_result_from_status
+)
+
+FINAL_STATES = (DeploymentStatus.CONFIRMED.value, DeploymentStatus.FAILED.value)
+
+
+def record_to_result(record: Dict[str, Any]) -> DeploymentResult:
+    """Convert a persisted deployment record to a DeploymentResult."""
+    return DeploymentResult(
+        success=record["status"] == DeploymentStatus.CONFIRMED.value,
+        deployment_id=record["deployment_id"],
+        contract_address=record.get("contract_address"),
+        transaction_hash=record.get("transaction_hash"),
+        status=DeploymentStatus(record["status"]),
+        error_message=record.get("error_message"),
+        network=record.get("network")
+    )
+
+
+class DeploymentOrchestrator:
+    """Concurrent, persistent, event-emitting deployment runner."""
+
+    def __init__(
+        self,
+        clients: Dict[str, NostromoClient],
+        state_path: Optional[str] = None,
+        poll_interval: float = DEPLOY_POLL_SECONDS,
+        timeout: float = DEPLOY_TIMEOUT_SECONDS
+    ):
+        """
+        Initialize the orchestrator.
+
+        Args:
+            clients: Nostromo client per network name
+            state_path: JSON file deployment state is persisted to
+                (default: config.settings.deploy.state_file)
+            poll_interval: Seconds between confirmation checks
+            timeout: Seconds to wait for confirmation before leaving a
+                deployment in DEPLOYING (it can be resumed later)
+        """
+        self.clients = clients
+        self.state_path = state_path or config.settings.deploy.state_file
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+
+        self._records: Dict[str, Dict[str, Any]] = self._load()
+        self._subscribers: List[asyncio.Queue] = []
+        self._save_lock = asyncio.Lock()
+
+    # Persistence
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.state_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _write(self, snapshot: str) -> None:
+        directory = os.path.dirname(os.path.abspath(self.state_path))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            f.write(snapshot)
+        os.replace(tmp, self.state_path)
+
+    async def _save(self) -> None:
+        async with self._save_lock:
+            snapshot = json.dumps(self._records, indent=2)
+            await asyncio.to_thread(self._write, snapshot)
+
+    # Events
+
+    def subscribe(self) -> asyncio.Queue:
+        """
+        Receive deployment events.
+
+        Returns:
+            Queue receiving one dictionary per state transition
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """Stop receiving deployment events."""
+        if queue in self._subscribers:
+            self._subscribers.remove(queue)
+
+    async def _transition(self, record: Dict[str, Any], status: DeploymentStatus, **fields) -> None:
+        """Move a deployment to a new state, persist it and publish the event."""
+        now = time.time()
+        record.update(fields)
+        record["status"] = status.value
+        record["updated_at"] = now
+        record["history"].append({"status": status.value, "at": now})
+        await self._save()
+
+        event = {
+            "deployment_id": record["deployment_id"],
+            "network": record["network"],
+            "status": status.value,
+            "at": now,
+            "transaction_hash": record.get("transaction_hash"),
+            "error_message": record.get("error_message")
+        }
+        for queue in self._subscribers:
+            queue.put_nowait(event)
+
+    # Deployment
+
+    @metrics.timed("deployments.deploy")
+    async def deploy(self, config: DeploymentConfig) -> DeploymentResult:
+        """
+        Deploy a contract to the configured network.
+
+        Args:
+            config: Deployment configuration (config.network selects the client)
+
+        Returns:
+            Final (or timed-out DEPLOYING) DeploymentResult
+        """
+        client = self.clients.get(config.network)
+        if client is None:
+            raise ValueError(f"No Nostromo client configured for network '{config.network}'")
+
+        deployment_id = client.new_deployment_id(config)
+        record = {
+            "deployment_id": deployment_id,
+            "network": config.network,
+            "config": asdict(config),
+            "contract_address": client.contract_address(deployment_id),
+            "transaction_hash": None,
+            "error_message": None,
+            "created_at": time.time(),
+            "history": []
+        }
+        self._records[deployment_id] = record
+        await self._transition(record, DeploymentStatus.PENDING)
+        return await self._run(record)
+
+    async def deploy_all(self, configs: List[DeploymentConfig]) -> List[DeploymentResult]:
+        """Run several deployments (typically one per network) concurrently."""
+        return list(await asyncio.gather(*(self.deploy(config) for config in configs)))
+
+    async def resume(self) -> List[DeploymentResult]:
+        """Continue every persisted deployment that had not finished."""
+        unfinished = [
+            record for record in self._records.values()
+            if record["status"] not in FINAL_STATES and record["network"] in self.clients
+        ]
+        return list(await asyncio.gather(*(self._run(record) for record in unfinished)))
+
+    async def _run(self, record: Dict[str, Any]) -> DeploymentResult:
+        """Advance a deployment through its state machine."""
+        client = self.clients[record["network"]]
+        config = DeploymentConfig(**record["config"])
+        try:
+            while record["status"] not in FINAL_STATES:
+                status = DeploymentStatus(record["status"])
+                if status == DeploymentStatus.PENDING:
+                    await self._transition(record, DeploymentStatus.VERIFYING)
+                elif status == DeploymentStatus.VERIFYING:
+                    await self._verify(client)
+                    await self._transition(record, DeploymentStatus.DEPLOYING)
+                elif status == DeploymentStatus.DEPLOYING:
+                    if not await self._deploy(client, config, record):
+                        break
+        except Exception as e:
+            await self._transition(record, DeploymentStatus.FAILED, error_message=str(e))
+        return record_to_result(record)
+
+    async def _verify(self, client: NostromoClient) -> None:
+        if client.node is None:
+            # Placeholder: Simulate verification
+            await asyncio.sleep(PLACEHOLDER_VERIFY_SECONDS)
+        else:
+            # Make sure the target network is reachable before submitting
+            await asyncio.to_thread(client.node.get_tick)
+
+    async def _deploy(self, client: NostromoClient, config: DeploymentConfig, record: Dict[str, Any]) -> bool:
+        """Submit (unless already submitted) and wait; return False on timeout."""
+        if not record.get("transaction_hash"):
+            if client.node is None:
+                await asyncio.sleep(PLACEHOLDER_DEPLOY_SECONDS)
+            tx_hash = await asyncio.to_thread(
+                client.submit_deployment, record["deployment_id"], record["contract_address"], config
+            )
+            record["transaction_hash"] = tx_hash
+            await self._save()
+
+        deadline = time.monotonic() + self.timeout
+        while True:
+            status = await asyncio.to_thread(client.deployment_transaction_status, record["transaction_hash"])
+            if status["status"] in ("confirmed", "failed"):
+                break
+            if time.monotonic() >= deadline:
+                record["error_message"] = "Timed out waiting for confirmation"
+                await self._save()
+                return False
+            await asyncio.sleep(self.poll_interval)
+
+        result = deployment_result_from_status(
+            record["deployment_id"], record["contract_address"], record["transaction_hash"],
+            status, record["network"]
+        )
+        await self._transition(record, result.status, error_message=result.error_message)
+        return True
+
+    # Queries
+
+    def get(self, deployment_id: str) -> Optional[DeploymentResult]:
+        """Get a deployment by ID."""
+        record = self._records.get(deployment_id)
+        return record_to_result(record) if record else None
+
+    def list_deployments(self, network: Optional[str] = None) -> List[DeploymentResult]:
+        """List deployments, optionally for one network."""
+        return [
+            record_to_result(record) for record in self._records.values()
+            if network is None or record["network"] == network
+        ]
+
+
+if __name__ == "__main__":
+    import argparse
+    from qubic_node_sim import LatencyModel, SimulatedQubicNode
+
+    parser = argparse.ArgumentParser(description="Deploy the DevScore contract to several networks in parallel")
+    parser.add_argument("--networks", nargs="+", default=["testnet", "mainnet"])
+    parser.add_argument("--owner", default="QUBIC" + "A" * 56)
+    parser.add_argument("--block-time", type=float, default=0.5, help="Simulated node block time")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Simulated node RPC latency")
+    parser.add_argument("--state-file", default=config.settings.deploy.state_file)
+    parser.add_argument("--placeholder", action="store_true", help="Use placeholder deployments instead of simulated nodes")
+    args = parser.parse_args()
+
+    nodes = {} if args.placeholder else {
+        network: SimulatedQubicNode(block_time=args.block_time, latency=LatencyModel(args.latency_ms)).start()
+        for network in args.networks
+    }
+    orchestrator = DeploymentOrchestrator(
+        {network: NostromoClient(network=network, node=nodes.get(network), node_url=None) for network in args.networks},
+        state_path=args.state_file
+    )
+
+    async def run() -> List[DeploymentResult]:
+        events = orchestrator.subscribe()
+
+        async def report() -> None:
+            while True:
+                event = await events.get()
+                print(f"[{event['network']}] {event['deployment_id']}: {event['status']}")
+
+        reporter = asyncio.create_task(report())
+        resumed = await orchestrator.resume()
+        started = time.perf_counter()
+        results = await orchestrator.deploy_all([
+            DeploymentConfig(network=network, contract_name="DevScoreNFT", initial_supply=0, owner_address=args.owner)
+            for network in args.networks
+        ])
+        print(f"Deployed to {len(results)} network(s) in {time.perf_counter() - started:.2f}s"
+              f" ({len(resumed)} resumed)")
+        await asyncio.sleep(0)
+        reporter.cancel()
+        return results
+
+    for result in asyncio.run(run()):
+        print(f"{result.network}: {result.status.value} {result.contract_address}")
+    for node in nodes.values():
+        node.stop()
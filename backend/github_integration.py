@@ -9,40 +9,85 @@ Handles fetching developer activity from GitHub including:
 - Repository metrics
 """
 
-import httpx
-import os
+import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
-from dotenv import load_dotenv
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Any
 
-load_dotenv()
+import config
+import metrics
+
+if TYPE_CHECKING:
+    import httpx
+
+config.load_env()
+
+logger = logging.getLogger(__name__)
+
+# Independently fetchable parts of an activity summary
+ACTIVITY_SECTIONS = ("user_info", "commits", "pull_requests", "issues", "repositories")
+
+
+_ssl_context = None
+
+
+def ssl_context():
+    """
+    Shared TLS context for GitHub clients.
+
+    Loading the CA bundle takes 100ms+, so it is done once (by the API's
+    warm-up, off the event loop) instead of in every new client.
+    """
+    global _ssl_context
+    if _ssl_context is None:
+        import httpx
+        _ssl_context = httpx.create_ssl_context()
+    return _ssl_context
+
+
+def _async_client() -> "httpx.AsyncClient":
+    """New HTTP client (httpx is imported on first use to keep API startup fast)."""
+    import httpx
+    return httpx.AsyncClient(verify=ssl_context(), timeout=config.settings.github.timeout_seconds)
 
-GITHUB_API_TOKEN = os.getenv("GITHUB_API_TOKEN")
-GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")
 
 class GitHubClient:
     """Client for GitHub API interactions."""
     
     def __init__(self, token: Optional[str] = None):
         """Initialize GitHub client with API token."""
-        self.token = token or GITHUB_API_TOKEN
+        settings = config.settings.github
+        self.token = token or settings.api_token
         if not self.token:
             raise ValueError("GitHub API token not configured")
         
-        self.base_url = GITHUB_API_URL
+        self.base_url = settings.api_url
         self.headers = {
             "Authorization": f"Bearer {self.token}",
             "Accept": "application/vnd.github+json",
             "X-GitHub-Api-Version": "2022-11-28"
         }
     
+    async def _get(self, client: "httpx.AsyncClient", endpoint: str, url: str) -> "httpx.Response":
+        """
+        GET a GitHub API URL, recording its latency.
+        
+        Args:
+            client: HTTP client to send the request with
+            endpoint: Route template used as the metrics label (e.g. "/users/{user}/repos")
+            url: Full request URL
+        """
+        with metrics.upstream("github", endpoint, **{"http.method": "GET", "http.url": url}) as span:
+            response = await client.get(url, headers=self.headers)
+            if span is not None:
+                span.set_attribute("http.status_code", response.status_code)
+        if response.status_code >= 400:
+            metrics.UPSTREAM_ERRORS.labels("github", endpoint, response.status_code).inc()
+        return response
+    
     async def get_user_info(self, username: str) -> Dict[str, Any]:
         """Fetch GitHub user information."""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/users/{username}",
-                headers=self.headers
-            )
+        async with _async_client() as client:
+            response = await self._get(client, "/users/{user}", f"{self.base_url}/users/{username}")
             response.raise_for_status()
             return response.json()
     
@@ -56,11 +101,12 @@ class GitHubClient:
         
         Returns total commits, detailed commit history, and activity breakdown.
         """
-        async with httpx.AsyncClient() as client:
+        async with _async_client() as client:
             # Get user's repositories (increased to 200 for more data)
-            repos_response = await client.get(
-                f"{self.base_url}/users/{username}/repos?per_page=200&sort=updated",
-                headers=self.headers
+            repos_response = await self._get(
+                client,
+                "/users/{user}/repos",
+                f"{self.base_url}/users/{username}/repos?per_page=200&sort=updated"
             )
             repos_response.raise_for_status()
             repos = repos_response.json()
@@ -76,9 +122,10 @@ class GitHubClient:
             for repo in repos:
                 try:
                     # Get commits for this repository (increased per_page)
-                    commits_response = await client.get(
-                        f"{self.base_url}/repos/{repo['full_name']}/commits?author={username}&since={since_date}&per_page=200",
-                        headers=self.headers
+                    commits_response = await self._get(
+                        client,
+                        "/repos/{repo}/commits",
+                        f"{self.base_url}/repos/{repo['full_name']}/commits?author={username}&since={since_date}&per_page=200"
                     )
                     
                     if commits_response.status_code == 200:
@@ -109,7 +156,7 @@ class GitHubClient:
                             
                             total_commits += commit_count
                 except Exception as e:
-                    print(f"Error fetching commits for {repo['name']}: {e}")
+                    logger.warning("Error fetching commits for %s: %s", repo["name"], e)
                     continue
             
             return {
@@ -127,15 +174,12 @@ class GitHubClient:
         days: int = 30
     ) -> Dict[str, Any]:
         """Fetch user's pull requests."""
-        async with httpx.AsyncClient() as client:
+        async with _async_client() as client:
             since_date = (datetime.utcnow() - timedelta(days=days)).isoformat() + "Z"
             
             # Search for PRs created by user
             query = f"author:{username} is:pr created:>{since_date}"
-            response = await client.get(
-                f"{self.base_url}/search/issues?q={query}&per_page=100",
-                headers=self.headers
-            )
+            response = await self._get(client, "/search/issues", f"{self.base_url}/search/issues?q={query}&per_page=100")
             response.raise_for_status()
             data = response.json()
             
@@ -173,15 +217,12 @@ class GitHubClient:
         days: int = 30
     ) -> Dict[str, Any]:
         """Fetch user's issues."""
-        async with httpx.AsyncClient() as client:
+        async with _async_client() as client:
             since_date = (datetime.utcnow() - timedelta(days=days)).isoformat() + "Z"
             
             # Search for issues created by user
             query = f"author:{username} is:issue created:>{since_date}"
-            response = await client.get(
-                f"{self.base_url}/search/issues?q={query}&per_page=100",
-                headers=self.headers
-            )
+            response = await self._get(client, "/search/issues", f"{self.base_url}/search/issues?q={query}&per_page=100")
             response.raise_for_status()
             data = response.json()
             
@@ -209,10 +250,11 @@ class GitHubClient:
     
     async def get_user_stars(self, username: str) -> Dict[str, Any]:
         """Fetch repositories starred by user."""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/users/{username}/starred?per_page=100&sort=updated",
-                headers=self.headers
+        async with _async_client() as client:
+            response = await self._get(
+                client,
+                "/users/{user}/starred",
+                f"{self.base_url}/users/{username}/starred?per_page=100&sort=updated"
             )
             response.raise_for_status()
             repos = response.json()
@@ -232,10 +274,11 @@ class GitHubClient:
     
     async def get_user_repos(self, username: str) -> Dict[str, Any]:
         """Fetch user's repositories with metrics."""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/users/{username}/repos?per_page=100&sort=updated",
-                headers=self.headers
+        async with _async_client() as client:
+            response = await self._get(
+                client,
+                "/users/{user}/repos",
+                f"{self.base_url}/users/{username}/repos?per_page=100&sort=updated"
             )
             response.raise_for_status()
             repos = response.json()
@@ -261,27 +304,33 @@ class GitHubClient:
                 ]
             }
     
+    @metrics.timed("github.activity_summary")
     async def get_user_activity_summary(
         self,
         username: str,
-        days: int = 30
+        days: int = 30,
+        sections: Iterable[str] = ACTIVITY_SECTIONS
     ) -> Dict[str, Any]:
         """
         Get comprehensive activity summary for a user.
         
+        Args:
+            username: GitHub username
+            days: Number of days to look back
+            sections: Parts of ACTIVITY_SECTIONS to fetch; the others are
+                neither requested from GitHub nor present in the result
+        
         Returns all activity data in a structured format.
         """
+        sections = set(sections)
         try:
-            # Fetch all data in parallel
-            user_info = await self.get_user_info(username)
-            commits = await self.get_user_commits(username, days)
-            pull_requests = await self.get_user_pull_requests(username, days)
-            issues = await self.get_user_issues(username, days)
-            repos = await self.get_user_repos(username)
+            result: Dict[str, Any] = {"username": username}
+            activity: Dict[str, Any] = {}
+            summary: Dict[str, Any] = {}
             
-            return {
-                "username": username,
-                "user_info": {
+            if "user_info" in sections:
+                user_info = await self.get_user_info(username)
+                result["user_info"] = {
                     "name": user_info.get("name"),
                     "avatar_url": user_info.get("avatar_url"),
                     "bio": user_info.get("bio"),
@@ -289,22 +338,25 @@ class GitHubClient:
                     "followers": user_info.get("followers"),
                     "following": user_info.get("following"),
                     "public_repos": user_info.get("public_repos")
-                },
-                "activity": {
-                    "commits": commits,
-                    "pull_requests": pull_requests,
-                    "issues": issues,
-                    "repositories": repos
-                },
-                "summary": {
-                    "total_commits": commits.get("total", 0),
-                    "total_prs": pull_requests.get("total", 0),
-                    "total_issues": issues.get("total", 0),
-                    "public_repos": repos.get("total", 0),
-                    "total_stars": repos.get("total_stars", 0),
-                    "time_period": f"Last {days} days"
                 }
-            }
+            if "commits" in sections:
+                activity["commits"] = await self.get_user_commits(username, days)
+                summary["total_commits"] = activity["commits"].get("total", 0)
+            if "pull_requests" in sections:
+                activity["pull_requests"] = await self.get_user_pull_requests(username, days)
+                summary["total_prs"] = activity["pull_requests"].get("total", 0)
+            if "issues" in sections:
+                activity["issues"] = await self.get_user_issues(username, days)
+                summary["total_issues"] = activity["issues"].get("total", 0)
+            if "repositories" in sections:
+                activity["repositories"] = await self.get_user_repos(username)
+                summary["public_repos"] = activity["repositories"].get("total", 0)
+                summary["total_stars"] = activity["repositories"].get("total_stars", 0)
+            summary["time_period"] = f"Last {days} days"
+            
+            result["activity"] = activity
+            result["summary"] = summary
+            return result
         except Exception as e:
             raise Exception(f"Failed to fetch GitHub activity: {str(e)}")
 
@@ -312,7 +364,8 @@ class GitHubClient:
 async def get_github_activity_for_user(
     username: str,
     days: int = 30,
-    token: Optional[str] = None
+    token: Optional[str] = None,
+    sections: Iterable[str] = ACTIVITY_SECTIONS
 ) -> Dict[str, Any]:
     """
     Convenience function to get GitHub activity for a user.
@@ -320,10 +373,11 @@ async def get_github_activity_for_user(
     Args:
         username: GitHub username
         days: Number of days to look back
-        token: Optional API token (uses env token if not provided)
+        token: Optional API token (defaults to GITHUB_API_TOKEN)
+        sections: Parts of ACTIVITY_SECTIONS to fetch
     
     Returns:
         Dictionary with comprehensive activity data
     """
     client = GitHubClient(token=token)
-    return await client.get_user_activity_summary(username, days)
+    return await client.get_user_activity_summary(username, days, sections)
@@ -0,0 +1,164 @@
+"""
+Idempotency Keys
+
+Deduplicates retried write requests (e.g. NFT mints).
+
+- The client sends an Idempotency-Key header, or a key is derived from the
+  request body
+- The first request with a key runs and its response is stored in the
+  `idempotency_keys` table; repeats within the window get the stored
+  response back without running the operation again
+- Concurrent requests with the same key share one in-flight execution; with
+  a SharedState, workers also take a shared lock per key, so a retry that
+  lands on another worker waits for the first and replays its response
+- Reusing a key with a different request body is rejected
+- Failed operations are not stored, so they can be retried
+"""
+
+import hashlib
+import json
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import config
+from singleflight import SingleFlight
+
+if TYPE_CHECKING:
+    from shared_state import SharedState
+
+# Expired keys are purged once every this many stored responses
+_PURGE_EVERY = 500
+
+
+class IdempotencyConflictError(Exception):
+    """Raised when an idempotency key is reused with a different request."""
+
+
+def fingerprint(payload: Dict[str, Any]) -> str:
+    """Stable hash of a request body."""
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()
+    ).hexdigest()
+
+
+class IdempotencyStore:
+    """Stores responses by idempotency key for a time window."""
+
+    def __init__(
+        self,
+        db: Callable,
+        window_seconds: Optional[int] = None,
+        shared: Optional["SharedState"] = None
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            db: Database connection context manager factory (main.get_db)
+            window_seconds: How long a stored response is replayed
+                (default: config.settings.nft.idempotency_window_seconds)
+            shared: Cross-worker state for per-key locks (None: this process only)
+        """
+        self.db = db
+        self.window_seconds = window_seconds or config.settings.nft.idempotency_window_seconds
+        self.shared = shared
+        self.flight = SingleFlight()
+
+        self.executed = 0
+        self.replayed = 0
+        self._stores = 0
+
+    async def run(
+        self,
+        scope: str,
+        key: str,
+        request_hash: str,
+        operation: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Run an operation at most once per key within the window.
+
+        Args:
+            scope: Operation name keys are namespaced by (e.g. "mint-nft")
+            key: Idempotency key
+            request_hash: Fingerprint of the request body
+            operation: Zero-argument coroutine function producing the response
+
+        Returns:
+            (response, replayed) where replayed is True for a stored response
+
+        Raises:
+            IdempotencyConflictError: The key was used for a different request
+        """
+        scoped_key = f"{scope}:{key}"
+        stored = self._lookup(scoped_key)
+        if stored is not None:
+            return self._replay(stored, request_hash), True
+
+        # Identifies this caller's own execution: a caller that joined another
+        # caller's in-flight execution gets that response as a replay
+        owner = object()
+
+        async def execute() -> Tuple[Dict[str, Any], str, Optional[object]]:
+            # Re-check: another worker may have finished while we waited
+            stored = self._lookup(scoped_key)
+            if stored is not None:
+                return stored + (None,)
+            response = await operation()
+            self._store(scoped_key, request_hash, response)
+            self.executed += 1
+            return response, request_hash, owner
+
+        async def execute_locked() -> Tuple[Dict[str, Any], str, Optional[object]]:
+            # No timeout: running the operation without the lock could run it
+            # twice, so wait for as long as the holder keeps its lease
+            async with self.shared.lock(f"idempotency:{scoped_key}", timeout=None):
+                return await execute()
+
+        response, original_hash, executed_by = await self.flight.do(
+            scoped_key, execute if self.shared is None else execute_locked
+        )
+        if executed_by is not owner:
+            return self._replay((response, original_hash), request_hash), True
+        return response, False
+
+    def _replay(self, stored: Tuple[Dict[str, Any], str], request_hash: str) -> Dict[str, Any]:
+        response, original_hash = stored
+        if original_hash != request_hash:
+            raise IdempotencyConflictError("Idempotency key was already used with a different request")
+        self.replayed += 1
+        return response
+
+    def _lookup(self, scoped_key: str) -> Optional[Tuple[Dict[str, Any], str]]:
+        with self.db() as conn:
+            row = conn.execute(
+                """SELECT request_hash, response FROM idempotency_keys
+                   WHERE key = ? AND created_at > datetime('now', ?)""",
+                (scoped_key, f"-{self.window_seconds} seconds")
+            ).fetchone()
+        if not row:
+            return None
+        return json.loads(row["response"]), row["request_hash"]
+
+    def _store(self, scoped_key: str, request_hash: str, response: Dict[str, Any]) -> None:
+        with self.db() as conn:
+            conn.execute(
+                """INSERT OR REPLACE INTO idempotency_keys (key, request_hash, response, created_at)
+                   VALUES (?, ?, ?, CURRENT_TIMESTAMP)""",
+                (scoped_key, request_hash, json.dumps(response))
+            )
+            self._stores += 1
+            if self._stores % _PURGE_EVERY == 0:
+                conn.execute(
+                    "DELETE FROM idempotency_keys WHERE created_at <= datetime('now', ?)",
+                    (f"-{self.window_seconds} seconds",)
+                )
+            conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return execution and replay counters."""
+        return {
+            "executed": self.executed,
+            "replayed": self.replayed,
+            "coalesced": self.flight.coalesced,
+            "window_seconds": self.window_seconds
+        }
@@ -0,0 +1,458 @@
+"""
+Local Insight Engine
+
+Deterministic, offline replacement for LLM-generated developer insights.
+
+- Contribution areas from a compiled Aho-Corasick keyword automaton run
+  once over repository descriptions and commit messages
+- Topic extraction with TF-IDF over the developer's repositories
+- Development style classified from activity statistics
+
+Everything is computed from the activity data already fetched from GitHub,
+so refined output can be served without any API key or network call.
+"""
+
+import math
+import re
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Tuple, Iterable
+
+# Contribution area -> keywords (lowercase). Keywords shorter than four
+# characters only match whole words; longer ones also match as prefixes
+# ("tool" matches "tooling").
+AREA_KEYWORDS: Dict[str, List[str]] = {
+    "Web Development": [
+        "web", "frontend", "front-end", "react", "vue", "angular", "svelte",
+        "nextjs", "next.js", "html", "css", "tailwind", "website", "ui"
+    ],
+    "Backend Development": [
+        "backend", "back-end", "api", "server", "database", "django", "fastapi",
+        "flask", "express", "graphql", "rest", "sql", "postgres", "microservice"
+    ],
+    "Mobile Development": [
+        "mobile", "ios", "android", "flutter", "react native", "swift", "kotlin"
+    ],
+    "Data/AI/ML": [
+        "data", "ml", "ai", "machine learning", "neural", "tensorflow", "pytorch",
+        "llm", "model", "dataset", "pandas", "analytics", "nlp"
+    ],
+    "DevOps/Cloud": [
+        "devops", "docker", "kubernetes", "k8s", "cloud", "aws", "azure", "gcp",
+        "terraform", "ci", "deploy", "pipeline", "helm"
+    ],
+    "Tools & Libraries": [
+        "tool", "cli", "lib", "library", "libraries", "framework", "utility",
+        "sdk", "plugin", "package"
+    ],
+    "Blockchain/Web3": [
+        "blockchain", "web3", "smart contract", "solidity", "nft", "token",
+        "wallet", "qubic", "ethereum", "defi"
+    ],
+}
+
+# Relative weight of a keyword hit by where it was found
+SOURCE_WEIGHTS = {"description": 3.0, "repo_name": 2.0, "commit": 1.0}
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in into is it its of on or that the
+this to was were will with without via when while not no yes all any some more
+add added adds adding update updated updates updating fix fixed fixes fixing
+remove removed removes removing change changed changes refactor refactored
+initial commit commits merge merged branch pull request main master wip minor
+readme docs doc file files code version bump typo cleanup clean use using
+new old first final test tests testing work working make made small improve
+improved improvements support n/a
+""".split())
+
+_WORD_PATTERN = re.compile(r"[a-z][a-z0-9+#.\-]*[a-z0-9+#]|[a-z]")
+_CONVENTIONAL_PREFIX = re.compile(r"^(feat|fix|docs|style|refactor|perf|test|chore|build|ci)(\(.+\))?!?:")
+# Style labels that already name a role ("Explorer"), so "developer" is not appended
+_ROLE_NOUNS = frozenset({"contributor", "specialist", "explorer"})
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton for matching many keywords in one text pass."""
+
+    def __init__(self, keywords: Dict[str, List[str]]):
+        """
+        Compile the automaton.
+
+        Args:
+            keywords: Mapping of label -> keywords to match for that label
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[str, str]]] = [[]]
+
+        for label, words in keywords.items():
+            for word in words:
+                self._add(word.lower(), label)
+        self._build_failure_links()
+
+    def _add(self, word: str, label: str) -> None:
+        """Insert a keyword into the trie."""
+        state = 0
+        for char in word:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = nxt
+        self._output[state].append((word, label))
+
+    def _build_failure_links(self) -> None:
+        """Compute failure links breadth-first and merge outputs."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(char, 0)
+                self._output[nxt] = self._output[nxt] + self._output[self._fail[nxt]]
+
+    def find(self, text: str) -> List[Tuple[str, str]]:
+        """
+        Find keyword matches in a lowercase text.
+
+        Matches must start on a word boundary; keywords shorter than four
+        characters must also end on one.
+
+        Args:
+            text: Lowercase text to scan
+
+        Returns:
+            List of (keyword, label) matches in text order
+        """
+        matches = []
+        state = 0
+        goto, fail, output = self._goto, self._fail, self._output
+        length = len(text)
+
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for word, label in output[state]:
+                start = index - len(word) + 1
+                if start > 0 and text[start - 1].isalnum():
+                    continue
+                end = index + 1
+                if len(word) < 4 and end < length and text[end].isalnum():
+                    continue
+                matches.append((word, label))
+        return matches
+
+
+_AREA_AUTOMATON = KeywordAutomaton(AREA_KEYWORDS)
+
+
+@dataclass
+class StyleProfile:
+    """Development style derived from activity statistics."""
+    label: str
+    description: str
+    traits: List[str] = field(default_factory=list)
+    stats: Dict[str, float] = field(default_factory=dict)
+
+    def __str__(self) -> str:
+        return f"{self.label} - {self.description}"
+
+
+class InsightEngine:
+    """Computes summaries, insights, areas, topics and style without an LLM."""
+
+    def __init__(self, automaton: KeywordAutomaton = _AREA_AUTOMATON, max_topics: int = 8):
+        """
+        Initialize the insight engine.
+
+        Args:
+            automaton: Compiled contribution area keyword automaton
+            max_topics: Number of TF-IDF topics to return
+        """
+        self.automaton = automaton
+        self.max_topics = max_topics
+
+    def analyze(self, activity_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Produce the full set of local insights for a developer.
+
+        Args:
+            activity_data: Activity data from the GitHub integration
+
+        Returns:
+            Dictionary with summary, insights, contribution_areas, topics,
+            development_style and style_traits
+        """
+        documents = list(self._documents(activity_data))
+        style = self.classify_style(activity_data)
+        areas = self.contribution_areas(activity_data, documents)
+        topics = self.extract_topics(documents)
+
+        return {
+            "summary": self.summarize(activity_data, areas, style),
+            "insights": self.insights(activity_data, style, topics),
+            "contribution_areas": areas,
+            "topics": topics,
+            "development_style": str(style),
+            "style_traits": style.traits
+        }
+
+    def _documents(self, activity_data: Dict[str, Any]) -> Iterable[Tuple[str, str, str]]:
+        """Yield (repo, source, lowercase text) for every analyzable text."""
+        activity = activity_data.get("activity", {})
+        commits = activity.get("commits", {})
+        seen_repos = set()
+
+        for repo in activity.get("repositories", {}).get("repositories", []):
+            name = repo.get("name") or ""
+            seen_repos.add(name)
+            yield name, "repo_name", name.lower().replace("_", "-")
+            if repo.get("description"):
+                yield name, "description", repo["description"].lower()
+
+        for name, data in commits.get("by_repository", {}).items():
+            if name not in seen_repos and data.get("description"):
+                yield name, "description", data["description"].lower()
+
+        for commit in commits.get("commit_details", []):
+            message = (commit.get("message") or "").split("\n", 1)[0]
+            if message:
+                yield commit.get("repo") or "", "commit", message.lower()
+
+    def contribution_areas(
+        self,
+        activity_data: Dict[str, Any],
+        documents: List[Tuple[str, str, str]] = None
+    ) -> List[str]:
+        """
+        Rank contribution areas by weighted keyword hits.
+
+        Args:
+            activity_data: Activity data from the GitHub integration
+            documents: Pre-extracted documents (computed if omitted)
+
+        Returns:
+            Area names ordered by strength, or ["General Development"]
+        """
+        if documents is None:
+            documents = list(self._documents(activity_data))
+
+        scores: Counter = Counter()
+        for _, source, text in documents:
+            labels = {label for _, label in self.automaton.find(text)}
+            for label in labels:
+                scores[label] += SOURCE_WEIGHTS[source]
+
+        # A single stray commit mention is not an area of contribution
+        areas = [label for label, score in scores.most_common() if score >= 2.0]
+        return areas or ["General Development"]
+
+    def extract_topics(self, documents: List[Tuple[str, str, str]]) -> List[str]:
+        """
+        Extract the developer's most characteristic terms with TF-IDF.
+
+        Each repository (its name, description and commit messages) is a
+        document; terms are scored by total frequency times smoothed IDF,
+        which favours terms concentrated in a few repositories over words
+        that appear everywhere.
+
+        Args:
+            documents: (repo, source, text) tuples
+
+        Returns:
+            Up to max_topics terms ordered by score
+        """
+        per_repo: Dict[str, Counter] = {}
+        for repo, source, text in documents:
+            if source == "repo_name":
+                continue
+            terms = per_repo.setdefault(repo, Counter())
+            for word in _WORD_PATTERN.findall(text):
+                word = word.strip(".-")
+                if len(word) > 2 and word not in STOPWORDS and not word.isdigit():
+                    terms[word] += 1
+
+        if not per_repo:
+            return []
+
+        doc_count = len(per_repo)
+        document_frequency: Counter = Counter()
+        term_frequency: Counter = Counter()
+        for terms in per_repo.values():
+            document_frequency.update(terms.keys())
+            term_frequency.update(terms)
+
+        scored = [
+            (tf * (math.log((1 + doc_count) / (1 + document_frequency[term])) + 1.0), term)
+            for term, tf in term_frequency.items()
+        ]
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [term for _, term in scored[:self.max_topics]]
+
+    def classify_style(self, activity_data: Dict[str, Any]) -> StyleProfile:
+        """
+        Classify development style from activity ratios and distribution.
+
+        Args:
+            activity_data: Activity data from the GitHub integration
+
+        Returns:
+            StyleProfile with label, description, traits and the raw stats
+        """
+        summary = activity_data.get("summary", {})
+        activity = activity_data.get("activity", {})
+        commits_data = activity.get("commits", {})
+        prs_data = activity.get("pull_requests", {})
+
+        commits = summary.get("total_commits", 0) or 0
+        prs = summary.get("total_prs", 0) or 0
+        issues = summary.get("total_issues", 0) or 0
+        base = max(commits, 1)
+
+        repo_counts = [d.get("count", 0) for d in commits_data.get("by_repository", {}).values()]
+        focus = self._focus(repo_counts)
+
+        messages = [c.get("message") or "" for c in commits_data.get("commit_details", [])]
+        first_lines = [m.split("\n", 1)[0] for m in messages]
+        conventional = sum(1 for m in first_lines if _CONVENTIONAL_PREFIX.match(m.lower()))
+        detailed = sum(1 for m in messages if "\n" in m.strip())
+
+        stats = {
+            "pr_ratio": prs / base,
+            "issue_ratio": issues / base,
+            "merge_rate": (prs_data.get("merged", 0) or 0) / prs if prs else 0.0,
+            "focus": focus,
+            "active_repos": float(len(repo_counts)),
+            "conventional_commit_ratio": conventional / len(messages) if messages else 0.0,
+            "detailed_message_ratio": detailed / len(messages) if messages else 0.0,
+            "avg_message_length": sum(len(m) for m in first_lines) / len(first_lines) if first_lines else 0.0,
+        }
+
+        traits = []
+        if stats["conventional_commit_ratio"] >= 0.5:
+            traits.append("Follows conventional commit messages")
+        if stats["detailed_message_ratio"] >= 0.3:
+            traits.append("Writes detailed commit descriptions")
+        if prs and stats["merge_rate"] >= 0.7:
+            traits.append("High pull request merge rate")
+        if focus >= 0.7 and len(repo_counts) > 1:
+            traits.append("Concentrates effort on a core project")
+        elif len(repo_counts) >= 5 and focus < 0.4:
+            traits.append("Spreads work across many projects")
+
+        if stats["pr_ratio"] > 0.2:
+            label, description = "Collaborative", "Strong focus on code review and teamwork"
+        elif stats["issue_ratio"] > 0.2:
+            label, description = "Community-focused", "Active in discussions and issue resolution"
+        elif commits > 500:
+            label, description = "Prolific contributor", "High commit volume and productivity"
+        elif focus >= 0.7 and commits > 50:
+            label, description = "Deep specialist", "Sustained, focused work on a core project"
+        elif len(repo_counts) >= 5 and focus < 0.4:
+            label, description = "Explorer", "Broad experimentation across many repositories"
+        else:
+            label, description = "Balanced", "Mix of commits, PRs, and community engagement"
+
+        return StyleProfile(label=label, description=description, traits=traits, stats=stats)
+
+    @staticmethod
+    def _focus(counts: List[int]) -> float:
+        """Return 1 - normalized entropy of commits across repos (1.0 = one repo)."""
+        total = sum(counts)
+        if total <= 0 or len(counts) <= 1:
+            return 1.0 if total > 0 else 0.0
+        entropy = -sum((c / total) * math.log(c / total) for c in counts if c > 0)
+        return 1.0 - entropy / math.log(len(counts))
+
+    @staticmethod
+    def _style_phrase(label: str) -> str:
+        """'a collaborative developer', 'an explorer', 'a deep specialist'."""
+        phrase = label.lower()
+        if phrase.split()[-1] not in _ROLE_NOUNS:
+            phrase += " developer"
+        article = "an" if phrase[0] in "aeiou" else "a"
+        return f"{article} {phrase}"
+
+    def summarize(self, activity_data: Dict[str, Any], areas: List[str], style: StyleProfile) -> str:
+        """Build a one-paragraph summary from the computed signals."""
+        summary = activity_data.get("summary", {})
+        user_info = activity_data.get("user_info", {})
+        languages = activity_data.get("activity", {}).get("commits", {}).get("language_breakdown", {})
+
+        name = user_info.get("name") or activity_data.get("username") or "This developer"
+        commits = summary.get("total_commits", 0)
+        prs = summary.get("total_prs", 0)
+        top_languages = [lang for lang, _ in sorted(languages.items(), key=lambda x: x[1], reverse=True)[:3]]
+        lang_str = ", ".join(top_languages) if top_languages else "multiple languages"
+        area_str = " and ".join(areas[:2])
+
+        return (
+            f"{name} is {self._style_phrase(style.label)} with {commits} commits and {prs} pull requests "
+            f"({summary.get('time_period', 'recently')}), working mainly in {lang_str} "
+            f"with a focus on {area_str}."
+        )
+
+    def insights(self, activity_data: Dict[str, Any], style: StyleProfile, topics: List[str]) -> List[str]:
+        """Build up to five insight sentences."""
+        summary = activity_data.get("summary", {})
+        activity = activity_data.get("activity", {})
+        repos = activity.get("repositories", {})
+        languages = activity.get("commits", {}).get("language_breakdown", {})
+
+        insights = []
+
+        commits = summary.get("total_commits", 0)
+        if commits > 500:
+            insights.append("Exceptional contributor with 500+ commits showing strong development momentum")
+        elif commits > 200:
+            insights.append(f"Consistent contributor with {commits} commits across multiple projects")
+        elif commits > 50:
+            insights.append(f"Active contributor with {commits} commits indicating regular development activity")
+        else:
+            insights.append(f"Moderate contribution level with {commits} commits")
+
+        if len(languages) >= 5:
+            insights.append(f"Polyglot developer - proficient in {len(languages)} different programming languages")
+        elif len(languages) >= 2:
+            insights.append(f"Multi-language expertise across {', '.join(list(languages.keys())[:3])}")
+        elif languages:
+            insights.append(f"Specialized in {', '.join(languages.keys())}")
+
+        total_stars = repos.get("total_stars", 0)
+        repo_count = repos.get("total", 0)
+        if total_stars > 100:
+            insights.append(f"Impactful projects with {total_stars}+ stars, demonstrating popular contributions")
+        elif repo_count > 20:
+            insights.append(f"Diverse portfolio with {repo_count}+ repositories across different domains")
+        else:
+            insights.append(f"Focused development with {repo_count} key repositories")
+
+        insights.append(f"{style.label} style: {style.description}")
+
+        if topics:
+            insights.append(f"Recurring themes in recent work: {', '.join(topics[:5])}")
+
+        return insights[:5]
+
+
+_default_engine = InsightEngine()
+
+
+def analyze_activity(activity_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convenience function to compute local insights with the shared engine.
+
+    Args:
+        activity_data: Raw GitHub activity data
+
+    Returns:
+        Dictionary of locally computed insights
+    """
+    return _default_engine.analyze(activity_data)
@@ -0,0 +1,494 @@
+"""
+LLM Provider Interface
+
+Pluggable chat-completion backends used by LLMRefiner.
+
+Providers:
+- openai: OpenAI API via the official SDK
+- openai_compatible: any server speaking the OpenAI chat completions HTTP
+  API (llama.cpp server, vLLM, LocalAI, ...) at LLM_BASE_URL
+- local: in-process model; uses llama-cpp-python with LOCAL_MODEL_PATH when
+  available, otherwise a small deterministic extractive model built on the
+  local insight engine
+
+Each provider owns a concurrency limit and a circuit breaker, so a slow
+backend queues locally instead of being flooded.
+
+Configuration (environment, read through config.settings.llm):
+- LLM_PROVIDER: openai | openai_compatible | local (default: openai)
+- LLM_MODEL: model name (default depends on provider)
+- LLM_BASE_URL: base URL for openai_compatible (e.g. http://127.0.0.1:8080/v1)
+- LLM_API_KEY: optional bearer token for openai_compatible
+- LLM_MAX_CONCURRENCY: max in-flight completions per provider
+- LOCAL_MODEL_PATH: GGUF model file for the local provider
+
+On config.reload() the shared providers take the new concurrency limit,
+model, timeout and breaker thresholds; a new provider kind, key or base URL
+gets a new provider on the next get_provider() call.
+"""
+
+import abc
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
+
+import config
+import metrics
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+from insight_engine import analyze_activity
+
+config.load_env()
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Completion:
+    """Result of a chat completion."""
+    text: str
+    provider: str
+    model: str
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    latency: float = 0.0
+
+
+class LLMProvider(abc.ABC):
+    """
+    Base class for chat-completion providers.
+
+    Subclasses implement `_complete`; `complete` adds the concurrency limit
+    and circuit breaker bookkeeping.
+    """
+
+    name = "base"
+    default_model = ""
+
+    def __init__(self, model: Optional[str] = None, max_concurrency: Optional[int] = None):
+        """
+        Initialize the provider.
+
+        Args:
+            model: Model name (provider default if omitted)
+            max_concurrency: Maximum completions in flight at once
+                (default: LLM_MAX_CONCURRENCY)
+        """
+        settings = config.settings.llm
+        self.model = model or self.default_model
+        self.max_concurrency = max_concurrency or settings.max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._in_flight = 0
+        self._waiting = 0
+        self.completed = 0
+        self.failed = 0
+        self.breaker = CircuitBreaker(
+            name=self.name,
+            slow_call_seconds=settings.slow_call_seconds,
+            open_seconds=settings.breaker_open_seconds
+        )
+
+    @property
+    def available(self) -> bool:
+        """Whether the provider is configured well enough to be called."""
+        return True
+
+    async def complete(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float = 0.7,
+        activity_data: Optional[Dict[str, Any]] = None
+    ) -> Completion:
+        """
+        Run a chat completion within the circuit breaker and concurrency limit.
+
+        The breaker admission lasts until this coroutine exits, however it
+        exits: success and failure are recorded, and a cancellation (while
+        queued or in flight) gives the admission back.
+
+        Args:
+            messages: Chat messages
+            max_tokens: Maximum completion tokens
+            temperature: Sampling temperature
+            activity_data: Raw activity data, used by providers that do not
+                need the rendered prompt
+
+        Returns:
+            Completion with text and token usage
+
+        Raises:
+            CircuitOpenError: The breaker rejected the call
+        """
+        if not self.breaker.allow_request():
+            raise CircuitOpenError(f"Circuit open for LLM provider '{self.name}'")
+        recorded = False
+        try:
+            if self._semaphore is None:
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            # Released on the semaphore acquired, even if configure() replaced it
+            semaphore = self._semaphore
+
+            self._waiting += 1
+            try:
+                await semaphore.acquire()
+            finally:
+                self._waiting -= 1
+
+            self._in_flight += 1
+            started = time.monotonic()
+            try:
+                with metrics.upstream(self.name, "chat.completions", **{
+                    "llm.model": self.model,
+                    "llm.max_tokens": max_tokens
+                }) as span:
+                    completion = await self._complete(messages, max_tokens, temperature, activity_data)
+                    if span is not None:
+                        span.set_attribute("llm.prompt_tokens", completion.prompt_tokens)
+                        span.set_attribute("llm.completion_tokens", completion.completion_tokens)
+            except Exception:
+                self.failed += 1
+                recorded = True
+                self.breaker.record_failure()
+                raise
+            finally:
+                self._in_flight -= 1
+                semaphore.release()
+
+            completion.latency = time.monotonic() - started
+            self.completed += 1
+            recorded = True
+            self.breaker.record_success(completion.latency)
+            return completion
+        finally:
+            if not recorded:
+                # Cancelled: says nothing about the upstream, free the slot
+                self.breaker.release()
+
+    @abc.abstractmethod
+    async def _complete(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float,
+        activity_data: Optional[Dict[str, Any]]
+    ) -> Completion:
+        """Run one completion against the backend."""
+
+    def configure(
+        self,
+        max_concurrency: Optional[int] = None,
+        model: Optional[str] = None,
+        slow_call_seconds: Optional[float] = None,
+        open_seconds: Optional[float] = None
+    ) -> None:
+        """
+        Apply reloaded settings to a live provider (omitted values are kept).
+
+        A new concurrency limit applies to completions started afterwards;
+        those already admitted finish under the old one.
+
+        Args:
+            max_concurrency: Maximum completions in flight at once
+            model: Model name
+            slow_call_seconds: Circuit breaker slow-call threshold
+            open_seconds: Seconds the circuit breaker stays open
+        """
+        if max_concurrency and max_concurrency != self.max_concurrency:
+            self.max_concurrency = max_concurrency
+            self._semaphore = None
+        if model:
+            self.model = model
+        if slow_call_seconds is not None:
+            self.breaker.slow_call_seconds = slow_call_seconds
+        if open_seconds is not None:
+            self.breaker.open_seconds = open_seconds
+
+    async def warm(self) -> None:
+        """Import the client library and open the client ahead of the first request."""
+
+    async def aclose(self) -> None:
+        """Release network resources held by the provider."""
+
+    def status(self) -> Dict[str, Any]:
+        """Return provider load and breaker state."""
+        return {
+            "provider": self.name,
+            "model": self.model,
+            "available": self.available,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "completed": self.completed,
+            "failed": self.failed,
+            "circuit_breaker": self.breaker.status()
+        }
+
+
+class OpenAIProvider(LLMProvider):
+    """OpenAI API via the official async SDK."""
+
+    name = "openai"
+    default_model = "gpt-3.5-turbo"
+
+    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None, **kwargs):
+        super().__init__(model=model, **kwargs)
+        self.api_key = api_key
+        self._client = None
+
+    @property
+    def available(self) -> bool:
+        return bool(self.api_key)
+
+    def _ensure_client(self):
+        if self._client is None:
+            from openai import AsyncOpenAI
+            self._client = AsyncOpenAI(api_key=self.api_key, max_retries=0)
+        return self._client
+
+    async def warm(self) -> None:
+        if self.available:
+            # The SDK import and its TLS setup are slow; keep them off the event loop
+            await asyncio.to_thread(self._ensure_client)
+
+    async def _complete(self, messages, max_tokens, temperature, activity_data) -> Completion:
+        response = await self._ensure_client().chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            timeout=config.settings.llm.timeout_seconds
+        )
+        usage = getattr(response, "usage", None)
+        return Completion(
+            text=response.choices[0].message.content or "",
+            provider=self.name,
+            model=self.model,
+            prompt_tokens=getattr(usage, "prompt_tokens", None),
+            completion_tokens=getattr(usage, "completion_tokens", None)
+        )
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+
+class OpenAICompatibleProvider(LLMProvider):
+    """Any server implementing POST {base_url}/chat/completions."""
+
+    name = "openai_compatible"
+    default_model = "local-model"
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        **kwargs
+    ):
+        super().__init__(model=model, **kwargs)
+        self.base_url = (base_url or config.settings.llm.base_url).rstrip("/")
+        self.api_key = api_key
+        self._client = None
+
+    @property
+    def available(self) -> bool:
+        return bool(self.base_url)
+
+    def _ensure_client(self):
+        if self._client is None:
+            import httpx
+            headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=headers,
+                # In-flight requests are already bounded by the provider's
+                # (reloadable) concurrency limit
+                limits=httpx.Limits(max_connections=None, max_keepalive_connections=self.max_concurrency)
+            )
+        return self._client
+
+    async def warm(self) -> None:
+        # Importing httpx and loading the TLS CA bundle both block
+        await asyncio.to_thread(self._ensure_client)
+
+    async def _complete(self, messages, max_tokens, temperature, activity_data) -> Completion:
+        response = await self._ensure_client().post(
+            "/chat/completions",
+            json={
+                "model": self.model,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": max_tokens
+            },
+            timeout=config.settings.llm.timeout_seconds
+        )
+        response.raise_for_status()
+        data = response.json()
+        usage = data.get("usage") or {}
+        return Completion(
+            text=data["choices"][0]["message"].get("content") or "",
+            provider=self.name,
+            model=data.get("model", self.model),
+            prompt_tokens=usage.get("prompt_tokens"),
+            completion_tokens=usage.get("completion_tokens")
+        )
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class LocalModelProvider(LLMProvider):
+    """
+    In-process model.
+
+    Runs a GGUF model through llama-cpp-python when it is installed and
+    LOCAL_MODEL_PATH is set. Otherwise falls back to a deterministic
+    extractive model that answers the analysis prompt from the local
+    insight engine, which keeps the refinement path fully CPU-bound and
+    offline (useful for load tests and LLM-less deployments).
+    """
+
+    name = "local"
+    default_model = "devscore-extractive"
+
+    def __init__(self, model_path: Optional[str] = None, model: Optional[str] = None, **kwargs):
+        self._llama = None
+        model_path = model_path or config.settings.llm.local_model_path
+        if model_path:
+            try:
+                from llama_cpp import Llama
+                self._llama = Llama(model_path=model_path, n_ctx=4096, verbose=False)
+                model = model or os.path.basename(model_path)
+                # llama.cpp contexts are not safe to share between threads
+                kwargs["max_concurrency"] = 1
+            except ImportError:
+                logger.warning("llama-cpp-python not installed, using extractive local model")
+        super().__init__(model=model, **kwargs)
+
+    def configure(self, max_concurrency: Optional[int] = None, model: Optional[str] = None, **kwargs) -> None:
+        if self._llama is not None:
+            # Pinned to one in-flight call and to the loaded model file
+            max_concurrency, model = None, None
+        super().configure(max_concurrency=max_concurrency, model=model, **kwargs)
+
+    async def _complete(self, messages, max_tokens, temperature, activity_data) -> Completion:
+        if self._llama is not None:
+            response = await asyncio.to_thread(
+                self._llama.create_chat_completion,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature
+            )
+            usage = response.get("usage") or {}
+            return Completion(
+                text=response["choices"][0]["message"].get("content") or "",
+                provider=self.name,
+                model=self.model,
+                prompt_tokens=usage.get("prompt_tokens"),
+                completion_tokens=usage.get("completion_tokens")
+            )
+
+        text = self._extractive_answer(messages, activity_data)
+        return Completion(text=text, provider=self.name, model=self.model)
+
+    @staticmethod
+    def _extractive_answer(messages: List[Dict[str, str]], activity_data: Optional[Dict[str, Any]]) -> str:
+        """Answer the analysis prompt (JSON) or the one-line description prompt."""
+        prompt = messages[-1].get("content", "") if messages else ""
+        local = analyze_activity(activity_data or {})
+        if "Format as JSON" not in prompt:
+            return local["summary"]
+
+        commits = (activity_data or {}).get("activity", {}).get("commits", {})
+        by_repo = sorted(
+            commits.get("by_repository", {}).items(),
+            key=lambda item: item[1].get("count", 0),
+            reverse=True
+        )
+        languages = commits.get("language_breakdown", {})
+        return json.dumps({
+            "summary": local["summary"],
+            "technical_skills": sorted(languages, key=languages.get, reverse=True),
+            "top_contributions": [f"{name} ({data.get('count', 0)} commits)" for name, data in by_repo[:4]],
+            "development_patterns": local["insights"],
+            "impact": local["insights"][2] if len(local["insights"]) > 2 else "",
+            "recommendations": [],
+            "expertise_areas": local["contribution_areas"] + local["topics"][:3],
+            "development_style": local["development_style"],
+            "contribution_areas": local["contribution_areas"]
+        })
+
+
+_providers: Dict[Tuple, LLMProvider] = {}
+
+
+def create_provider(kind: str, api_key: Optional[str] = None, model: Optional[str] = None, **kwargs) -> LLMProvider:
+    """
+    Create a provider instance.
+
+    Args:
+        kind: "openai", "openai_compatible" or "local"
+        api_key: OpenAI API key (openai_compatible uses LLM_API_KEY)
+        model: Model name override
+
+    Returns:
+        New LLMProvider
+    """
+    if kind == "openai":
+        return OpenAIProvider(api_key=api_key, model=model, **kwargs)
+    if kind == "openai_compatible":
+        # Never forward the OpenAI key to a self-hosted server
+        return OpenAICompatibleProvider(api_key=config.settings.llm.api_key, model=model, **kwargs)
+    if kind == "local":
+        return LocalModelProvider(model=model, **kwargs)
+    raise ValueError(f"Unknown LLM provider: {kind}")
+
+
+def get_provider(api_key: Optional[str] = None, kind: Optional[str] = None) -> LLMProvider:
+    """
+    Get the shared provider for the configured backend.
+
+    Providers are cached so their concurrency limit and circuit breaker
+    apply across all requests in the process.
+
+    Args:
+        api_key: API key for the provider
+        kind: Provider kind (defaults to LLM_PROVIDER)
+
+    Returns:
+        Shared LLMProvider instance
+    """
+    settings = config.settings.llm
+    kind = kind or settings.provider
+    # Endpoint and credentials identify a provider; reloading them yields a new one
+    key = (kind, api_key, settings.base_url, settings.api_key)
+    provider = _providers.get(key)
+    if provider is None:
+        provider = create_provider(kind, api_key=api_key, model=settings.model)
+        _providers[key] = provider
+    return provider
+
+
+def list_providers() -> List[LLMProvider]:
+    """Return all providers created in this process."""
+    return list(_providers.values())
+
+
+def _apply_settings(settings: config.Settings) -> None:
+    for provider in _providers.values():
+        provider.configure(
+            max_concurrency=settings.llm.max_concurrency,
+            model=settings.llm.model,
+            slow_call_seconds=settings.llm.slow_call_seconds,
+            open_seconds=settings.llm.breaker_open_seconds
+        )
+
+
+config.on_reload(_apply_settings)
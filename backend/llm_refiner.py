@@ -5,54 +5,151 @@ Uses OpenAI API to refine and enhance activity descriptions
 and provide insights about developer behavior.
 """
 
-import os
-from typing import Dict, Any, Optional, List
-from dotenv import load_dotenv
+import asyncio
+import hashlib
+import json
+import logging
+from typing import Dict, Any, Optional, List, Callable
 
-load_dotenv()
+import config
+import metrics
+from cache import TTLCache
+from circuit_breaker import CircuitOpenError
+from insight_engine import analyze_activity
+from llm_providers import LLMProvider, Completion, get_provider
+from prompt_builder import PromptBuilder, TokenCounter
 
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+config.load_env()
+
+logger = logging.getLogger(__name__)
+
+# Settings (config.settings.llm) read per request:
+# - premium_only (LLM_PREMIUM_ONLY): the LLM is only called for premium
+#   requests; everything else is served by the local insight engine
+# - hedge_seconds (LLM_HEDGE_SECONDS): if > 0, serve the local fallback when
+#   the LLM has not answered within this budget and let the completion
+#   finish in the background to fill the cache
+
+# Shared across LLMRefiner instances (one is created per request)
+refinement_cache = TTLCache(maxsize=config.settings.llm.cache_size, ttl=config.settings.llm.cache_ttl_seconds)
+config.on_reload(lambda settings: refinement_cache.configure(
+    maxsize=settings.llm.cache_size, ttl=settings.llm.cache_ttl_seconds
+))
+_background_tasks = set()
+
+
+def _keep_in_background(task: asyncio.Task) -> None:
+    """Keep a hedged LLM task alive after its caller has moved on."""
+    _background_tasks.add(task)
+    
+    def _done(t: asyncio.Task) -> None:
+        _background_tasks.discard(t)
+        if not t.cancelled() and t.exception() is not None:
+            logger.error("Background LLM completion failed: %s", t.exception())
+    
+    task.add_done_callback(_done)
+
+
+class LLMUsageStats:
+    """Process-wide token accounting for LLM requests."""
+    
+    def __init__(self):
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.last: Dict[str, Any] = {}
+    
+    def record(self, usage: Dict[str, Any]) -> None:
+        """Record the token usage of a single completion."""
+        self.requests += 1
+        self.prompt_tokens += usage.get("prompt_tokens", 0)
+        self.completion_tokens += usage.get("completion_tokens", 0)
+        self.last = usage
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Return totals and per-request averages."""
+        return {
+            "requests": self.requests,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "avg_prompt_tokens": self.prompt_tokens / self.requests if self.requests else 0,
+            "avg_completion_tokens": self.completion_tokens / self.requests if self.requests else 0,
+            "last": self.last
+        }
+
+
+usage_stats = LLMUsageStats()
 
 class LLMRefiner:
-    """Refines activity data using OpenAI LLM."""
+    """Refines activity data using a pluggable LLM provider (OpenAI by default)."""
+    
+    def __init__(self, api_key: Optional[str] = None, provider: Optional[LLMProvider] = None):
+        """
+        Initialize LLM refiner.
+        
+        Args:
+            api_key: Optional API key (defaults to OPENAI_API_KEY)
+            provider: Optional provider (defaults to the shared configured one)
+        """
+        settings = config.settings.llm
+        self.api_key = api_key or settings.openai_api_key
+        self.provider = provider or get_provider(api_key=self.api_key)
+        if not self.provider.available:
+            logger.warning("LLM provider '%s' not configured", self.provider.name)
+        self.model = self.provider.model
+        self.max_output_tokens = settings.max_output_tokens
+        self.token_counter = TokenCounter(self.model)
+        self.prompt_builder = PromptBuilder(budget_tokens=settings.prompt_token_budget, counter=self.token_counter)
     
-    def __init__(self, api_key: Optional[str] = None):
-        """Initialize LLM refiner with API key."""
-        self.api_key = api_key or OPENAI_API_KEY
-        if not self.api_key:
-            print("Warning: OpenAI API key not configured")
-        self.model = "gpt-3.5-turbo"
+    def use_llm(self, premium: bool = False) -> bool:
+        """Whether a request should be refined by the LLM or the local engine."""
+        return self.provider.available and (premium or not config.settings.llm.premium_only)
     
+    @metrics.timed("llm.refine_activity_summary")
     async def refine_activity_summary(
         self,
-        activity_data: Dict[str, Any]
+        activity_data: Dict[str, Any],
+        premium: bool = False
     ) -> Dict[str, Any]:
         """
         Refine activity data with LLM insights - COMPREHENSIVE VERSION.
         
         Returns enhanced descriptions, detailed insights, and comprehensive analysis.
+        Falls back to the local insight engine when the LLM is disabled for
+        this request or fails.
         """
-        if not self.api_key:
-            return {
-                "summary": self._create_detailed_fallback_summary(activity_data),
-                "insights": self._create_detailed_fallback_insights(activity_data),
-                "languages_used": self._extract_languages(activity_data),
-                "top_projects": self._extract_top_projects(activity_data),
-                "contribution_areas": self._extract_contribution_areas(activity_data),
-                "development_style": self._analyze_development_style(activity_data),
-                "refined": False
-            }
+        if not self.use_llm(premium):
+            return self._local_refinement(activity_data)
+        
+        # Prepare detailed prompt, truncated to the token budget
+        built = self.prompt_builder.build(activity_data)
+        messages = self._analysis_messages(built.text)
+        cache_key = self._cache_key(messages)
+        
+        cached = refinement_cache.get(cache_key)
+        if cached is not None:
+            return {**cached, "cached": True}
         
+        task = asyncio.ensure_future(
+            self._refine_with_llm(activity_data, messages, built, cache_key)
+        )
         try:
-            from openai import OpenAI
-            import json
-            
-            client = OpenAI(api_key=self.api_key)
-            
-            # Prepare detailed prompt
-            activity_str = self._format_activity_detailed(activity_data)
-            
-            prompt = f"""Analyze this developer's GitHub profile comprehensively and provide:
+            return await self._hedged(
+                task,
+                lambda: {**self._local_refinement(activity_data), "hedged": True}
+            )
+        except CircuitOpenError:
+            return {**self._local_refinement(activity_data), "circuit_open": True}
+        except Exception as e:
+            logger.warning("Error refining with LLM: %s", e)
+            return {
+                **self._local_refinement(activity_data),
+                "error": str(e)
+            }
+    
+    def _analysis_messages(self, activity_str: str) -> List[Dict[str, str]]:
+        """Build the chat messages for the comprehensive profile analysis."""
+        prompt = f"""Analyze this developer's GitHub profile comprehensively and provide:
 
 1. EXECUTIVE SUMMARY (2-3 sentences)
    - Overall developer profile and strengths
@@ -78,54 +175,120 @@ GitHub Activity Data:
 
 Format as JSON with keys: "summary", "technical_skills", "top_contributions", "development_patterns", "impact", "recommendations", "expertise_areas"
 """
-            
-            response = client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert developer analyst. Provide comprehensive, detailed analysis of developer profiles."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.7,
-                max_tokens=1500
-            )
-            
-            response_text = response.choices[0].message.content
-            
-            try:
-                result = json.loads(response_text)
-                return {
-                    **result,
-                    "languages_used": self._extract_languages(activity_data),
-                    "top_projects": self._extract_top_projects(activity_data),
-                    "refined": True
-                }
-            except json.JSONDecodeError:
-                return {
-                    "summary": response_text[:300],
-                    "insights": [response_text[300:600]],
-                    "refined": True,
-                    "languages_used": self._extract_languages(activity_data),
-                    "top_projects": self._extract_top_projects(activity_data),
-                }
+        return [
+            {
+                "role": "system",
+                "content": "You are an expert developer analyst. Provide comprehensive, detailed analysis of developer profiles."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+    
+    def _cache_key(self, messages: List[Dict[str, str]]) -> str:
+        """Key completions by model and exact prompt."""
+        payload = json.dumps([self.provider.name, self.model, messages], sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+    
+    async def _refine_with_llm(
+        self,
+        activity_data: Dict[str, Any],
+        messages: List[Dict[str, str]],
+        built: Any,
+        cache_key: str
+    ) -> Dict[str, Any]:
+        """Run the analysis completion, parse it and store it in the cache."""
+        completion = await self._chat_completion(messages, self.max_output_tokens, activity_data)
+        response_text = completion.text
+        token_usage = self._record_usage(completion, messages, built)
         
-        except Exception as e:
-            print(f"Error refining with LLM: {e}")
-            return {
-                "summary": self._create_detailed_fallback_summary(activity_data),
-                "insights": self._create_detailed_fallback_insights(activity_data),
+        try:
+            result = {
+                **json.loads(response_text),
                 "languages_used": self._extract_languages(activity_data),
                 "top_projects": self._extract_top_projects(activity_data),
-                "contribution_areas": self._extract_contribution_areas(activity_data),
-                "development_style": self._analyze_development_style(activity_data),
-                "refined": False,
-                "error": str(e)
+                "token_usage": token_usage,
+                "refined": True
             }
+        except json.JSONDecodeError:
+            result = {
+                "summary": response_text[:300],
+                "insights": [response_text[300:600]],
+                "refined": True,
+                "languages_used": self._extract_languages(activity_data),
+                "top_projects": self._extract_top_projects(activity_data),
+                "token_usage": token_usage,
+            }
+        
+        refinement_cache.set(cache_key, result)
+        return result
+    
+    async def _chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        activity_data: Optional[Dict[str, Any]] = None
+    ) -> Completion:
+        """
+        Run a chat completion on the provider.
+        
+        Raises CircuitOpenError when the provider's circuit breaker rejects it.
+        """
+        return await self.provider.complete(
+            messages,
+            max_tokens=max_tokens,
+            temperature=0.7,
+            activity_data=activity_data
+        )
+    
+    async def _hedged(self, task: asyncio.Future, fallback: Callable[[], Any]) -> Any:
+        """
+        Await an LLM task, or return the fallback once the hedge budget expires.
+        
+        A hedged-out task keeps running so its result still reaches the cache.
+        """
+        hedge_seconds = config.settings.llm.hedge_seconds
+        if hedge_seconds <= 0:
+            return await task
+        done, _ = await asyncio.wait({task}, timeout=hedge_seconds)
+        if task in done:
+            return task.result()
+        _keep_in_background(task)
+        return fallback()
+    
+    def _local_refinement(self, activity_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build refined output with the local insight engine (no LLM)."""
+        local = analyze_activity(activity_data)
+        return {
+            "summary": local["summary"],
+            "insights": local["insights"],
+            "languages_used": self._extract_languages(activity_data),
+            "top_projects": self._extract_top_projects(activity_data),
+            "contribution_areas": local["contribution_areas"],
+            "topics": local["topics"],
+            "development_style": local["development_style"],
+            "refined": False
+        }
+    
+    def _record_usage(self, completion: Completion, messages: List[Dict[str, str]], built: Any) -> Dict[str, Any]:
+        """Collect tokens-in/out for a completion and add them to the usage stats."""
+        estimated = self.token_counter.count_messages(messages)
+        token_usage = {
+            "provider": completion.provider,
+            "model": completion.model,
+            "prompt_tokens": completion.prompt_tokens or estimated,
+            "completion_tokens": completion.completion_tokens or self.token_counter.count(completion.text),
+            "latency_seconds": round(completion.latency, 4),
+            "prompt_tokens_estimated": estimated,
+            "activity_tokens": built.tokens,
+            "activity_budget": built.budget,
+            "truncated_sections": built.truncated_sections,
+            "dropped_sections": built.dropped_sections,
+            "duplicate_commits_removed": built.duplicate_commits_removed
+        }
+        usage_stats.record(token_usage)
+        return token_usage
     
     def _extract_languages(self, activity_data: Dict[str, Any]) -> List[str]:
         """Extract programming languages used."""
@@ -141,194 +304,9 @@ Format as JSON with keys: "summary", "technical_skills", "top_contributions", "d
         repo_list = repos.get("repositories", [])
         return sorted(repo_list, key=lambda x: x.get("stars", 0), reverse=True)[:5]
     
-    def _extract_contribution_areas(self, activity_data: Dict[str, Any]) -> List[str]:
-        """Extract areas of contribution."""
-        activity = activity_data.get("activity", {})
-        repos = activity.get("repositories", {})
-        repo_list = repos.get("repositories", [])
-        
-        areas = set()
-        for repo in repo_list:
-            description = (repo.get("description") or "").lower()
-            if description:
-                if any(word in description for word in ["web", "frontend", "react", "vue", "angular"]):
-                    areas.add("Web Development")
-                if any(word in description for word in ["backend", "api", "server", "database", "django", "fastapi"]):
-                    areas.add("Backend Development")
-                if any(word in description for word in ["mobile", "ios", "android", "flutter"]):
-                    areas.add("Mobile Development")
-                if any(word in description for word in ["data", "ml", "ai", "machine", "neural", "tensorflow", "pytorch"]):
-                    areas.add("Data/AI/ML")
-                if any(word in description for word in ["devops", "docker", "kubernetes", "cloud", "aws", "azure", "gcp"]):
-                    areas.add("DevOps/Cloud")
-                if any(word in description for word in ["tool", "cli", "lib", "framework", "utility"]):
-                    areas.add("Tools & Libraries")
-        
-        return list(areas) if areas else ["General Development"]
-    
-    def _analyze_development_style(self, activity_data: Dict[str, Any]) -> str:
-        """Analyze development style based on activity."""
-        summary = activity_data.get("summary", {})
-        prs = summary.get("total_prs", 0)
-        issues = summary.get("total_issues", 0)
-        commits = summary.get("total_commits", 0)
-        
-        if prs > commits * 0.2:
-            return "Collaborative - Strong focus on code review and teamwork"
-        elif issues > commits * 0.2:
-            return "Community-focused - Active in discussions and issue resolution"
-        elif commits > 500:
-            return "Prolific contributor - High commit volume and productivity"
-        else:
-            return "Balanced - Mix of commits, PRs, and community engagement"
-    
     def _format_activity_detailed(self, activity_data: Dict[str, Any]) -> str:
-        """Format activity data with full detail for LLM."""
-        summary = activity_data.get("summary", {})
-        activity = activity_data.get("activity", {})
-        user_info = activity_data.get("user_info", {})
-        
-        commits = activity.get("commits", {})
-        prs = activity.get("pull_requests", {})
-        issues = activity.get("issues", {})
-        repos = activity.get("repositories", {})
-        
-        output = f"""
-=== DEVELOPER PROFILE ===
-Username: {activity_data.get("username")}
-Name: {user_info.get("name", "N/A")}
-Bio: {user_info.get("bio", "N/A")}
-Location: {user_info.get("location", "N/A")}
-Followers: {user_info.get("followers")}
-Following: {user_info.get("following")}
-Public Repositories: {user_info.get("public_repos")}
-
-=== ACTIVITY SUMMARY (Last {summary.get("time_period", "30 days")}) ===
-Total Commits: {summary.get("total_commits")}
-Pull Requests: {summary.get("total_prs")} (Merged: {prs.get("merged", 0)}, Open: {prs.get("open", 0)})
-Issues: {summary.get("total_issues")} (Closed: {issues.get("closed", 0)}, Open: {issues.get("open", 0)})
-Repositories with Commits: {commits.get("repositories_with_commits", 0)}
-Total Stars Across Repos: {summary.get("total_stars")}
-
-=== PROGRAMMING LANGUAGES ===
-{self._format_languages(commits.get("language_breakdown", {}))}
-
-=== TOP REPOSITORIES ===
-{self._format_repos(repos.get("repositories", [])[:10])}
-
-=== CONTRIBUTION BREAKDOWN ===
-Commits by Repository:
-{self._format_commits_by_repo(commits.get("by_repository", {}))}
-
-=== RECENT COMMITS (Sample) ===
-{self._format_recent_commits(commits.get("commit_details", [])[:15])}
-"""
-        return output
-    
-    def _format_languages(self, language_breakdown: Dict[str, int]) -> str:
-        """Format language breakdown."""
-        if not language_breakdown:
-            return "No language data"
-        sorted_langs = sorted(language_breakdown.items(), key=lambda x: x[1], reverse=True)
-        return "\n".join([f"  • {lang}: {count} commits" for lang, count in sorted_langs[:10]])
-    
-    def _format_repos(self, repos: List[Dict]) -> str:
-        """Format repository list."""
-        if not repos:
-            return "No repositories"
-        return "\n".join([
-            f"  • {repo['name']}: {(repo.get('description') or 'N/A')[:60]}... ({repo['stars']} ⭐, {repo['forks']} 🔀)"
-            for repo in repos
-        ])
-    
-    def _format_commits_by_repo(self, commits_by_repo: Dict[str, Any]) -> str:
-        """Format commits by repository."""
-        if not commits_by_repo:
-            return "No commit data"
-        sorted_repos = sorted(commits_by_repo.items(), key=lambda x: x[1]['count'], reverse=True)
-        return "\n".join([
-            f"  • {repo_name}: {data['count']} commits ({data.get('language', 'Unknown')})"
-            for repo_name, data in sorted_repos[:15]
-        ])
-    
-    def _format_recent_commits(self, commit_details: List[Dict]) -> str:
-        """Format recent commits."""
-        if not commit_details:
-            return "No commit details"
-        return "\n".join([
-            f"  • [{commit['repo']}] {commit['message'].split(chr(10))[0][:50]}..."
-            for commit in commit_details[:10]
-        ])
-    
-    def _create_detailed_fallback_summary(self, activity_data: Dict[str, Any]) -> str:
-        """Create detailed fallback summary without LLM."""
-        summary = activity_data.get("summary", {})
-        user_info = activity_data.get("user_info", {})
-        commits_data = activity_data.get("activity", {}).get("commits", {})
-        
-        commits = summary.get("total_commits", 0)
-        prs = summary.get("total_prs", 0)
-        languages = list(commits_data.get("language_breakdown", {}).keys())
-        
-        lang_str = ", ".join(languages[:5]) if languages else "multiple languages"
-        
-        if commits > 500:
-            return f"{user_info.get('name', 'Developer')} is a prolific contributor with {commits} commits across {summary.get('public_repos')} repositories, primarily using {lang_str}. Strong track record with {prs} pull requests."
-        elif prs > commits * 0.3:
-            return f"Collaborative developer {user_info.get('name', '')} with {commits} commits and {prs} PRs, demonstrating strong teamwork in {lang_str}."
-        else:
-            return f"Active developer {user_info.get('name', '')} with {commits} commits, {prs} PRs, and expertise in {lang_str}."
-    
-    def _create_detailed_fallback_insights(self, activity_data: Dict[str, Any]) -> List[str]:
-        """Create detailed fallback insights without LLM."""
-        summary = activity_data.get("summary", {})
-        activity = activity_data.get("activity", {})
-        repos = activity.get("repositories", {})
-        
-        insights = []
-        
-        # Insight 1: Contribution level
-        commits = summary.get("total_commits", 0)
-        if commits > 500:
-            insights.append("Exceptional contributor with 500+ commits showing strong development momentum")
-        elif commits > 200:
-            insights.append(f"Consistent contributor with {commits} commits across multiple projects")
-        elif commits > 50:
-            insights.append(f"Active contributor with {commits} commits indicating regular development activity")
-        else:
-            insights.append(f"Moderate contribution level with {commits} commits")
-        
-        # Insight 2: Language diversity
-        commits_data = activity.get("commits", {})
-        languages = commits_data.get("language_breakdown", {})
-        if len(languages) >= 5:
-            insights.append(f"Polyglot developer - proficient in {len(languages)} different programming languages")
-        elif len(languages) >= 3:
-            insights.append(f"Multi-language expertise across {', '.join(list(languages.keys())[:3])}")
-        else:
-            insights.append(f"Specialized in {', '.join(languages.keys())}")
-        
-        # Insight 3: Project scope
-        repo_count = repos.get("total", 0)
-        total_stars = repos.get("total_stars", 0)
-        if total_stars > 100:
-            insights.append(f"Impactful projects with {total_stars}+ stars, demonstrating popular contributions")
-        elif repo_count > 20:
-            insights.append(f"Diverse portfolio with {repo_count}+ repositories across different domains")
-        else:
-            insights.append(f"Focused development with {repo_count} key repositories")
-        
-        # Insight 4: Collaboration style
-        prs = summary.get("total_prs", 0)
-        issues = summary.get("total_issues", 0)
-        if prs > commits * 0.2:
-            insights.append("Strong team player with significant pull request contributions")
-        elif issues > commits * 0.2:
-            insights.append("Active community participant engaged in issue tracking and resolution")
-        else:
-            insights.append("Independent builder focused on code contributions and development")
-        
-        return insights[:5]
+        """Format activity data for the LLM, truncated to the prompt token budget."""
+        return self.prompt_builder.build(activity_data).text
     
     async def generate_activity_description(
         self,
@@ -336,39 +314,49 @@ Commits by Repository:
         commits: int,
         prs: int,
         issues: int,
-        repos: int
+        repos: int,
+        premium: bool = False,
+        activity_data: Optional[Dict[str, Any]] = None
     ) -> str:
-        """Generate a natural language description of activity."""
-        if not self.api_key:
+        """
+        Generate a natural language description of activity.
+
+        activity_data is passed to the provider, which the local model
+        answers from instead of the prompt.
+        """
+        if not self.use_llm(premium):
             return self._create_fallback_description(username, commits, prs, issues, repos)
         
-        try:
-            from openai import OpenAI
-            
-            client = OpenAI(api_key=self.api_key)
-            
-            prompt = f"""In one sentence, describe {username}'s GitHub activity this month:
+        prompt = f"""In one sentence, describe {username}'s GitHub activity this month:
 - {commits} commits
 - {prs} pull requests
 - {issues} issues
 - {repos} repositories
 
 Be professional and positive."""
-            
-            response = client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=100
-            )
-            
-            return response.choices[0].message.content.strip()
+        messages = [{"role": "user", "content": prompt}]
+        cache_key = self._cache_key(messages)
         
-        except Exception as e:
-            print(f"Error generating description: {e}")
+        cached = refinement_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        def fallback() -> str:
             return self._create_fallback_description(username, commits, prs, issues, repos)
+        
+        async def describe() -> str:
+            completion = await self._chat_completion(messages, 100, activity_data)
+            description = completion.text.strip()
+            refinement_cache.set(cache_key, description)
+            return description
+        
+        try:
+            return await self._hedged(asyncio.ensure_future(describe()), fallback)
+        except CircuitOpenError:
+            return fallback()
+        except Exception as e:
+            logger.warning("Error generating description: %s", e)
+            return fallback()
     
     def _format_activity_for_prompt(self, activity_data: Dict[str, Any]) -> str:
         """Format activity data for LLM prompt."""
@@ -451,7 +439,8 @@ Be professional and positive."""
     
     async def enhance_activity_data(
         self,
-        activity_data: Dict[str, Any]
+        activity_data: Dict[str, Any],
+        premium: bool = False
     ) -> Dict[str, Any]:
         """
         Enhance activity data with LLM-generated insights and descriptions.
@@ -460,18 +449,20 @@ Be professional and positive."""
         """
         summary = activity_data.get("summary", {})
         
-        # Generate description
-        description = await self.generate_activity_description(
-            username=activity_data.get("username", "Developer"),
-            commits=summary.get("total_commits", 0),
-            prs=summary.get("total_prs", 0),
-            issues=summary.get("total_issues", 0),
-            repos=summary.get("public_repos", 0)
+        # Generate description and insights concurrently
+        description, refined = await asyncio.gather(
+            self.generate_activity_description(
+                username=activity_data.get("username", "Developer"),
+                commits=summary.get("total_commits", 0),
+                prs=summary.get("total_prs", 0),
+                issues=summary.get("total_issues", 0),
+                repos=summary.get("public_repos", 0),
+                premium=premium,
+                activity_data=activity_data
+            ),
+            self.refine_activity_summary(activity_data, premium=premium)
         )
         
-        # Get insights
-        refined = await self.refine_activity_summary(activity_data)
-        
         # Merge results
         return {
             **activity_data,
@@ -482,9 +473,12 @@ Be professional and positive."""
                 "languages_used": refined.get("languages_used", []),
                 "top_projects": refined.get("top_projects", []),
                 "contribution_areas": refined.get("contribution_areas", []),
+                "topics": refined.get("topics", []),
                 "development_style": refined.get("development_style", ""),
                 "recommendations": refined.get("recommendations", ""),
-                "llm_enabled": refined.get("refined", False)
+                "llm_enabled": refined.get("refined", False),
+                "degraded": bool(refined.get("circuit_open") or refined.get("hedged") or refined.get("error")),
+                "token_usage": refined.get("token_usage")
             }
         }
     
@@ -509,7 +503,8 @@ Be professional and positive."""
 
 async def enhance_github_activity(
     activity_data: Dict[str, Any],
-    api_key: Optional[str] = None
+    api_key: Optional[str] = None,
+    premium: bool = False
 ) -> Dict[str, Any]:
     """
     Convenience function to enhance GitHub activity data with LLM insights.
@@ -517,9 +512,10 @@ async def enhance_github_activity(
     Args:
         activity_data: Raw GitHub activity data
         api_key: Optional OpenAI API key
+        premium: Use the LLM even when LLM_PREMIUM_ONLY is enabled
     
     Returns:
         Enhanced activity data with LLM insights
     """
     refiner = LLMRefiner(api_key=api_key)
-    return await refiner.enhance_activity_data(activity_data)
+    return await refiner.enhance_activity_data(activity_data, premium=premium)
@@ -0,0 +1,277 @@
+"""
+Logging
+
+Structured, non-blocking logging for the API and its background jobs.
+
+- Modules log through the standard library (logging.getLogger(__name__))
+  with %-style arguments, so disabled levels cost one level check and no
+  string formatting
+- Records are handed to a bounded in-memory queue; a listener thread
+  serializes them as JSON lines and writes them to stdout. The request
+  path never touches stdout, and when the queue is full records are
+  dropped (and counted) instead of blocking
+- Every record carries the request ID (X-Request-Id, set by
+  RequestIdMiddleware) and the active trace/span IDs, so logs join up with
+  traces and with each other
+- Repeated messages are sampled per call site: after LOG_SAMPLE_BURST
+  records from the same template within LOG_SAMPLE_WINDOW_SECONDS, the rest
+  of the window is suppressed and the next record reports how many were
+  skipped, so an error storm cannot flood the output. CRITICAL records
+  are never sampled
+- Levels are set globally (LOG_LEVEL) and per logger
+  (LOG_LEVELS="github_integration=WARNING,tracing=ERROR")
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+import uuid
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+import tracing
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# httpx logs every outgoing request at INFO
+LOG_LEVELS = os.getenv("LOG_LEVELS", "httpx=WARNING,httpcore=WARNING")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")  # json | text
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_SAMPLE_BURST = int(os.getenv("LOG_SAMPLE_BURST", "20"))
+LOG_SAMPLE_WINDOW_SECONDS = float(os.getenv("LOG_SAMPLE_WINDOW_SECONDS", "60"))
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else was passed via `extra`
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+def parse_levels(spec: str) -> Dict[str, int]:
+    """
+    Parse a per-logger level spec.
+
+    Args:
+        spec: Comma-separated "logger=LEVEL" pairs
+
+    Returns:
+        Logger name -> numeric level
+    """
+    levels = {}
+    for item in spec.split(","):
+        name, _, level = item.partition("=")
+        if name.strip() and level.strip():
+            levels[name.strip()] = logging.getLevelName(level.strip().upper())
+    return levels
+
+
+class ContextFilter(logging.Filter):
+    """Stamps records with the request and trace IDs of the calling context."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        context = tracing.current_context()
+        record.trace_id = context.trace_id if context is not None else None
+        record.span_id = context.span_id if context is not None else None
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Caps how often the same message template is logged."""
+
+    def __init__(self, burst: int = LOG_SAMPLE_BURST, window: float = LOG_SAMPLE_WINDOW_SECONDS):
+        """
+        Initialize the filter.
+
+        Args:
+            burst: Records per template let through in each window
+                (0 disables sampling)
+            window: Window length in seconds
+        """
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self.suppressed = 0
+        self._windows: Dict[Tuple[str, int, str], list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.burst <= 0 or record.levelno >= logging.CRITICAL:
+            return True
+        # The unformatted template identifies the call site, e.g. one
+        # "Error fetching commits for %s: %s" per repo
+        key = (record.name, record.lineno, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            state = self._windows.get(key)
+            if state is None or now - state[0] >= self.window:
+                skipped = state[2] if state is not None else 0
+                self._windows[key] = [now, 1, 0]
+                if skipped:
+                    record.suppressed = skipped
+                return True
+            if state[1] < self.burst:
+                state[1] += 1
+                return True
+            state[2] += 1
+            self.suppressed += 1
+            return False
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per record."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and value is not None:
+                entry[key] = value
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines for local development."""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        if getattr(record, "request_id", None):
+            line += f" [req {record.request_id}]"
+        return line
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that never blocks and defers formatting to the listener."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message and traceback now (args may be mutable or
+        # unpicklable), but leave JSON serialization to the listener thread
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = "".join(traceback.format_exception(*record.exc_info)).rstrip()
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_handler: Optional[_QueueHandler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+_sampler: Optional[SamplingFilter] = None
+
+
+def setup(
+    level: str = LOG_LEVEL,
+    levels: str = LOG_LEVELS,
+    fmt: str = LOG_FORMAT,
+    stream=None
+) -> None:
+    """
+    Route the root logger through the queue handler.
+
+    Safe to call more than once; later calls only update levels.
+
+    Args:
+        level: Root log level
+        levels: Per-logger level spec (see parse_levels)
+        fmt: "json" or "text"
+        stream: Output stream (default: stdout)
+    """
+    global _handler, _listener, _sampler
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    for name, logger_level in parse_levels(levels).items():
+        logging.getLogger(name).setLevel(logger_level)
+
+    if _handler is not None:
+        return
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(TextFormatter() if fmt == "text" else JSONFormatter())
+
+    _sampler = SamplingFilter()
+    _handler = _QueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+    _handler.addFilter(_sampler)
+    _handler.addFilter(ContextFilter())
+    root.addHandler(_handler)
+
+    _listener = logging.handlers.QueueListener(_handler.queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown)
+
+
+def shutdown() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _handler, _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    if _handler is not None:
+        logging.getLogger().removeHandler(_handler)
+        _handler = None
+
+
+def stats() -> Dict:
+    """Return logging counters."""
+    return {
+        "queued": _handler.queue.qsize() if _handler is not None else 0,
+        "dropped": _handler.dropped if _handler is not None else 0,
+        "suppressed": _sampler.suppressed if _sampler is not None else 0
+    }
+
+
+class RequestIdMiddleware:
+    """
+    ASGI middleware assigning each request an ID.
+
+    Reuses an incoming X-Request-Id (e.g. from a load balancer), otherwise
+    generates one, and echoes it in the response headers.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        request_id = headers.get(b"x-request-id", b"").decode("latin-1")[:64] or uuid.uuid4().hex[:16]
+        token = request_id_var.set(request_id)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-request-id", request_id.encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id_var.reset(token)
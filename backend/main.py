@@ -1,24 +1,73 @@
 """
 DevScore Backend - FastAPI Application
 Run with: uvicorn main:app --reload --port 8000
+Production (one worker per CPU): python serve.py
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, Header, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, List
+import asyncio
+import hmac
+import logging
+import signal
 import sqlite3
-from contextlib import contextmanager
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+_import_started = time.perf_counter()
+
+# First: applies .env before any module below reads its settings
+import config
+
+import activity_views
+import logs
+import metrics
+import profiler
+import responses
+import tracing
 
 from score_engine import calculate_devscore
-from qubic_client import QubicClient
-from github_integration import GitHubClient, get_github_activity_for_user
-from llm_refiner import LLMRefiner, enhance_github_activity
+from qubic_client import QubicClient, AsyncQubicClient, DevScoreNFT, NFTMintRequest
+from mint_queue import MintQueue
+from tx_tracker import TransactionTracker
+from nft_registry import NFTRegistry
+from chain_indexer import ChainIndexer
+from metadata_store import MetadataStore
+from idempotency import IdempotencyStore, IdempotencyConflictError, fingerprint
+from github_integration import ACTIVITY_SECTIONS, GitHubClient, get_github_activity_for_user, ssl_context
+from llm_refiner import LLMRefiner, enhance_github_activity, refinement_cache, usage_stats
+from llm_providers import get_provider, list_providers
+from singleflight import CoalescingCache
+from shared_state import Leadership, SharedState
+
+# JSON logs via a background writer thread (LOG_LEVEL, LOG_LEVELS, LOG_FORMAT)
+logs.setup()
+logger = logging.getLogger(__name__)
+
+# App module import (after FastAPI itself), startup and warm-up durations,
+# exported with the metrics
+startup_timings: Dict[str, float] = {}
+_background_tasks = set()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background services (and warm-up) before serving, stop them after."""
+    await startup_event()
+    try:
+        yield
+    finally:
+        await shutdown_event()
 
 app = FastAPI(
     title="DevScore API",
     description="Blockchain-backed developer reputation engine",
-    version="1.0.0"
+    version="1.0.0",
+    # orjson-backed; endpoints with large payloads also declare response models
+    default_response_class=responses.FastJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS middleware for frontend communication
@@ -30,13 +79,104 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize Qubic client
-qubic = QubicClient()
+# gzip/brotli above COMPRESSION_MIN_SIZE; added before the metrics and
+# tracing middleware so request timings include compression
+app.add_middleware(responses.CompressionMiddleware)
+
+# Per-route request latency, exposed at /metrics
+app.add_middleware(metrics.MetricsMiddleware)
+
+# One SERVER span per request when TRACING_EXPORTER is set
+app.add_middleware(tracing.TracingMiddleware)
+
+# Outermost: X-Request-Id on every response and on every log record
+app.add_middleware(logs.RequestIdMiddleware)
+
+def premium_access(x_admin_token: Optional[str] = Header(None)) -> bool:
+    """
+    Whether the request may bypass LLM_PREMIUM_ONLY.
+
+    Decided by the server (the admin token), never by client parameters,
+    since premium requests are the ones that cost LLM tokens.
+    """
+    admin_token = config.settings.server.admin_token
+    return bool(admin_token and x_admin_token and hmac.compare_digest(x_admin_token, admin_token))
+
+# Cache, locks and nonce counters shared by the workers of a host (serve.py
+# sets SHARED_STATE_PATH when starting more than one); None: single worker
+shared_state = (
+    SharedState(config.settings.server.shared_state_path)
+    if config.settings.server.shared_state_path else None
+)
+
+# Coalesces concurrent GitHub activity requests and reuses results briefly
+github_activity_cache = CoalescingCache(
+    ttl=config.settings.github.activity_cache_ttl_seconds,
+    maxsize=config.settings.github.activity_cache_size,
+    shared=shared_state,
+    namespace="github_activity"
+)
+
+# Runs concurrent score syncs of the same wallet once (across workers)
+sync_flight = CoalescingCache(ttl=5.0, maxsize=1024, shared=shared_state, namespace="sync_score")
+
+async def load_github_activity(
+    github_username: str,
+    days: int,
+    refine: bool,
+    premium: bool = False,
+    sections: Iterable[str] = ACTIVITY_SECTIONS
+) -> Dict[str, Any]:
+    """
+    Fetch (and optionally refine) GitHub activity, coalescing concurrent calls.
+    
+    Requests for the same (username, days, refine, premium, sections) share
+    a single in-flight crawl and its result is cached for
+    GITHUB_ACTIVITY_CACHE_TTL seconds. A cached crawl of every section also
+    serves requests for fewer sections, and a refined one (e.g. from the
+    default view or sync-score) also serves unrefined requests.
+    """
+    sections = frozenset(sections)
+    # Premium only changes refinement
+    premium = premium and refine
+    key = (github_username.lower(), days, refine, premium, sections)
+    variants = [(True, premium)] if refine else [(False, False), (True, False), (True, True)]
+    for refined, refined_premium in variants:
+        complete_key = (key[0], days, refined, refined_premium, frozenset(ACTIVITY_SECTIONS))
+        if complete_key == key:
+            continue
+        complete = await github_activity_cache.peek(complete_key)
+        if complete is not None:
+            if refined and not refine:
+                complete = {name: value for name, value in complete.items() if name != "refined"}
+            return complete
+    
+    async def load() -> Dict[str, Any]:
+        with metrics.stage("github_activity.fetch"):
+            activity_data = await get_github_activity_for_user(github_username, days, sections=sections)
+        if refine:
+            with metrics.stage("github_activity.refine"):
+                return await enhance_github_activity(activity_data, premium=premium)
+        return activity_data
+    
+    return await github_activity_cache.get_or_load(key, load)
+
+# Stamped into the database by init_db; bump when the schema below changes
+# (2: WAL journal, so workers read while another one writes)
+SCHEMA_VERSION = 2
 
 # Database setup
 def init_db():
-    """Initialize SQLite database with users table."""
+    """
+    Initialize SQLite database with users table.
+    
+    Skipped (one PRAGMA read) when the database is already at SCHEMA_VERSION,
+    so a new worker does not rerun the DDL on every start.
+    """
     with get_db() as conn:
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            return
+        conn.execute("PRAGMA journal_mode=WAL")
         conn.execute("""
             CREATE TABLE IF NOT EXISTS users (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -62,18 +202,189 @@ def init_db():
                 FOREIGN KEY (user_id) REFERENCES users(id)
             )
         """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS transactions (
+                tx_hash TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                token_ids TEXT,
+                network TEXT,
+                status TEXT NOT NULL DEFAULT 'pending',
+                confirmations INTEGER DEFAULT 0,
+                error TEXT,
+                submitted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                confirmed_at TIMESTAMP
+            )
+        """)
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_transactions_status ON transactions(status, submitted_at)"
+        )
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS nfts (
+                token_id TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                score INTEGER NOT NULL,
+                commits INTEGER DEFAULT 0,
+                pull_requests INTEGER DEFAULT 0,
+                issues INTEGER DEFAULT 0,
+                discord_messages INTEGER DEFAULT 0,
+                minted_at INTEGER,
+                metadata_uri TEXT,
+                transaction_hash TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_nfts_owner ON nfts(owner, score DESC)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_nfts_score ON nfts(score DESC)")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS idempotency_keys (
+                key TEXT PRIMARY KEY,
+                request_hash TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS chain_events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                height INTEGER NOT NULL,
+                block_hash TEXT NOT NULL,
+                log_index INTEGER NOT NULL,
+                event TEXT NOT NULL,
+                token_id TEXT,
+                tx_hash TEXT,
+                data TEXT NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_chain_events_token ON chain_events(token_id, height)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_chain_events_height ON chain_events(height)")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS indexed_blocks (
+                height INTEGER PRIMARY KEY,
+                block_hash TEXT NOT NULL,
+                parent_hash TEXT NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS indexer_checkpoints (
+                name TEXT PRIMARY KEY,
+                height INTEGER NOT NULL,
+                block_hash TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
         conn.commit()
 
 @contextmanager
 def get_db():
-    """Database connection context manager."""
-    conn = sqlite3.connect("devscore.db")
+    """Database connection context manager (DATABASE_PATH, default devscore.db)."""
+    conn = sqlite3.connect(config.settings.database.path, factory=metrics.InstrumentedConnection)
     conn.row_factory = sqlite3.Row
     try:
         yield conn
     finally:
         conn.close()
 
+# Local index of every minted NFT, kept current on mint/transfer
+nft_registry = NFTRegistry(get_db)
+
+# Content-addressed token metadata and badges, rendered once at mint time
+metadata_store = MetadataStore()
+
+# Initialize Qubic client
+qubic = QubicClient(registry=nft_registry, metadata_store=metadata_store)
+async_qubic = AsyncQubicClient(qubic)
+
+# Follows submitted transactions to confirmation in the background
+tx_tracker = TransactionTracker(async_qubic, db=get_db)
+
+# Batches concurrent mint requests into bundled transactions
+mint_queue = MintQueue(async_qubic, tracker=tx_tracker)
+
+# Replays stored mint responses for retried requests
+idempotency = IdempotencyStore(get_db, shared=shared_state)
+
+# Treasury nonces must be unique across workers
+if shared_state is not None:
+    qubic.wallets.nonce_store = shared_state
+
+# Tails contract events into the registry when a node is configured
+chain_indexer = ChainIndexer(qubic.node, nft_registry, get_db) if qubic.node is not None else None
+
+async def _become_leader() -> None:
+    tx_tracker.polling = True
+    if chain_indexer is not None:
+        await chain_indexer.start()
+
+async def _step_down() -> None:
+    tx_tracker.polling = False
+    if chain_indexer is not None:
+        await chain_indexer.stop()
+
+# With several workers and a node, one worker (the lease holder) indexes the
+# chain and polls transaction status; the others only wake their waiters.
+# Without a node, placeholder statuses live in the minting worker, so every
+# worker keeps polling.
+leadership = (
+    Leadership(shared_state, "background", _become_leader, _step_down)
+    if shared_state is not None and qubic.node is not None else None
+)
+if leadership is not None:
+    tx_tracker.polling = False
+
+def apply_settings(settings: config.Settings) -> None:
+    """Push reloaded settings into the caches and queues created above."""
+    github_activity_cache.cache.configure(
+        maxsize=settings.github.activity_cache_size, ttl=settings.github.activity_cache_ttl_seconds
+    )
+    nft_registry.cache.configure(maxsize=settings.cache.nft_size, ttl=settings.cache.nft_ttl_seconds)
+    metadata_store.cache.configure(maxsize=settings.cache.metadata_size)
+    qubic.wallets.cache.configure(maxsize=settings.cache.wallet_size)
+    qubic.wallets.ttl = settings.cache.wallet_ttl_seconds
+    qubic.wallets.refresh_interval = settings.cache.wallet_refresh_interval_seconds
+    qubic.wallets.hot_window = settings.cache.wallet_hot_window_seconds
+    mint_queue.max_batch_size = settings.qubic.mint_batch_size
+    mint_queue.max_wait = settings.qubic.mint_batch_window_ms / 1000.0
+    tx_tracker.poll_interval = settings.qubic.tx_poll_interval_seconds
+    tx_tracker.batch_size = settings.qubic.tx_status_batch_size
+    idempotency.window_seconds = settings.nft.idempotency_window_seconds
+
+# Scoring, LLM and GitHub settings are read per request; the rest is applied here
+config.on_reload(apply_settings)
+
+def reload_settings() -> None:
+    """SIGHUP handler: reload settings, keeping the current ones if invalid."""
+    try:
+        config.reload()
+    except config.SettingsError as e:
+        logger.error("%s; keeping current settings", e)
+
+# Cache hit ratios, queue depths and counters, read at scrape time
+metrics.register_stats("github_activity_cache", github_activity_cache.stats)
+metrics.register_stats("refinement_cache", refinement_cache.stats)
+metrics.register_stats("llm_usage", usage_stats.snapshot)
+metrics.register_stats("llm_providers", lambda: {provider.name: provider.status() for provider in list_providers()})
+metrics.register_stats("mint_queue", mint_queue.stats)
+metrics.register_stats("tx_tracker", tx_tracker.stats)
+metrics.register_stats("idempotency", idempotency.stats)
+metrics.register_stats("wallets", qubic.wallets.stats)
+metrics.register_stats("nft_registry", nft_registry.stats)
+metrics.register_stats("metadata_store", metadata_store.stats)
+metrics.register_stats("tracing", tracing.tracer.stats)
+metrics.register_stats("logging", logs.stats)
+metrics.register_stats("startup", lambda: startup_timings)
+
+# Reports synchronous calls that block the event loop
+loop_monitor = profiler.LoopLagMonitor()
+metrics.register_stats("event_loop", loop_monitor.stats)
+if chain_indexer is not None:
+    metrics.register_stats("chain_indexer", chain_indexer.stats)
+if shared_state is not None:
+    metrics.register_stats("shared_state", shared_state.stats)
+if leadership is not None:
+    metrics.register_stats("leadership", leadership.stats)
+
 # Pydantic models
 class UserCreate(BaseModel):
     wallet_address: str
@@ -91,6 +402,9 @@ class MintRequest(BaseModel):
     score: int
     activity: ActivityData
 
+class BatchMintRequest(BaseModel):
+    mints: List[MintRequest]
+
 class DashboardResponse(BaseModel):
     wallet_address: str
     github_username: Optional[str]
@@ -103,11 +417,126 @@ class GitHubConnectRequest(BaseModel):
     wallet_address: str
     github_username: str
 
+class LeaderboardEntry(BaseModel):
+    rank: int
+    wallet_address: str
+    username: str
+    score: int
+    has_nft: bool
+
+class LeaderboardResponse(BaseModel):
+    leaderboard: List[LeaderboardEntry]
+
+class NFTListResponse(BaseModel):
+    nfts: List[DevScoreNFT]
+
+class OwnerNFTsResponse(BaseModel):
+    owner: str
+    nfts: List[DevScoreNFT]
+
+# GitHub activity payload (see GitHubClient.get_user_activity_summary)
+class GitHubUserInfo(BaseModel):
+    name: Optional[str] = None
+    avatar_url: Optional[str] = None
+    bio: Optional[str] = None
+    location: Optional[str] = None
+    followers: Optional[int] = None
+    following: Optional[int] = None
+    public_repos: Optional[int] = None
+
+class RepositoryCommits(BaseModel):
+    count: int
+    url: Optional[str] = None
+    language: Optional[str] = None
+    description: Optional[str] = None
+    stars: Optional[int] = None
+    forks: Optional[int] = None
+
+class CommitDetail(BaseModel):
+    repo: str
+    message: str = ""
+    date: str = ""
+    url: str = ""
+
+class CommitActivity(BaseModel):
+    total: int = 0
+    by_repository: Dict[str, RepositoryCommits] = {}
+    time_range_days: int = 0
+    language_breakdown: Dict[str, int] = {}
+    commit_details: List[CommitDetail] = []
+    repositories_with_commits: int = 0
+
+class ActivityItem(BaseModel):
+    title: Optional[str] = None
+    url: Optional[str] = None
+    repo: Optional[str] = None
+    state: Optional[str] = None
+    created_at: Optional[str] = None
+
+class PullRequestActivity(BaseModel):
+    total: int = 0
+    merged: int = 0
+    open: int = 0
+    prs: List[ActivityItem] = []
+
+class IssueActivity(BaseModel):
+    total: int = 0
+    closed: int = 0
+    open: int = 0
+    issues: List[ActivityItem] = []
+
+class Repository(BaseModel):
+    name: Optional[str] = None
+    url: Optional[str] = None
+    description: Optional[str] = None
+    language: Optional[str] = None
+    stars: Optional[int] = None
+    forks: Optional[int] = None
+    updated_at: Optional[str] = None
+
+class RepositoryActivity(BaseModel):
+    total: int = 0
+    total_stars: int = 0
+    total_forks: int = 0
+    repositories: List[Repository] = []
+
+class GitHubActivity(BaseModel):
+    commits: Optional[CommitActivity] = None
+    pull_requests: Optional[PullRequestActivity] = None
+    issues: Optional[IssueActivity] = None
+    repositories: Optional[RepositoryActivity] = None
+
+class ActivitySummary(BaseModel):
+    total_commits: int = 0
+    total_prs: int = 0
+    total_issues: int = 0
+    public_repos: int = 0
+    total_stars: int = 0
+    time_period: str = ""
+
+class RefinedActivity(BaseModel):
+    # LLM-generated fields are passed through as returned by the model
+    description: str = ""
+    summary: Any = ""
+    insights: Any = []
+    languages_used: List[str] = []
+    top_projects: List[Repository] = []
+    contribution_areas: Any = []
+    topics: Any = []
+    development_style: Any = ""
+    recommendations: Any = ""
+    llm_enabled: bool = False
+    degraded: bool = False
+    token_usage: Optional[Dict[str, Any]] = None
+
+# Every part is optional: responses carry only the fields selected by
+# `view`/`fields` (serialized with response_model_exclude_unset)
 class GitHubActivityResponse(BaseModel):
     username: str
-    activity: Dict[str, Any]
-    summary: Dict[str, Any]
-    refined: Optional[Dict[str, Any]] = None
+    user_info: Optional[GitHubUserInfo] = None
+    activity: Optional[GitHubActivity] = None
+    summary: Optional[ActivitySummary] = None
+    refined: Optional[RefinedActivity] = None
 
 # API Endpoints
 
@@ -189,40 +618,197 @@ async def calculate_score(activity: ActivityData):
     )
     return {"score": score}
 
+def _to_nft_mint_request(request: MintRequest) -> NFTMintRequest:
+    """Convert an API mint request to a Qubic client mint request."""
+    return NFTMintRequest(
+        wallet_address=request.wallet_address,
+        score=request.score,
+        commits=request.activity.commits,
+        pull_requests=request.activity.pull_requests,
+        issues=request.activity.issues,
+        discord_messages=request.activity.discord_messages
+    )
+
+def _store_token_ids(results: List[Dict[str, Any]], wallets: List[str]):
+    """Store minted NFT token IDs for their owners in one transaction."""
+    with get_db() as conn:
+        conn.executemany(
+            "UPDATE users SET nft_token_id = ? WHERE wallet_address = ?",
+            [(result["token_id"], wallet) for result, wallet in zip(results, wallets)]
+        )
+        conn.commit()
+
 @app.post("/api/mint-nft")
-async def mint_nft(request: MintRequest):
+async def mint_nft(
+    request: MintRequest,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None)
+):
     """
     Mint a DevScore NFT on Qubic testnet.
     Contains the user's score and activity metrics.
+    
+    Concurrent requests are batched into a single bundled transaction.
+    Returns once the transaction is submitted; confirmation can be followed
+    via /api/transactions/{transaction_hash}.
+    
+    Retries are idempotent: requests with the same Idempotency-Key header
+    (or, without one, the same wallet, score and activity) within
+    IDEMPOTENCY_WINDOW_SECONDS return the original token without minting.
     """
-    try:
-        # Mint NFT using Qubic client
-        result = qubic.mint_devscore_nft(
-            wallet_address=request.wallet_address,
-            score=request.score,
-            commits=request.activity.commits,
-            pull_requests=request.activity.pull_requests,
-            issues=request.activity.issues,
-            discord_messages=request.activity.discord_messages
-        )
+    request_hash = fingerprint(request.model_dump())
+    
+    async def mint() -> Dict[str, Any]:
+        # Mint NFT through the batching queue
+        result = await mint_queue.submit(_to_nft_mint_request(request))
         
         # Store NFT token ID in database
-        with get_db() as conn:
-            conn.execute(
-                "UPDATE users SET nft_token_id = ? WHERE wallet_address = ?",
-                (result["token_id"], request.wallet_address)
-            )
-            conn.commit()
+        _store_token_ids([result], [request.wallet_address])
         
         return {
             "success": True,
             "token_id": result["token_id"],
-            "transaction_hash": result["transaction_hash"]
+            "transaction_hash": result["transaction_hash"],
+            "status": result.get("status", "pending")
+        }
+    
+    try:
+        result, replayed = await idempotency.run(
+            "mint-nft", idempotency_key or request_hash, request_hash, mint
+        )
+    except IdempotencyConflictError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+        # Report the transaction's current status rather than the stored one
+        record = await tx_tracker.get(result["transaction_hash"])
+        if record:
+            result = {**result, "status": record["status"]}
+    return result
+
+@app.post("/api/mint-nft/batch")
+async def mint_nft_batch(request: BatchMintRequest):
+    """Mint several DevScore NFTs (e.g. for a campaign launch) in bundled transactions."""
+    try:
+        results = await mint_queue.submit_many(
+            [_to_nft_mint_request(mint) for mint in request.mints]
+        )
+        _store_token_ids(results, [mint.wallet_address for mint in request.mints])
+        
+        return {
+            "success": True,
+            "minted": [
+                {
+                    "wallet_address": mint.wallet_address,
+                    "token_id": result["token_id"],
+                    "transaction_hash": result["transaction_hash"]
+                }
+                for mint, result in zip(request.mints, results)
+            ]
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/dashboard/{wallet_address}")
+@app.get("/api/mint-nft/queue")
+async def get_mint_queue_status():
+    """Get mint queue depth, batching and confirmation tracking statistics."""
+    return {
+        **mint_queue.stats(),
+        "tracker": tx_tracker.stats(),
+        "idempotency": idempotency.stats(),
+        "wallets": qubic.wallets.stats()
+    }
+
+@app.get("/api/transactions/{tx_hash}")
+async def get_transaction_status(tx_hash: str):
+    """Get the confirmation status of a submitted transaction."""
+    record = await tx_tracker.get(tx_hash)
+    if not record:
+        raise HTTPException(status_code=404, detail="Transaction not found")
+    return record
+
+@app.get("/api/transactions/{tx_hash}/wait")
+async def wait_for_transaction(tx_hash: str, timeout: float = 30.0):
+    """Wait (long-poll) until a transaction is confirmed or failed, up to `timeout` seconds."""
+    record = await tx_tracker.wait_for(tx_hash, timeout=min(max(timeout, 0.0), 60.0))
+    if not record:
+        raise HTTPException(status_code=404, detail="Transaction not found")
+    return record
+
+@app.get("/api/nfts", response_model=NFTListResponse)
+async def list_nfts(min_score: int = 0, limit: int = 100, offset: int = 0):
+    """List NFTs with a score of at least `min_score`, highest score first."""
+    nfts = nft_registry.above_score(min_score, limit=min(max(limit, 1), 1000), offset=max(offset, 0))
+    return {"nfts": nfts}
+
+@app.get("/api/nfts/owner/{wallet_address}", response_model=OwnerNFTsResponse)
+async def get_nfts_by_owner(wallet_address: str):
+    """List all NFTs owned by a wallet."""
+    return {"owner": wallet_address, "nfts": nft_registry.by_owner(wallet_address)}
+
+@app.get("/api/nfts/{token_id}/events")
+async def get_nft_events(token_id: str):
+    """Get the indexed on-chain event history of an NFT."""
+    if chain_indexer is None:
+        raise HTTPException(status_code=503, detail="Chain indexer not configured")
+    return {"token_id": token_id, "events": chain_indexer.token_events(token_id)}
+
+@app.get("/api/indexer/status")
+async def get_indexer_status():
+    """Get chain indexer progress and NFT registry statistics."""
+    return {
+        "indexer": chain_indexer.stats() if chain_indexer is not None else None,
+        "registry": nft_registry.stats()
+    }
+
+def _metadata_response(request: Request, name: str, cache_control: str) -> Response:
+    """Serve a stored metadata object with a strong ETag."""
+    stored = metadata_store.get(name)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Metadata not found")
+    content, content_type = stored
+    etag = f'"{name.split(".")[0]}"'
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=content, media_type=content_type, headers=headers)
+
+@app.get("/api/metadata/{name}")
+async def get_metadata_object(name: str, request: Request):
+    """Serve content-addressed NFT metadata or badge images (never change once stored)."""
+    return _metadata_response(request, name, "public, max-age=31536000, immutable")
+
+@app.get("/api/nfts/{token_id}/metadata")
+async def get_nft_metadata(token_id: str, request: Request):
+    """Serve the metadata document of an NFT (token URI for marketplaces)."""
+    nft = qubic.get_nft(token_id)
+    if not nft or not nft.metadata_uri:
+        raise HTTPException(status_code=404, detail="Metadata not found")
+    return _metadata_response(request, nft.metadata_uri.rsplit("/", 1)[-1], "public, max-age=300")
+
+@app.get("/api/nfts/{token_id}", response_model=DevScoreNFT)
+async def get_nft(token_id: str):
+    """Get a DevScore NFT by token ID."""
+    nft = qubic.get_nft(token_id)
+    if not nft:
+        raise HTTPException(status_code=404, detail="NFT not found")
+    return nft
+
+@app.get("/api/wallets/{wallet_address}")
+async def get_wallet(wallet_address: str):
+    """Get the (cached) balance, next nonce and tick of a wallet."""
+    account = await asyncio.to_thread(qubic.wallets.get_account, wallet_address)
+    return {
+        "address": account.address,
+        "balance": account.balance,
+        "nonce": account.nonce,
+        "tick": account.tick
+    }
+
+@app.get("/api/dashboard/{wallet_address}", response_model=DashboardResponse)
 async def get_dashboard(wallet_address: str):
     """Get dashboard data for a user."""
     with get_db() as conn:
@@ -260,7 +846,7 @@ async def get_dashboard(wallet_address: str):
             nft_token_id=user["nft_token_id"]
         )
 
-@app.get("/api/leaderboard")
+@app.get("/api/leaderboard", response_model=LeaderboardResponse)
 async def get_leaderboard(limit: int = 10):
     """Get top developers by score."""
     with get_db() as conn:
@@ -328,98 +914,123 @@ async def connect_github(request: GitHubConnectRequest):
             detail=f"Failed to connect GitHub account: {str(e)}"
         )
 
-@app.get("/api/github/activity/{github_username}")
-async def get_github_activity(github_username: str, days: int = 30, refine: bool = True):
+@app.get(
+    "/api/github/activity/{github_username}",
+    response_model=GitHubActivityResponse,
+    response_model_exclude_unset=True
+)
+async def get_github_activity(
+    github_username: str,
+    days: int = 30,
+    refine: bool = True,
+    view: str = "full",
+    fields: Optional[str] = None,
+    premium: bool = Depends(premium_access)
+):
     """
     Fetch and optionally refine GitHub activity for a user.
     
+    Only the GitHub calls and refinement the selected fields depend on are
+    made, e.g. view=summary skips the LLM and view=insights skips the user
+    profile request.
+    
     Args:
         github_username: GitHub username
         days: Number of days to look back (default: 30)
         refine: Whether to use LLM to refine the activity data (default: True)
+        view: summary, insights or full (default: full)
+        fields: Comma-separated dotted fields overriding `view`,
+            e.g. "summary.total_commits,refined.description"
+        premium: Use the LLM even when LLM_PREMIUM_ONLY serves refinement
+            locally; only granted to requests with the admin token
     """
     try:
-        # Fetch raw GitHub activity
-        activity_data = await get_github_activity_for_user(github_username, days)
-        
-        # Optionally enhance with LLM
-        if refine:
-            enhanced_data = await enhance_github_activity(activity_data)
-            return enhanced_data
-        
-        return activity_data
+        selected = activity_views.parse_fields(fields, view, model=GitHubActivityResponse)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    plan = activity_views.plan(selected, refine)
+    
+    try:
+        # Fetch raw GitHub activity, optionally enhanced with LLM
+        data = await load_github_activity(github_username, days, plan.refine, premium, plan.sections)
+        return activity_views.project(data, selected)
     except Exception as e:
         raise HTTPException(
             status_code=400,
             detail=f"Failed to fetch GitHub activity: {str(e)}"
         )
 
+async def _sync_github_score(wallet_address: str) -> Dict[str, Any]:
+    """Recalculate a wallet's DevScore from its GitHub activity and store it."""
+    with metrics.stage("sync_github_score.lookup_user"), get_db() as conn:
+        user = conn.execute(
+            "SELECT github_username FROM users WHERE wallet_address = ?",
+            (wallet_address,)
+        ).fetchone()
+        
+        if not user or not user["github_username"]:
+            raise HTTPException(
+                status_code=404,
+                detail="User not found or GitHub account not connected"
+            )
+        
+        github_username = user["github_username"]
+    
+    # Fetch GitHub activity with LLM insights
+    with metrics.stage("sync_github_score.load_activity"):
+        enhanced_data = await load_github_activity(github_username, 30, refine=True)
+    summary = enhanced_data.get("summary", {})
+    
+    # Calculate score from activity
+    score = calculate_devscore(
+        commits=summary.get("total_commits", 0),
+        pull_requests=summary.get("total_prs", 0),
+        issues=summary.get("total_issues", 0),
+        discord_messages=0  # Can be integrated later
+    )
+    
+    # Store activity in database
+    with metrics.stage("sync_github_score.store_score"), get_db() as conn:
+        user_record = conn.execute(
+            "SELECT id FROM users WHERE wallet_address = ?",
+            (wallet_address,)
+        ).fetchone()
+        
+        if user_record:
+            conn.execute(
+                """INSERT INTO activity_history 
+                   (user_id, commits, pull_requests, issues, discord_messages, calculated_score)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                (user_record["id"], summary.get("total_commits", 0), 
+                 summary.get("total_prs", 0), summary.get("total_issues", 0), 
+                 0, score)
+            )
+            conn.execute(
+                "UPDATE users SET current_score = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                (score, user_record["id"])
+            )
+            conn.commit()
+    
+    return {
+        "success": True,
+        "wallet_address": wallet_address,
+        "github_username": github_username,
+        "score": score,
+        "activity_summary": summary,
+        "refined_insights": enhanced_data.get("refined", {}),
+        "timestamp": summary.get("time_period")
+    }
+
 @app.post("/api/github/sync-score/{wallet_address}")
 async def sync_github_score(wallet_address: str):
     """
     Sync GitHub activity and update DevScore for a wallet.
+    
+    Concurrent syncs of the same wallet (on any worker) run once and share
+    the result, which is reused for a few seconds.
     """
     try:
-        with get_db() as conn:
-            user = conn.execute(
-                "SELECT github_username FROM users WHERE wallet_address = ?",
-                (wallet_address,)
-            ).fetchone()
-            
-            if not user or not user["github_username"]:
-                raise HTTPException(
-                    status_code=404,
-                    detail="User not found or GitHub account not connected"
-                )
-            
-            github_username = user["github_username"]
-        
-        # Fetch GitHub activity
-        activity_data = await get_github_activity_for_user(github_username, 30)
-        summary = activity_data.get("summary", {})
-        
-        # Calculate score from activity
-        score = calculate_devscore(
-            commits=summary.get("total_commits", 0),
-            pull_requests=summary.get("total_prs", 0),
-            issues=summary.get("total_issues", 0),
-            discord_messages=0  # Can be integrated later
-        )
-        
-        # Store activity in database
-        with get_db() as conn:
-            user_record = conn.execute(
-                "SELECT id FROM users WHERE wallet_address = ?",
-                (wallet_address,)
-            ).fetchone()
-            
-            if user_record:
-                conn.execute(
-                    """INSERT INTO activity_history 
-                       (user_id, commits, pull_requests, issues, discord_messages, calculated_score)
-                       VALUES (?, ?, ?, ?, ?, ?)""",
-                    (user_record["id"], summary.get("total_commits", 0), 
-                     summary.get("total_prs", 0), summary.get("total_issues", 0), 
-                     0, score)
-                )
-                conn.execute(
-                    "UPDATE users SET current_score = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
-                    (score, user_record["id"])
-                )
-                conn.commit()
-        
-        # Enhance with LLM insights
-        enhanced_data = await enhance_github_activity(activity_data)
-        
-        return {
-            "success": True,
-            "wallet_address": wallet_address,
-            "github_username": github_username,
-            "score": score,
-            "activity_summary": summary,
-            "refined_insights": enhanced_data.get("refined", {}),
-            "timestamp": activity_data.get("summary", {}).get("time_period")
-        }
+        return await sync_flight.get_or_load(wallet_address, lambda: _sync_github_score(wallet_address))
     except HTTPException:
         raise
     except Exception as e:
@@ -428,6 +1039,30 @@ async def sync_github_score(wallet_address: str):
             detail=f"Failed to sync GitHub score: {str(e)}"
         )
 
+@app.get("/api/llm/status")
+async def get_llm_status():
+    """Get LLM provider load and circuit breaker state, refinement cache and token usage."""
+    return {
+        "providers": [provider.status() for provider in list_providers()],
+        "cache": refinement_cache.stats(),
+        "usage": usage_stats.snapshot(),
+        "github_activity_cache": github_activity_cache.stats()
+    }
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Prometheus metrics: request, upstream, DB and stage timings plus component stats.
+
+    With several workers, any worker reports all of them: its own samples
+    and the others' latest published snapshots, labelled by worker.
+    """
+    if shared_state is None:
+        text = metrics.render()
+    else:
+        text = await metrics.render_workers(shared_state)
+    return PlainTextResponse(text, media_type=metrics.CONTENT_TYPE)
+
 @app.get("/api/github/check/{wallet_address}")
 async def check_github_connection(wallet_address: str):
     """Check if a wallet has a connected GitHub account."""
@@ -446,10 +1081,135 @@ async def check_github_connection(wallet_address: str):
         }
 
 
-# Initialize database on startup
-@app.on_event("startup")
+# Admin Endpoints
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Allow the request only with the configured admin token (ADMIN_TOKEN; 404 when unset)."""
+    admin_token = config.settings.server.admin_token
+    if not admin_token:
+        raise HTTPException(status_code=404, detail="Not found")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+@app.get("/admin/profile", dependencies=[Depends(require_admin)])
+async def profile_process(seconds: float = 10.0, interval_ms: float = profiler.PROFILER_INTERVAL_MS, format: str = "collapsed"):
+    """
+    Sample every thread of this worker for `seconds` and return the profile.
+    
+    format=collapsed returns collapsed stacks for flamegraph.pl/speedscope;
+    format=top returns the functions most often on top of the stack.
+    """
+    try:
+        result = await profiler.profile(seconds, interval_ms / 1000.0)
+    except profiler.ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    if format == "top":
+        return {"samples": result.sample_count, "functions": result.top_functions()}
+    return PlainTextResponse(
+        result.collapsed(),
+        headers={"Content-Disposition": 'attachment; filename="profile.collapsed"'}
+    )
+
+@app.get("/admin/event-loop", dependencies=[Depends(require_admin)])
+async def get_event_loop_status():
+    """Get event loop lag monitor counters."""
+    return loop_monitor.stats()
+
+@app.get("/admin/config", dependencies=[Depends(require_admin)])
+async def get_config():
+    """Get the settings in effect in this worker (secrets redacted)."""
+    return config.settings.to_dict()
+
+@app.post("/admin/config/reload", dependencies=[Depends(require_admin)])
+async def reload_config():
+    """
+    Re-read .env and the environment and apply the new settings.
+    
+    Only reloads the worker that serves the request; send SIGHUP to every
+    worker process to reload them all.
+    """
+    try:
+        result = config.reload()
+    except config.SettingsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {**result, "settings": config.settings.to_dict()}
+
+
+async def warm_up() -> None:
+    """
+    Load lazily imported clients and libraries after the worker is ready.
+    
+    Steps run concurrently; each duration is recorded in startup_timings.
+    A failing step only logs: its work happens on first use instead.
+    """
+    async def step(name: str, awaitable) -> None:
+        started = time.perf_counter()
+        try:
+            await awaitable
+        except Exception as e:
+            logger.warning("Warm-up step %s failed: %s", name, e)
+        startup_timings[f"warmup.{name}_seconds"] = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    await asyncio.gather(
+        # httpx and its TLS context for GitHub calls, and the LLM SDK/client
+        step("github_client", asyncio.to_thread(ssl_context)),
+        step("llm_provider", get_provider().warm()),
+        # Prompt builder and tokenizer (tiktoken loads its encoding on first use)
+        step("llm_refiner", asyncio.to_thread(LLMRefiner))
+    )
+    startup_timings["warmup_seconds"] = time.perf_counter() - started
+
 async def startup_event():
-    init_db()
+    started = time.perf_counter()
+    logs.setup()
+    await asyncio.to_thread(init_db)
+    if profiler.LOOP_LAG_MONITOR:
+        await loop_monitor.start()
+    await tx_tracker.start()
+    await qubic.wallets.start()
+    if leadership is not None:
+        await leadership.start()
+    elif chain_indexer is not None:
+        await chain_indexer.start()
+    if shared_state is not None:
+        # Labelled per worker and published, so /metrics on any worker covers all
+        metrics.label_worker()
+        _background_tasks.add(asyncio.create_task(metrics.publish_worker(shared_state)))
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, reload_settings)
+    except (AttributeError, NotImplementedError, RuntimeError, ValueError):
+        # No SIGHUP (Windows) or not on the main thread (embedded/test servers)
+        pass
+    startup_timings["startup_seconds"] = time.perf_counter() - started
+    if config.settings.server.startup_warmup:
+        # Load clients and tokenizers in the background. Not awaited: the
+        # worker accepts requests while this runs
+        _background_tasks.add(asyncio.create_task(warm_up()))
+
+# Flush queued mints before the worker exits
+async def shutdown_event():
+    for task in _background_tasks:
+        task.cancel()
+    await asyncio.gather(*_background_tasks, return_exceptions=True)
+    _background_tasks.clear()
+    try:
+        asyncio.get_running_loop().remove_signal_handler(signal.SIGHUP)
+    except (AttributeError, NotImplementedError, RuntimeError, ValueError):
+        pass
+    await mint_queue.close()
+    await tx_tracker.stop()
+    await qubic.wallets.stop()
+    if leadership is not None:
+        await leadership.stop()
+    elif chain_indexer is not None:
+        await chain_indexer.stop()
+    tracing.tracer.shutdown()
+    await loop_monitor.stop()
+    logs.shutdown()
+
+startup_timings["app_import_seconds"] = time.perf_counter() - _import_started
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,190 @@
+"""
+NFT Metadata Storage
+
+Renders DevScore NFT metadata once at mint time and stores it
+content-addressed on local disk.
+
+- render_badge_svg(): SVG badge for a score/tier (shared by every token
+  with the same score, so badges deduplicate heavily)
+- render_metadata_json(): canonical JSON so identical metadata hashes the same
+- MetadataStore: files are named by the SHA-256 of their content, written
+  once and never modified, so they can be served with immutable caching
+  headers and strong ETags
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import config
+import metrics
+from cache import TTLCache
+
+CONTENT_TYPES = {
+    "json": "application/json",
+    "svg": "image/svg+xml"
+}
+
+_NAME_PATTERN = re.compile(r"^([0-9a-f]{64})\.(json|svg)$")
+
+_TIER_COLORS = {
+    "Elite": "#f59e0b",
+    "Senior": "#8b5cf6",
+    "Mid": "#3b82f6",
+    "Junior": "#10b981",
+    "Newcomer": "#6b7280"
+}
+
+
+def render_badge_svg(score: int, tier: str) -> bytes:
+    """
+    Render the SVG badge for a score.
+
+    Args:
+        score: DevScore (0-1000)
+        tier: Tier name
+
+    Returns:
+        SVG document bytes
+    """
+    color = _TIER_COLORS.get(tier, _TIER_COLORS["Newcomer"])
+    progress = max(0, min(score, 1000)) * 2.4
+    return (
+        '<svg xmlns="http://www.w3.org/2000/svg" width="320" height="180" viewBox="0 0 320 180">'
+        '<rect width="320" height="180" rx="16" fill="#0f172a"/>'
+        '<text x="24" y="44" fill="#e2e8f0" font-family="sans-serif" font-size="18">DevScore</text>'
+        f'<text x="24" y="104" fill="{color}" font-family="sans-serif" font-size="48" font-weight="bold">{score}</text>'
+        f'<text x="296" y="44" fill="{color}" font-family="sans-serif" font-size="16" text-anchor="end">{tier}</text>'
+        '<rect x="24" y="136" width="240" height="10" rx="5" fill="#1e293b"/>'
+        f'<rect x="24" y="136" width="{progress:.0f}" height="10" rx="5" fill="{color}"/>'
+        '</svg>'
+    ).encode()
+
+
+def render_metadata_json(metadata: Dict) -> bytes:
+    """Serialize metadata canonically (sorted keys, no whitespace)."""
+    return json.dumps(metadata, sort_keys=True, separators=(",", ":")).encode()
+
+
+def _attribute(metadata: Dict, trait_type: str, default=None):
+    for attribute in metadata.get("attributes", []):
+        if attribute.get("trait_type") == trait_type:
+            return attribute.get("value", default)
+    return default
+
+
+class MetadataStore:
+    """Content-addressed, write-once file store with an in-memory read cache."""
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        base_url: Optional[str] = None,
+        cache_size: Optional[int] = None
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            root: Directory holding stored objects (default: config.settings.nft.metadata_dir)
+            base_url: Public URL prefix for stored objects (default: config.settings.nft.metadata_base_url)
+            cache_size: Number of objects kept in memory (default: config.settings.cache.metadata_size)
+        """
+        settings = config.settings.nft
+        self.root = Path(root or settings.metadata_dir)
+        self.base_url = settings.metadata_base_url if base_url is None else base_url
+        # Stored objects never change, so cached copies never expire
+        self.cache = TTLCache(maxsize=cache_size or config.settings.cache.metadata_size, ttl=float("inf"))
+        self._lock = threading.Lock()
+
+        self.writes = 0
+        self.deduplicated = 0
+
+    def _path(self, name: str) -> Path:
+        return self.root / name[:2] / name
+
+    def url(self, name: str) -> str:
+        """Public URL of a stored object."""
+        return f"{self.base_url}/{name}"
+
+    def put(self, content: bytes, extension: str) -> str:
+        """
+        Store content under its hash, unless an identical object exists.
+
+        Args:
+            content: Object bytes
+            extension: "json" or "svg"
+
+        Returns:
+            Object name ("<sha256>.<extension>")
+        """
+        name = f"{hashlib.sha256(content).hexdigest()}.{extension}"
+        path = self._path(name)
+        with self._lock:
+            if name in self.cache or path.exists():
+                self.deduplicated += 1
+            else:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                # Write to a temp file and rename so readers never see partial objects
+                fd, tmp = tempfile.mkstemp(dir=path.parent)
+                with os.fdopen(fd, "wb") as f:
+                    f.write(content)
+                os.replace(tmp, path)
+                self.writes += 1
+        self.cache.set(name, content)
+        return name
+
+    def get(self, name: str) -> Optional[Tuple[bytes, str]]:
+        """
+        Read a stored object.
+
+        Args:
+            name: Object name ("<sha256>.<extension>")
+
+        Returns:
+            (content, content type) or None if the name is invalid or unknown
+        """
+        match = _NAME_PATTERN.match(name)
+        if not match:
+            return None
+        content = self.cache.get(name)
+        if content is None:
+            try:
+                content = self._path(name).read_bytes()
+            except FileNotFoundError:
+                return None
+            self.cache.set(name, content)
+        return content, CONTENT_TYPES[match.group(2)]
+
+    @metrics.timed("metadata.publish")
+    def publish(self, metadata: Dict) -> Dict[str, str]:
+        """
+        Render and store a token's badge and metadata document.
+
+        Args:
+            metadata: Token metadata (name, attributes, ...)
+
+        Returns:
+            Dictionary with image and metadata object names and metadata_uri
+        """
+        score = _attribute(metadata, "Score", 0)
+        image = self.put(render_badge_svg(score, _attribute(metadata, "Tier", "Newcomer")), "svg")
+        document = self.put(render_metadata_json({**metadata, "image": self.url(image)}), "json")
+        return {
+            "image": image,
+            "metadata": document,
+            "metadata_uri": self.url(document)
+        }
+
+    def stats(self) -> Dict:
+        """Return write/dedup counters and cache statistics."""
+        return {
+            "writes": self.writes,
+            "deduplicated": self.deduplicated,
+            "cache": self.cache.stats()
+        }
@@ -0,0 +1,629 @@
+"""
+Metrics
+
+In-process Prometheus-style metrics, exposed in the text exposition format
+at /metrics.
+
+- Counter, Gauge and Histogram with labels; children are cached per label
+  set, so recording a sample is a dict lookup, a lock and an add
+- Standard metrics for HTTP requests (per route), upstream calls (GitHub,
+  LLM providers, Qubic node), database statements and instrumented
+  functions/stages
+- timed() decorator and stage()/upstream() context managers record into
+  those metrics and open a tracing span for the same block
+- InstrumentedConnection: sqlite3 connection factory timing (and tracing)
+  every statement
+- register_stats(): the existing stats() dictionaries (cache hit ratios,
+  queue depths, ...) are read at scrape time and exposed as gauges, so
+  they cost nothing between scrapes
+- With several workers (shared state configured), every sample carries a
+  `worker` label and each worker publishes its samples to the shared
+  state, so a scrape of any worker reports all of them (render_workers())
+
+Set METRICS_ENABLED=false to turn the timing decorators into no-ops.
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import tracing
+
+if TYPE_CHECKING:
+    from shared_state import SharedState
+
+logger = logging.getLogger(__name__)
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+DB_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0)
+
+# PlainTextResponse appends the charset
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+# Seconds between a worker's published snapshots; a snapshot not refreshed
+# for three intervals (the worker stopped) is dropped
+WORKER_PUBLISH_SECONDS = 5.0
+_WORKER_NAMESPACE = "metrics"
+
+# (name, header lines, sample lines) of one metric family
+Family = Tuple[str, List[str], List[str]]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], *extra: str) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs.extend(pair for pair in extra if pair)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric:
+    """Base class: a named metric family with label children."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), registry: Optional["Registry"] = None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self._new_child()
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: Any, **kwargs: Any):
+        """
+        Get the child metric for a label set.
+
+        Args:
+            values: Label values in `labelnames` order, or
+            kwargs: Label values by name
+
+        Returns:
+            Child metric to record into
+        """
+        if kwargs:
+            values = tuple(str(kwargs[name]) for name in self.labelnames)
+        else:
+            values = tuple(str(value) for value in values)
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _samples(self) -> List[Tuple[Tuple[str, ...], Any]]:
+        if not self.labelnames:
+            return [((), self._default)]
+        with self._lock:
+            return list(self._children.items())
+
+    def family(self, worker: str = "") -> Family:
+        """HELP/TYPE lines and samples, with `worker` (a formatted label pair) added to every sample."""
+        header = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        samples = []
+        for values, child in self._samples():
+            samples.extend(self._render_child(values, child, worker))
+        return self.name, header, samples
+
+    def render(self) -> List[str]:
+        _, header, samples = self.family()
+        return header + samples
+
+    def _render_child(self, values: Tuple[str, ...], child, worker: str) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, values, worker)} {_format_value(child.value)}"]
+
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+
+class _GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        self._default.set(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default.dec(amount)
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe the duration of a block."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+
+class Histogram(_Metric):
+    """Distribution of observations in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        registry: Optional["Registry"] = None
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default.observe(value)
+
+    def _render_child(self, values: Tuple[str, ...], child: _HistogramChild, worker: str) -> List[str]:
+        with child._lock:
+            counts = list(child.counts)
+            total = child.sum
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            le = f'le="{_format_value(float(bound))}"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, values, worker, le)} {cumulative}")
+        labels = _format_labels(self.labelnames, values, worker)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Collection of metrics and scrape-time stats collectors."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: Dict[str, Callable[[], Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        # Value of the `worker` label on every sample (None: no label)
+        self.worker: Optional[str] = None
+
+    def register(self, metric: _Metric) -> None:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+
+    def register_stats(self, component: str, stats: Callable[[], Dict[str, Any]]) -> None:
+        """
+        Expose a component's stats() dictionary as gauges.
+
+        Numeric (and boolean) values are flattened into
+        devscore_<component>_<key>[_<nested key>] gauges at scrape time;
+        other values are skipped.
+
+        Args:
+            component: Metric name prefix (e.g. "mint_queue")
+            stats: Zero-argument function returning the stats dictionary
+        """
+        with self._lock:
+            self._collectors[component] = stats
+
+    def families(self) -> List[Family]:
+        """Every metric and stats gauge as (name, header lines, sample lines)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors.items())
+        worker = f'worker="{_escape(self.worker)}"' if self.worker is not None else ""
+        families = [metric.family(worker) for metric in metrics]
+        for component, stats in collectors:
+            try:
+                values = stats()
+            except Exception as e:
+                families.append((f"devscore_{component}", [f"# {component} stats unavailable: {_escape(e)}"], []))
+                continue
+            for name, value in _flatten(f"devscore_{component}", values):
+                sample = f"{name}{_format_labels((), (), worker)} {_format_value(value)}"
+                families.append((name, [f"# TYPE {name} gauge"], [sample]))
+        return families
+
+    def render(self, others: Iterable[Sequence[Family]] = ()) -> str:
+        """
+        Render every metric in the Prometheus text format.
+
+        Args:
+            others: families() of other workers, merged in family by family
+                (each family keeps a single HELP/TYPE header)
+
+        Returns:
+            Exposition text
+        """
+        merged: Dict[str, Tuple[List[str], List[str]]] = {}
+        for families in (self.families(), *others):
+            for name, header, samples in families:
+                if name in merged:
+                    merged[name][1].extend(samples)
+                else:
+                    merged[name] = (list(header), list(samples))
+        lines: List[str] = []
+        for header, samples in merged.values():
+            lines.extend(header)
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+_NAME_INVALID = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def _flatten(prefix: str, values: Any) -> Iterator[Tuple[str, float]]:
+    if isinstance(values, dict):
+        for key, value in values.items():
+            yield from _flatten(f"{prefix}_{_NAME_INVALID.sub('_', str(key))}", value)
+    elif isinstance(values, bool):
+        yield prefix, float(values)
+    elif isinstance(values, (int, float)):
+        yield prefix, float(values)
+
+
+REGISTRY = Registry()
+
+
+def register_stats(component: str, stats: Callable[[], Dict[str, Any]]) -> None:
+    """Expose a stats() dictionary on the default registry (see Registry.register_stats)."""
+    REGISTRY.register_stats(component, stats)
+
+
+def render() -> str:
+    """Render the default registry."""
+    return REGISTRY.render()
+
+
+def label_worker(worker: Optional[str] = None) -> None:
+    """
+    Label every sample of the default registry with this worker.
+
+    Args:
+        worker: Label value (default: this process ID)
+    """
+    REGISTRY.worker = worker or str(os.getpid())
+
+
+async def publish_worker(state: "SharedState", interval: float = WORKER_PUBLISH_SECONDS) -> None:
+    """
+    Publish this worker's samples to the shared state every `interval` seconds.
+
+    Runs until cancelled; call label_worker() first so the samples of
+    different workers stay apart.
+
+    Args:
+        state: Shared state read by render_workers() in every worker
+        interval: Seconds between snapshots
+    """
+    key = (_WORKER_NAMESPACE, REGISTRY.worker)
+    while True:
+        try:
+            snapshot = {"worker": REGISTRY.worker, "families": REGISTRY.families()}
+            await asyncio.to_thread(state.set, key, snapshot, interval * 3)
+        except Exception as e:
+            # Only the other workers' view of this one goes stale
+            logger.warning("Publishing worker metrics failed: %s", e)
+        await asyncio.sleep(interval)
+
+
+async def render_workers(state: "SharedState") -> str:
+    """
+    Render this worker's metrics merged with every other worker's latest snapshot.
+
+    Args:
+        state: Shared state the workers publish to (see publish_worker)
+
+    Returns:
+        Exposition text covering all live workers of the host
+    """
+    snapshots = await asyncio.to_thread(state.scan, _WORKER_NAMESPACE)
+    others = [snapshot["families"] for snapshot in snapshots if snapshot["worker"] != REGISTRY.worker]
+    return REGISTRY.render(others)
+
+
+# Standard metrics
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "devscore_http_request_duration_seconds",
+    "API request latency by route template",
+    ["method", "route", "status"]
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "devscore_http_requests_in_flight",
+    "API requests currently being served"
+)
+UPSTREAM_SECONDS = Histogram(
+    "devscore_upstream_request_duration_seconds",
+    "Latency of calls to GitHub, LLM providers and the Qubic node",
+    ["service", "endpoint", "outcome"]
+)
+UPSTREAM_ERRORS = Counter(
+    "devscore_upstream_errors_total",
+    "Upstream responses with an HTTP error status",
+    ["service", "endpoint", "status"]
+)
+DB_QUERY_SECONDS = Histogram(
+    "devscore_db_query_duration_seconds",
+    "SQLite statement execution time by statement kind and table",
+    ["query"],
+    buckets=DB_BUCKETS
+)
+OPERATION_SECONDS = Histogram(
+    "devscore_operation_duration_seconds",
+    "Time spent in instrumented functions and request stages",
+    ["operation", "outcome"]
+)
+
+
+# Instrumentation helpers
+
+@contextmanager
+def _observe(histogram: Histogram, *labels: str) -> Iterator[None]:
+    started = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        histogram.labels(*labels, outcome).observe(time.perf_counter() - started)
+
+
+@contextmanager
+def _observe_traced(
+    histogram: Histogram,
+    labels: Tuple[str, ...],
+    span_name: str,
+    kind: "tracing.SpanKind" = tracing.SpanKind.INTERNAL,
+    attributes: Optional[Dict[str, Any]] = None
+) -> Iterator[Optional["tracing.Span"]]:
+    if not tracing.tracer.enabled:
+        with _observe(histogram, *labels):
+            yield None
+        return
+    with tracing.span(span_name, kind, attributes=attributes) as span, _observe(histogram, *labels):
+        yield span
+
+
+def stage(operation: str):
+    """
+    Time (and trace) a block as an operation or request stage.
+
+    Usage:
+        with metrics.stage("sync_github_score.fetch_activity"):
+            ...
+    """
+    return _observe_traced(OPERATION_SECONDS, (operation,), operation)
+
+
+def upstream(service: str, endpoint: str, **attributes: Any):
+    """
+    Time (and trace as a CLIENT span) a call to an upstream service.
+
+    Args:
+        service: "github", "qubic", or the LLM provider name
+        endpoint: Low-cardinality endpoint name (route template, RPC method)
+        attributes: Extra span attributes (full URL, model, ...); not metric labels
+
+    Yields:
+        The span, or None when tracing is off
+    """
+    return _observe_traced(
+        UPSTREAM_SECONDS, (service, endpoint), f"{service} {endpoint}", tracing.SpanKind.CLIENT,
+        {"peer.service": service, **attributes}
+    )
+
+
+def timed(operation: str, trace: bool = True) -> Callable:
+    """
+    Decorator timing every call of a sync or async function.
+
+    Args:
+        operation: Operation label (e.g. "qubic.mint_batch")
+        trace: Also open a span per call; pollers that mostly find nothing
+            to do pass False and open spans only around real work
+    """
+    def decorator(fn: Callable) -> Callable:
+        if not METRICS_ENABLED:
+            return fn
+
+        def observe():
+            if trace:
+                return _observe_traced(OPERATION_SECONDS, (operation,), operation)
+            return _observe(OPERATION_SECONDS, operation)
+
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with observe():
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with observe():
+                return fn(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+# HTTP
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request latency per route template.
+
+    Plain ASGI rather than BaseHTTPMiddleware, so responses are not
+    re-streamed through an extra task.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            # The router stores the matched route in the (shared) scope
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.labels(
+                scope["method"], getattr(route, "path", "unmatched"), status
+            ).observe(time.perf_counter() - started)
+
+
+# Database
+
+_TABLE = re.compile(r"\b(?:FROM|INTO|UPDATE|TABLE(?: IF NOT EXISTS)?|INDEX(?: IF NOT EXISTS)? \w+ ON)\s+(\w+)", re.IGNORECASE)
+_query_labels: Dict[str, str] = {}
+
+
+def query_label(sql: str) -> str:
+    """Low-cardinality label for a statement, e.g. "SELECT users"."""
+    label = _query_labels.get(sql)
+    if label is None:
+        stripped = sql.lstrip()
+        verb = stripped.split(None, 1)[0].upper() if stripped else "EMPTY"
+        table = _TABLE.search(sql)
+        label = f"{verb} {table.group(1)}" if table else verb
+        # Statements are string constants in the code, so this stays small
+        if len(_query_labels) < 1024:
+            _query_labels[sql] = label
+    return label
+
+
+@contextmanager
+def _statement(sql: str, many: bool) -> Iterator[None]:
+    label = query_label(sql)
+    started = time.perf_counter()
+    try:
+        if tracing.tracer.enabled:
+            with tracing.span(f"sqlite {label}", tracing.SpanKind.CLIENT, attributes={
+                "db.system": "sqlite",
+                "db.statement": sql.strip(),
+                "db.executemany": many
+            }):
+                yield
+        else:
+            yield
+    finally:
+        DB_QUERY_SECONDS.labels(label).observe(time.perf_counter() - started)
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """sqlite3 connection that times and traces execute() and executemany()."""
+
+    def execute(self, sql: str, *args):
+        if not METRICS_ENABLED:
+            return super().execute(sql, *args)
+        with _statement(sql, False):
+            return super().execute(sql, *args)
+
+    def executemany(self, sql: str, *args):
+        if not METRICS_ENABLED:
+            return super().executemany(sql, *args)
+        with _statement(sql, True):
+            return super().executemany(sql, *args)
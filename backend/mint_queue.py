@@ -0,0 +1,159 @@
+"""
+Mint Queue
+
+Accumulates NFT mint requests for a short window and submits them to
+Qubic as a single batched transaction.
+
+Each caller awaits its own future and receives its own token ID, while the
+chain sees one bundle per window (or per `max_batch_size` requests,
+whichever comes first). Throughput during mint bursts therefore scales
+with batch size instead of request count.
+"""
+
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+import config
+import metrics
+import tracing
+from qubic_client import AsyncQubicClient, NFTMintRequest
+from tx_tracker import TransactionTracker
+
+
+class MintQueue:
+    """Micro-batching front end for AsyncQubicClient.mint_devscore_nfts_batch."""
+
+    def __init__(
+        self,
+        client: AsyncQubicClient,
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None,
+        tracker: Optional[TransactionTracker] = None
+    ):
+        """
+        Initialize the mint queue.
+
+        Args:
+            client: Async Qubic client used to submit batches
+            max_batch_size: Flush as soon as this many requests are queued
+                (default: MINT_BATCH_SIZE)
+            max_wait_ms: Flush this long after the first request of a batch
+                (default: MINT_BATCH_WINDOW_MS)
+            tracker: Optional tracker that follows each bundle to confirmation
+        """
+        self.client = client
+        self.tracker = tracker
+        settings = config.settings.qubic
+        self.max_batch_size = max_batch_size or settings.mint_batch_size
+        self.max_wait = (settings.mint_batch_window_ms if max_wait_ms is None else max_wait_ms) / 1000.0
+
+        self._pending: List[Tuple[NFTMintRequest, asyncio.Future]] = []
+        # Spans of the requests waiting in _pending, linked from the batch span
+        self._pending_links: List[tracing.SpanContext] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes: set = set()
+        self._closed = False
+
+        self.batches = 0
+        self.minted = 0
+        self.failed = 0
+
+    async def submit(self, request: NFTMintRequest) -> Dict:
+        """
+        Queue a mint and wait for its result.
+
+        Args:
+            request: NFT to mint
+
+        Returns:
+            Mint result for this request (token_id, transaction_hash, ...)
+        """
+        if self._closed:
+            raise RuntimeError("Mint queue is closed")
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((request, future))
+        span_context = tracing.current_context()
+        if span_context is not None:
+            self._pending_links.append(span_context)
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    async def submit_many(self, requests: List[NFTMintRequest]) -> List[Dict]:
+        """Queue several mints and wait for all of their results."""
+        return list(await asyncio.gather(*(self.submit(r) for r in requests)))
+
+    def _flush(self) -> None:
+        """Hand the pending requests to a background batch submission."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+        links, self._pending_links = self._pending_links, []
+        task = asyncio.ensure_future(self._submit_batch(batch, links))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    @metrics.timed("mint_queue.submit_batch", trace=False)
+    async def _submit_batch(
+        self,
+        batch: List[Tuple[NFTMintRequest, asyncio.Future]],
+        links: Optional[List[tracing.SpanContext]] = None
+    ) -> None:
+        """Submit one batch and resolve each caller's future."""
+        requests = [request for request, _ in batch]
+        # The batch serves many requests: trace it on its own, linked to each
+        with tracing.span("mint_queue.submit_batch", root=True, links=links, attributes={
+            "mint.batch_size": len(batch)
+        }) as span:
+            try:
+                results = await self.client.mint_devscore_nfts_batch(requests)
+                if self.tracker is not None and results:
+                    status = await self.tracker.track(
+                        results[0]["transaction_hash"],
+                        "NFT_MINT_BATCH",
+                        [result["token_id"] for result in results]
+                    )
+                    results = [{**result, "status": status["status"]} for result in results]
+            except Exception as e:
+                span.record_exception(e)
+                self.failed += len(batch)
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+        self.batches += 1
+        self.minted += len(results)
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def close(self) -> None:
+        """Flush queued mints and wait for in-progress batches."""
+        self._closed = True
+        self._flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    def stats(self) -> Dict:
+        """Return queue depth and batching counters."""
+        return {
+            "queue_depth": len(self._pending),
+            "batches_in_flight": len(self._flushes),
+            "batches": self.batches,
+            "minted": self.minted,
+            "failed": self.failed,
+            "avg_batch_size": self.minted / self.batches if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0
+        }
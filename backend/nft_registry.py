@@ -0,0 +1,221 @@
+"""
+NFT Registry
+
+Local, indexed store of every DevScore NFT (the `nfts` table) so token
+lookups never need a chain query.
+
+- Populated on mint and transfer (and by the chain indexer)
+- Indexed by token ID (primary key), owner and score
+- LRU read cache in front of token and owner lookups, invalidated on writes
+"""
+
+from dataclasses import asdict
+from typing import Callable, Dict, Iterable, List, Optional
+
+import config
+from cache import TTLCache
+from qubic_client import DevScoreNFT
+
+_COLUMNS = (
+    "token_id, owner, score, commits, pull_requests, issues, discord_messages, "
+    "minted_at, metadata_uri, transaction_hash"
+)
+
+
+class NFTRegistry:
+    """Indexed NFT store with an LRU read cache."""
+
+    def __init__(
+        self,
+        db: Callable,
+        cache_size: Optional[int] = None,
+        cache_ttl: Optional[float] = None
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            db: Database connection context manager factory (main.get_db)
+            cache_size: Maximum cached tokens and owner listings (default: config.settings.cache.nft_size)
+            cache_ttl: Seconds a cached entry is trusted (default: config.settings.cache.nft_ttl_seconds)
+        """
+        self.db = db
+        settings = config.settings.cache
+        self.cache = TTLCache(
+            maxsize=cache_size or settings.nft_size,
+            ttl=settings.nft_ttl_seconds if cache_ttl is None else cache_ttl
+        )
+
+    @staticmethod
+    def _row_to_nft(row) -> DevScoreNFT:
+        return DevScoreNFT(**{key: row[key] for key in row.keys()})
+
+    def record_mints(self, nfts: List[DevScoreNFT]) -> None:
+        """
+        Insert or replace minted NFTs.
+
+        Args:
+            nfts: NFTs to store
+        """
+        if not nfts:
+            return
+        with self.db() as conn:
+            conn.executemany(
+                f"""INSERT INTO nfts ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(token_id) DO UPDATE SET
+                        owner = excluded.owner, score = excluded.score,
+                        commits = excluded.commits, pull_requests = excluded.pull_requests,
+                        issues = excluded.issues, discord_messages = excluded.discord_messages,
+                        minted_at = excluded.minted_at, metadata_uri = excluded.metadata_uri,
+                        transaction_hash = excluded.transaction_hash,
+                        updated_at = CURRENT_TIMESTAMP""",
+                [
+                    (nft.token_id, nft.owner, nft.score, nft.commits, nft.pull_requests,
+                     nft.issues, nft.discord_messages, nft.minted_at, nft.metadata_uri,
+                     nft.transaction_hash)
+                    for nft in nfts
+                ]
+            )
+            conn.commit()
+        for nft in nfts:
+            self.cache.delete(("token", nft.token_id))
+            self.cache.delete(("owner", nft.owner))
+
+    def record_transfer(self, token_id: str, new_owner: str) -> bool:
+        """
+        Move an NFT to a new owner.
+
+        Args:
+            token_id: NFT token ID
+            new_owner: Receiving wallet address
+
+        Returns:
+            True if the token is known to the registry
+        """
+        with self.db() as conn:
+            row = conn.execute("SELECT owner FROM nfts WHERE token_id = ?", (token_id,)).fetchone()
+            if not row:
+                return False
+            conn.execute(
+                "UPDATE nfts SET owner = ?, updated_at = CURRENT_TIMESTAMP WHERE token_id = ?",
+                (new_owner, token_id)
+            )
+            conn.commit()
+        self.cache.delete(("token", token_id))
+        self.cache.delete(("owner", row["owner"]))
+        self.cache.delete(("owner", new_owner))
+        return True
+
+    def update_score(self, token_id: str, score: int) -> bool:
+        """
+        Update the score recorded for an NFT.
+
+        Args:
+            token_id: NFT token ID
+            score: New DevScore
+
+        Returns:
+            True if the token is known to the registry
+        """
+        with self.db() as conn:
+            row = conn.execute("SELECT owner FROM nfts WHERE token_id = ?", (token_id,)).fetchone()
+            if not row:
+                return False
+            conn.execute(
+                "UPDATE nfts SET score = ?, updated_at = CURRENT_TIMESTAMP WHERE token_id = ?",
+                (score, token_id)
+            )
+            conn.commit()
+        self.cache.delete(("token", token_id))
+        self.cache.delete(("owner", row["owner"]))
+        return True
+
+    def invalidate(self, token_ids: Iterable[str] = (), owners: Iterable[str] = ()) -> None:
+        """Drop cached entries after the nfts table was written directly."""
+        for token_id in token_ids:
+            self.cache.delete(("token", token_id))
+        for owner in owners:
+            self.cache.delete(("owner", owner))
+
+    def get(self, token_id: str) -> Optional[DevScoreNFT]:
+        """
+        Get an NFT by token ID.
+
+        Args:
+            token_id: NFT token ID
+
+        Returns:
+            DevScoreNFT or None if not found
+        """
+        key = ("token", token_id)
+        nft = self.cache.get(key)
+        if nft is not None:
+            return nft
+
+        with self.db() as conn:
+            row = conn.execute(
+                f"SELECT {_COLUMNS} FROM nfts WHERE token_id = ?", (token_id,)
+            ).fetchone()
+        if not row:
+            return None
+        nft = self._row_to_nft(row)
+        self.cache.set(key, nft)
+        return nft
+
+    def by_owner(self, owner: str) -> List[DevScoreNFT]:
+        """
+        Get all NFTs owned by a wallet, highest score first.
+
+        Args:
+            owner: Wallet address
+
+        Returns:
+            List of DevScoreNFT objects
+        """
+        key = ("owner", owner)
+        nfts = self.cache.get(key)
+        if nfts is not None:
+            return nfts
+
+        with self.db() as conn:
+            rows = conn.execute(
+                f"SELECT {_COLUMNS} FROM nfts WHERE owner = ? ORDER BY score DESC, minted_at DESC",
+                (owner,)
+            ).fetchall()
+        nfts = [self._row_to_nft(row) for row in rows]
+        self.cache.set(key, nfts)
+        return nfts
+
+    def above_score(self, min_score: int, limit: int = 100, offset: int = 0) -> List[DevScoreNFT]:
+        """
+        Get NFTs with a score of at least `min_score`, highest first.
+
+        Args:
+            min_score: Minimum score (inclusive)
+            limit: Maximum number of results
+            offset: Number of results to skip
+
+        Returns:
+            List of DevScoreNFT objects
+        """
+        with self.db() as conn:
+            rows = conn.execute(
+                f"""SELECT {_COLUMNS} FROM nfts WHERE score >= ?
+                    ORDER BY score DESC, token_id LIMIT ? OFFSET ?""",
+                (min_score, limit, offset)
+            ).fetchall()
+        return [self._row_to_nft(row) for row in rows]
+
+    def count(self) -> int:
+        """Total number of registered NFTs."""
+        with self.db() as conn:
+            return conn.execute("SELECT COUNT(*) FROM nfts").fetchone()[0]
+
+    def stats(self) -> Dict:
+        """Return registry size and cache statistics."""
+        return {"nfts": self.count(), "cache": self.cache.stats()}
+
+
+def nft_to_dict(nft: DevScoreNFT) -> Dict:
+    """Serialize an NFT for API responses."""
+    return asdict(nft)
@@ -13,14 +13,35 @@ Deployment Steps:
 3. Submit to Nostromo for verification
 4. Deploy to Qubic testnet/mainnet
 5. Verify deployment status
+
+With a Qubic node configured (QUBIC_NODE_URL or an in-process
+SimulatedQubicNode) the deployment is submitted as a CONTRACT_DEPLOY
+transaction and confirmed against the node instead of simulated delays.
 """
 
+import hashlib
 import json
+import logging
 import time
+import uuid
 from typing import Dict, Optional, List
 from dataclasses import dataclass
 from enum import Enum
 
+import config
+import metrics
+from qubic_client import HTTPNodeClient, QUBIC_NODE_URL, QUBIC_REQUIRED_CONFIRMATIONS
+
+logger = logging.getLogger(__name__)
+
+# Seconds between status checks and overall limit when confirming against a node
+DEPLOY_POLL_SECONDS = 0.1
+DEPLOY_TIMEOUT_SECONDS = 60.0
+
+# Simulated step durations when no node is configured
+PLACEHOLDER_VERIFY_SECONDS = 0.5
+PLACEHOLDER_DEPLOY_SECONDS = 0.5
+
 
 class DeploymentStatus(Enum):
     """Deployment status states."""
@@ -51,6 +72,7 @@ class DeploymentResult:
     transaction_hash: Optional[str]
     status: DeploymentStatus
     error_message: Optional[str] = None
+    network: Optional[str] = None
 
 
 class NostromoClient:
@@ -67,7 +89,9 @@ class NostromoClient:
     def __init__(
         self,
         api_key: Optional[str] = None,
-        network: str = "testnet"
+        network: str = "testnet",
+        node=None,
+        node_url: Optional[str] = QUBIC_NODE_URL
     ):
         """
         Initialize the Nostromo client.
@@ -75,10 +99,13 @@ class NostromoClient:
         Args:
             api_key: Nostromo API key (required for mainnet)
             network: Target network ("testnet" or "mainnet")
+            node: Qubic node to deploy to in-process (e.g. SimulatedQubicNode)
+            node_url: Qubic node HTTP API used when no in-process node is given
         """
         self.api_key = api_key
         self.network = network
         self.base_url = f"https://{'api' if network == 'mainnet' else 'testnet-api'}.nostromo.qubic.org"
+        self.node = node if node is not None else (HTTPNodeClient(node_url) if node_url else None)
         
         # Track deployments
         self._deployments: Dict[str, DeploymentResult] = {}
@@ -206,48 +233,122 @@ class NostromoClient:
             DeploymentResult with deployment details
         """
         # Generate deployment ID
-        deployment_id = f"deploy_{int(time.time())}_{config.contract_name}"
+        deployment_id = self.new_deployment_id(config)
         
-        print(f"[Nostromo] Starting deployment: {config.contract_name}")
-        print(f"[Nostromo] Network: {config.network}")
-        print(f"[Nostromo] Owner: {config.owner_address[:20]}...")
+        logger.info(
+            "Starting deployment of %s to %s (owner %s...)",
+            config.contract_name, config.network, config.owner_address[:20],
+            extra={"deployment_id": deployment_id}
+        )
+        
+        contract_addr = self.contract_address(deployment_id)
+        
+        if self.node is None:
+            # Placeholder: Simulate deployment process
+            # In production, this would submit to Nostromo API
+            
+            # Step 1: Verify contract
+            logger.info("Verifying contract...", extra={"deployment_id": deployment_id})
+            time.sleep(PLACEHOLDER_VERIFY_SECONDS)  # Simulate verification
+            
+            # Step 2: Deploy
+            logger.info("Deploying to blockchain...", extra={"deployment_id": deployment_id})
+            time.sleep(PLACEHOLDER_DEPLOY_SECONDS)  # Simulate deployment
+        else:
+            logger.info("Deploying to node...", extra={"deployment_id": deployment_id})
         
-        # Placeholder: Simulate deployment process
-        # In production, this would submit to Nostromo API
+        result = self._submit_and_confirm(deployment_id, contract_addr, config)
+        self._deployments[deployment_id] = result
         
-        # Step 1: Verify contract
-        print("[Nostromo] Verifying contract...")
-        time.sleep(0.5)  # Simulate verification
+        if not result.success:
+            logger.error("Deployment failed: %s", result.error_message, extra={"deployment_id": deployment_id})
+            return result
         
-        # Step 2: Deploy
-        print("[Nostromo] Deploying to blockchain...")
-        time.sleep(0.5)  # Simulate deployment
+        logger.info(
+            "Deployment successful: contract %s..., tx %s...",
+            contract_addr[:30], result.transaction_hash[:20],
+            extra={"deployment_id": deployment_id}
+        )
         
-        # Generate mock contract address
-        import hashlib
-        contract_addr = "QUBIC_CONTRACT_" + hashlib.sha256(
+        return result
+    
+    def new_deployment_id(self, config: DeploymentConfig) -> str:
+        """Generate a unique deployment ID."""
+        return f"deploy_{int(time.time())}_{config.network}_{config.contract_name}_{uuid.uuid4().hex[:8]}"
+    
+    def contract_address(self, deployment_id: str) -> str:
+        """Derive the (mock) contract address of a deployment."""
+        return "QUBIC_CONTRACT_" + hashlib.sha256(
             deployment_id.encode()
         ).hexdigest()[:40].upper()
+    
+    @metrics.timed("nostromo.submit_deployment")
+    def submit_deployment(self, deployment_id: str, contract_addr: str, config: DeploymentConfig) -> str:
+        """
+        Submit the deployment transaction.
+        
+        Args:
+            deployment_id: Deployment ID
+            contract_addr: Contract address
+            config: Deployment configuration
         
-        tx_hash = hashlib.sha256(
-            f"{deployment_id}_{time.time()}".encode()
-        ).hexdigest()
+        Returns:
+            Deployment transaction hash
+        """
+        if self.node is None:
+            # Placeholder: Generate mock transaction hash
+            return hashlib.sha256(
+                f"{deployment_id}_{time.time()}".encode()
+            ).hexdigest()
         
-        result = DeploymentResult(
-            success=True,
-            deployment_id=deployment_id,
-            contract_address=contract_addr,
-            transaction_hash=tx_hash,
-            status=DeploymentStatus.CONFIRMED
-        )
+        return self.node.submit_transaction({
+            "type": "CONTRACT_DEPLOY",
+            "deployment_id": deployment_id,
+            "contract_name": config.contract_name,
+            "contract_address": contract_addr,
+            "owner": config.owner_address,
+            "network": config.network,
+            "gas_limit": config.gas_limit
+        })
+    
+    def deployment_transaction_status(self, tx_hash: str) -> Dict:
+        """
+        Check the deployment transaction once.
         
-        self._deployments[deployment_id] = result
+        Args:
+            tx_hash: Deployment transaction hash
         
-        print(f"[Nostromo] Deployment successful!")
-        print(f"[Nostromo] Contract: {contract_addr[:30]}...")
-        print(f"[Nostromo] TX Hash: {tx_hash[:20]}...")
+        Returns:
+            {"status": "pending" | "confirmed" | "failed" | "unknown", ...}
+        """
+        if self.node is None:
+            # Placeholder deployments confirm immediately
+            return {"status": "confirmed", "confirmations": QUBIC_REQUIRED_CONFIRMATIONS}
+        return self.node.get_transaction_statuses([tx_hash], QUBIC_REQUIRED_CONFIRMATIONS)[tx_hash]
+    
+    def _submit_and_confirm(self, deployment_id: str, contract_addr: str, config: DeploymentConfig) -> DeploymentResult:
+        """Submit the deployment transaction and wait for it to confirm."""
+        try:
+            tx_hash = self.submit_deployment(deployment_id, contract_addr, config)
+            
+            deadline = time.time() + DEPLOY_TIMEOUT_SECONDS
+            while True:
+                status = self.deployment_transaction_status(tx_hash)
+                if status["status"] in ("confirmed", "failed") or time.time() >= deadline:
+                    break
+                time.sleep(DEPLOY_POLL_SECONDS)
+        except Exception as e:
+            return DeploymentResult(
+                success=False,
+                deployment_id=deployment_id,
+                contract_address=None,
+                transaction_hash=None,
+                status=DeploymentStatus.FAILED,
+                error_message=str(e),
+                network=config.network
+            )
         
-        return result
+        return deployment_result_from_status(deployment_id, contract_addr, tx_hash, status, config.network)
     
     def get_deployment_status(self, deployment_id: str) -> Optional[DeploymentResult]:
         """
@@ -289,6 +390,28 @@ class NostromoClient:
         }
 
 
+def deployment_result_from_status(
+    deployment_id: str,
+    contract_addr: str,
+    tx_hash: str,
+    status: Dict,
+    network: Optional[str] = None
+) -> DeploymentResult:
+    """Build the DeploymentResult for the latest deployment transaction status."""
+    confirmed = status["status"] == "confirmed"
+    return DeploymentResult(
+        success=confirmed,
+        deployment_id=deployment_id,
+        contract_address=contract_addr if confirmed else None,
+        transaction_hash=tx_hash,
+        status=DeploymentStatus.CONFIRMED if confirmed else (
+            DeploymentStatus.FAILED if status["status"] == "failed" else DeploymentStatus.DEPLOYING
+        ),
+        error_message=status.get("error") or (None if confirmed else "Timed out waiting for confirmation"),
+        network=network
+    )
+
+
 def deploy_devscore_contract(owner_address: str, network: str = "testnet") -> DeploymentResult:
     """
     Deploy the DevScore NFT contract to Qubic.
@@ -304,19 +427,22 @@ def deploy_devscore_contract(owner_address: str, network: str = "testnet") -> De
     """
     client = NostromoClient(network=network)
     
-    config = DeploymentConfig(
+    deployment = DeploymentConfig(
         network=network,
         contract_name="DevScoreNFT",
         initial_supply=0,  # NFTs minted on demand
         owner_address=owner_address,
-        metadata_uri="ipfs://QmDevScoreMetadata"
+        metadata_uri=config.settings.nft.metadata_base_url
     )
     
-    return client.deploy(config)
+    return client.deploy(deployment)
 
 
 # Example usage
 if __name__ == "__main__":
+    import logs
+    logs.setup(fmt="text")
+
     # Deploy DevScore contract to testnet
     test_owner = "QUBIC" + "A" * 56  # Mock address
     
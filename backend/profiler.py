@@ -0,0 +1,268 @@
+"""
+Profiling
+
+Production diagnosis tools that attach to the running API.
+
+- SamplingProfiler: a background thread samples the stacks of every other
+  thread (sys._current_frames) at a fixed interval and aggregates them
+  into collapsed stacks ("thread;outer;...;inner count"), the input format
+  of flamegraph.pl, speedscope and inferno. Cost is one stack walk per
+  interval; nothing is hooked into the profiled code
+- LoopLagMonitor: a heartbeat task on the event loop plus a watchdog
+  thread. When the loop has not run the heartbeat for longer than the
+  threshold, the watchdog prints the loop thread's stack, i.e. the
+  synchronous call blocking every other request (SQLite, a blocking SDK
+  call, CPU-heavy work, ...). Lag is also recorded in the metrics
+
+Profile a running server (admin endpoint, requires ADMIN_TOKEN):
+    python profiler.py --url http://127.0.0.1:8000 --seconds 10 --output profile.collapsed
+    flamegraph.pl profile.collapsed > profile.svg
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from typing import Dict, List, Optional
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+PROFILER_INTERVAL_MS = float(os.getenv("PROFILER_INTERVAL_MS", "5"))
+PROFILER_MAX_SECONDS = float(os.getenv("PROFILER_MAX_SECONDS", "60"))
+LOOP_LAG_MONITOR = os.getenv("LOOP_LAG_MONITOR", "true").lower() in ("1", "true", "yes")
+LOOP_LAG_THRESHOLD_MS = float(os.getenv("LOOP_LAG_THRESHOLD_MS", "100"))
+LOOP_LAG_INTERVAL_MS = float(os.getenv("LOOP_LAG_INTERVAL_MS", "50"))
+
+LOOP_LAG_SECONDS = metrics.Histogram(
+    "devscore_event_loop_lag_seconds",
+    "Delay between a scheduled heartbeat and the event loop running it",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+LOOP_BLOCKED = metrics.Counter(
+    "devscore_event_loop_blocked_total",
+    "Times the event loop was blocked beyond LOOP_LAG_THRESHOLD_MS"
+)
+
+
+class ProfilerBusyError(Exception):
+    """Raised when a profile is requested while another one is running."""
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+def collapse_stack(frame) -> List[str]:
+    """Frames of a stack, outermost first, as flamegraph labels."""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+class SamplingProfiler:
+    """Wall-clock sampling profiler over all threads of the process."""
+
+    def __init__(self, interval: float = PROFILER_INTERVAL_MS / 1000.0):
+        """
+        Initialize the profiler.
+
+        Args:
+            interval: Seconds between samples
+        """
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "SamplingProfiler":
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = collapse_stack(frame)
+                # Skip threads parked in a wait (idle executor workers, ...)
+                if stack and stack[-1].startswith(("wait (threading.py", "_worker (thread.py", "select (selectors.py")):
+                    continue
+                self.samples[";".join([names.get(thread_id, str(thread_id))] + stack)] += 1
+            self.sample_count += 1
+
+    def collapsed(self) -> str:
+        """Samples in collapsed-stack format, heaviest stacks first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+    def top_functions(self, limit: int = 20) -> List[Dict]:
+        """Functions by share of samples in which they were the innermost frame."""
+        self_counts: Counter = Counter()
+        for stack, count in self.samples.items():
+            self_counts[stack.rsplit(";", 1)[-1]] += count
+        total = sum(self_counts.values()) or 1
+        return [
+            {"function": function, "samples": count, "share": count / total}
+            for function, count in self_counts.most_common(limit)
+        ]
+
+
+_profile_lock = threading.Lock()
+
+
+async def profile(seconds: float, interval: float = PROFILER_INTERVAL_MS / 1000.0) -> SamplingProfiler:
+    """
+    Sample the running process for a while without blocking the event loop.
+
+    Args:
+        seconds: Sampling duration (capped at PROFILER_MAX_SECONDS)
+        interval: Seconds between samples
+
+    Returns:
+        The stopped profiler holding the samples
+
+    Raises:
+        ProfilerBusyError: Another profile is running
+    """
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusyError("A profile is already running")
+    try:
+        profiler = SamplingProfiler(max(interval, 0.001)).start()
+        try:
+            await asyncio.sleep(min(max(seconds, 0.1), PROFILER_MAX_SECONDS))
+        finally:
+            await asyncio.to_thread(profiler.stop)
+        return profiler
+    finally:
+        _profile_lock.release()
+
+
+class LoopLagMonitor:
+    """Detects and reports event-loop blocking."""
+
+    def __init__(
+        self,
+        threshold: float = LOOP_LAG_THRESHOLD_MS / 1000.0,
+        interval: float = LOOP_LAG_INTERVAL_MS / 1000.0
+    ):
+        """
+        Initialize the monitor.
+
+        Args:
+            threshold: Seconds without a heartbeat after which the loop
+                counts as blocked and its stack is printed
+            interval: Seconds between heartbeats
+        """
+        self.threshold = threshold
+        self.interval = interval
+        self.blocked = 0
+        self.max_lag = 0.0
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._beat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stop.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await asyncio.to_thread(self._watchdog.join)
+        self._watchdog = None
+
+    async def _beat(self) -> None:
+        while True:
+            scheduled = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - scheduled - self.interval)
+            LOOP_LAG_SECONDS.observe(lag)
+            self.max_lag = max(self.max_lag, lag)
+            self._heartbeat = now
+
+    def _watch(self) -> None:
+        reported = False
+        while not self._stop.wait(self.threshold / 2):
+            stalled = time.monotonic() - self._heartbeat
+            if stalled <= self.threshold + self.interval:
+                reported = False
+                continue
+            if reported:
+                continue
+            # Report each blocking episode once, while it is still happening
+            reported = True
+            self.blocked += 1
+            LOOP_BLOCKED.inc()
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else "(no frame)\n"
+            logger.warning("Event loop blocked for %.0fms; loop thread stack:\n%s", stalled * 1000, stack.rstrip())
+
+    def stats(self) -> Dict:
+        """Return blocking counters."""
+        return {
+            "running": self._task is not None,
+            "threshold_ms": self.threshold * 1000,
+            "blocked": self.blocked,
+            "max_lag_ms": self.max_lag * 1000
+        }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    import httpx
+
+    parser = argparse.ArgumentParser(description="Profile a running DevScore API")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--interval-ms", type=float, default=PROFILER_INTERVAL_MS)
+    parser.add_argument("--token", default=os.getenv("ADMIN_TOKEN"), help="Admin token (default: $ADMIN_TOKEN)")
+    parser.add_argument("--output", default="profile.collapsed", help="Collapsed-stack output file")
+    args = parser.parse_args()
+
+    response = httpx.get(
+        f"{args.url.rstrip('/')}/admin/profile",
+        params={"seconds": args.seconds, "interval_ms": args.interval_ms},
+        headers={"X-Admin-Token": args.token or ""},
+        timeout=args.seconds + 30
+    )
+    response.raise_for_status()
+    with open(args.output, "w") as f:
+        f.write(response.text)
+    print(f"Wrote {len(response.text.splitlines())} stacks to {args.output}")
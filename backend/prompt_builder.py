@@ -0,0 +1,294 @@
+"""
+Prompt Builder Module
+
+Builds the GitHub activity prompt sent to the LLM under a fixed token budget.
+
+- Counts tokens locally (tiktoken when installed, heuristic otherwise)
+- Ranks prompt sections and truncates the least important ones first
+- Deduplicates near-identical commit messages
+- Reports estimated prompt size so callers can record tokens-in/out
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+
+import config
+
+config.load_env()
+
+# Roughly matches how BPE tokenizers split English text and code
+_TOKEN_PATTERN = re.compile(r"[A-Za-z]+|\d{1,3}|[^\sA-Za-z\d]", re.UNICODE)
+_WHITESPACE = re.compile(r"\s+")
+_COMMIT_NOISE = re.compile(r"^(merge (pull request|branch)\b.*|wip\b.*)$")
+
+
+class TokenCounter:
+    """Counts tokens for a model, preferring tiktoken when it is installed."""
+
+    def __init__(self, model: str = "gpt-3.5-turbo"):
+        """
+        Initialize the token counter.
+
+        Args:
+            model: Model name used to select the tiktoken encoding
+        """
+        self.model = model
+        self._encoding = None
+        try:
+            import tiktoken
+            self._encoding = tiktoken.encoding_for_model(model)
+        except Exception:
+            self._encoding = None
+
+    @property
+    def exact(self) -> bool:
+        """Whether counts come from the model's real tokenizer."""
+        return self._encoding is not None
+
+    def count(self, text: str) -> int:
+        """
+        Count tokens in a piece of text.
+
+        Args:
+            text: Text to count
+
+        Returns:
+            Number of tokens (estimated when tiktoken is unavailable)
+        """
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text))
+
+        tokens = 0
+        for piece in _TOKEN_PATTERN.findall(text):
+            # Long words are split into several sub-word tokens
+            tokens += 1 + (len(piece) - 1) // 6 if piece.isalpha() else 1
+        return tokens
+
+    def count_messages(self, messages: List[Dict[str, str]]) -> int:
+        """Count tokens for a chat message list, including per-message overhead."""
+        return sum(4 + self.count(m.get("content", "")) for m in messages) + 2
+
+
+@dataclass
+class PromptSection:
+    """A titled block of prompt lines, kept or truncated by priority."""
+    title: str
+    lines: List[str]
+    priority: int  # Lower values are kept first
+    min_lines: int = 1
+    empty_text: str = "N/A"
+
+
+@dataclass
+class BuiltPrompt:
+    """Result of building a prompt under a token budget."""
+    text: str
+    tokens: int
+    budget: int
+    truncated_sections: List[str] = field(default_factory=list)
+    dropped_sections: List[str] = field(default_factory=list)
+    duplicate_commits_removed: int = 0
+
+
+def normalize_commit_message(message: str) -> str:
+    """Reduce a commit message to its comparable first line."""
+    first_line = (message or "").split("\n", 1)[0]
+    return _WHITESPACE.sub(" ", first_line).strip().rstrip(".!").lower()
+
+
+def dedupe_commits(commit_details: List[Dict]) -> Tuple[List[Tuple[Dict, int]], int]:
+    """
+    Collapse commits with identical normalized messages.
+
+    Merge commits and WIP commits are dropped entirely since they carry
+    no information for the analysis.
+
+    Args:
+        commit_details: Commit dicts with "repo" and "message" keys
+
+    Returns:
+        Tuple of ([(commit, occurrences)], number of commits removed)
+    """
+    seen: Dict[str, int] = {}
+    unique: List[List] = []
+    removed = 0
+
+    for commit in commit_details:
+        key = normalize_commit_message(commit.get("message", ""))
+        if not key or _COMMIT_NOISE.match(key):
+            removed += 1
+            continue
+        if key in seen:
+            unique[seen[key]][1] += 1
+            removed += 1
+            continue
+        seen[key] = len(unique)
+        unique.append([commit, 1])
+
+    return [(commit, count) for commit, count in unique], removed
+
+
+class PromptBuilder:
+    """Builds the activity analysis prompt within a token budget."""
+
+    def __init__(
+        self,
+        budget_tokens: Optional[int] = None,
+        counter: Optional[TokenCounter] = None
+    ):
+        """
+        Initialize the prompt builder.
+
+        Args:
+            budget_tokens: Maximum tokens for the activity block
+                (default: LLM_PROMPT_TOKEN_BUDGET)
+            counter: Token counter (a heuristic counter is created if omitted)
+        """
+        self.budget_tokens = budget_tokens or config.settings.llm.prompt_token_budget
+        self.counter = counter or TokenCounter()
+
+    def build(self, activity_data: Dict[str, Any], budget_tokens: Optional[int] = None) -> BuiltPrompt:
+        """
+        Render activity data as prompt text that fits the token budget.
+
+        Sections are admitted in priority order. Each section always keeps
+        its first `min_lines` lines if they fit. The remaining budget then
+        goes to one admitted section at a time, in priority order: a section
+        takes further lines until its next line does not fit, then the next
+        section gets what is left.
+
+        Args:
+            activity_data: Activity data from the GitHub integration
+            budget_tokens: Optional override of the configured budget
+
+        Returns:
+            BuiltPrompt with the rendered text and accounting details
+        """
+        budget = budget_tokens or self.budget_tokens
+        sections, duplicates = self._build_sections(activity_data)
+        ordered = sorted(sections, key=lambda s: s.priority)
+
+        used = 0
+        kept: Dict[str, List[str]] = {s.title: [] for s in ordered}
+        admitted: List[PromptSection] = []
+
+        # Pass 1: headers plus the minimum lines of each section
+        for section in ordered:
+            header_cost = self.counter.count(f"\n=== {section.title} ===\n")
+            head = section.lines[:section.min_lines] or [section.empty_text]
+            head_cost = sum(self.counter.count(line) + 1 for line in head)
+            if used + header_cost + head_cost > budget:
+                continue
+            used += header_cost + head_cost
+            kept[section.title] = list(head)
+            admitted.append(section)
+
+        # Pass 2: remaining lines, most important sections first
+        for section in admitted:
+            for line in section.lines[section.min_lines:]:
+                cost = self.counter.count(line) + 1
+                if used + cost > budget:
+                    break
+                kept[section.title].append(line)
+                used += cost
+
+        admitted_titles = {s.title for s in admitted}
+        parts = []
+        truncated = []
+        for section in sections:
+            if section.title not in admitted_titles:
+                continue
+            lines = kept[section.title]
+            if section.lines and len(lines) < len(section.lines):
+                truncated.append(section.title)
+            parts.append(f"=== {section.title} ===\n" + "\n".join(lines))
+
+        text = "\n\n".join(parts)
+        return BuiltPrompt(
+            text=text,
+            tokens=self.counter.count(text),
+            budget=budget,
+            truncated_sections=truncated,
+            dropped_sections=[s.title for s in sections if s.title not in admitted_titles],
+            duplicate_commits_removed=duplicates
+        )
+
+    def _build_sections(self, activity_data: Dict[str, Any]) -> Tuple[List[PromptSection], int]:
+        """Split activity data into ranked prompt sections (in display order)."""
+        summary = activity_data.get("summary", {})
+        activity = activity_data.get("activity", {})
+        user_info = activity_data.get("user_info", {})
+
+        commits = activity.get("commits", {})
+        prs = activity.get("pull_requests", {})
+        issues = activity.get("issues", {})
+        repos = activity.get("repositories", {})
+
+        profile = [
+            f"Username: {activity_data.get('username')}",
+            f"Name: {user_info.get('name') or 'N/A'}",
+            f"Followers: {user_info.get('followers')}, Following: {user_info.get('following')}",
+            f"Public Repositories: {user_info.get('public_repos')}",
+            f"Bio: {(user_info.get('bio') or 'N/A')[:160]}",
+            f"Location: {user_info.get('location') or 'N/A'}",
+        ]
+
+        totals = [
+            f"Total Commits: {summary.get('total_commits')}",
+            f"Pull Requests: {summary.get('total_prs')} (Merged: {prs.get('merged', 0)}, Open: {prs.get('open', 0)})",
+            f"Issues: {summary.get('total_issues')} (Closed: {issues.get('closed', 0)}, Open: {issues.get('open', 0)})",
+            f"Repositories with Commits: {commits.get('repositories_with_commits', 0)}",
+            f"Total Stars Across Repos: {summary.get('total_stars')}",
+        ]
+
+        language_breakdown = commits.get("language_breakdown", {})
+        languages = [
+            f"- {lang}: {count} commits"
+            for lang, count in sorted(language_breakdown.items(), key=lambda x: x[1], reverse=True)[:10]
+        ]
+
+        repo_list = sorted(
+            repos.get("repositories", []),
+            key=lambda r: (r.get("stars") or 0, r.get("forks") or 0),
+            reverse=True
+        )
+        top_repos = [
+            f"- {repo.get('name')}: {(repo.get('description') or 'N/A')[:80]} "
+            f"({repo.get('stars') or 0} stars, {repo.get('forks') or 0} forks)"
+            for repo in repo_list[:10]
+        ]
+
+        by_repo = sorted(
+            commits.get("by_repository", {}).items(),
+            key=lambda x: x[1].get("count", 0),
+            reverse=True
+        )
+        commits_by_repo = [
+            f"- {name}: {data.get('count', 0)} commits ({data.get('language') or 'Unknown'})"
+            for name, data in by_repo[:15]
+        ]
+
+        unique_commits, duplicates = dedupe_commits(commits.get("commit_details", []))
+        recent_commits = [
+            f"- [{commit.get('repo')}] {commit.get('message', '').split(chr(10))[0][:72]}"
+            + (f" (x{count})" if count > 1 else "")
+            for commit, count in unique_commits[:15]
+        ]
+
+        sections = [
+            PromptSection("DEVELOPER PROFILE", profile, priority=1, min_lines=4),
+            PromptSection(f"ACTIVITY SUMMARY ({summary.get('time_period', 'Last 30 days')})",
+                          totals, priority=0, min_lines=len(totals)),
+            PromptSection("PROGRAMMING LANGUAGES", languages, priority=2, min_lines=3,
+                          empty_text="No language data"),
+            PromptSection("TOP REPOSITORIES", top_repos, priority=3, min_lines=3,
+                          empty_text="No repositories"),
+            PromptSection("COMMITS BY REPOSITORY", commits_by_repo, priority=4, min_lines=3,
+                          empty_text="No commit data"),
+            PromptSection("RECENT COMMITS (Sample)", recent_commits, priority=5, min_lines=3,
+                          empty_text="No commit details"),
+        ]
+        return sections, duplicates
@@ -4,6 +4,10 @@ Qubic Blockchain Client
 This module provides placeholder functions for interacting with the Qubic testnet.
 Replace these implementations with actual Qubic SDK calls when available.
 
+When a node is configured (QUBIC_NODE_URL, or a SimulatedQubicNode passed
+in-process) transactions, balances and statuses go to that node instead of
+the built-in placeholders; see qubic_node_sim.py.
+
 Documentation: https://docs.qubic.org/
 Testnet: https://testnet.qubic.org/
 
@@ -15,12 +19,34 @@ NFT Structure:
 - Owner: Wallet address of the NFT owner
 """
 
+import asyncio
 import hashlib
+import itertools
+import logging
+import os
 import time
-import json
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from dataclasses import dataclass
 
+import config
+import metrics
+import tracing
+from signing import SignedTransaction, encode_canonical, get_signing_key, sign_batch, transaction_hash
+from wallet_cache import WalletCache
+
+logger = logging.getLogger(__name__)
+
+# Placeholder chain timing: seconds until a submitted transaction is final
+QUBIC_CONFIRMATION_SECONDS = float(os.getenv("QUBIC_CONFIRMATION_SECONDS", "2"))
+QUBIC_REQUIRED_CONFIRMATIONS = int(os.getenv("QUBIC_REQUIRED_CONFIRMATIONS", "3"))
+
+# Qubic node RPC endpoint (e.g. a local qubic_node_sim.py); placeholders if unset
+QUBIC_NODE_URL = os.getenv("QUBIC_NODE_URL")
+
+# Service (treasury) wallet that signs mint bundles (unsigned if unset)
+QUBIC_SERVICE_PRIVATE_KEY = os.getenv("QUBIC_SERVICE_PRIVATE_KEY")
+QUBIC_SERVICE_ADDRESS = os.getenv("QUBIC_SERVICE_ADDRESS")
+
 
 @dataclass
 class QubicWallet:
@@ -53,6 +79,81 @@ class DevScoreNFT:
     discord_messages: int
     minted_at: int
     metadata_uri: str
+    transaction_hash: Optional[str] = None
+
+
+@dataclass
+class NFTMintRequest:
+    """A single DevScore NFT to mint (one entry of a batch)."""
+    wallet_address: str
+    score: int
+    commits: int
+    pull_requests: int
+    issues: int
+    discord_messages: int
+
+
+class HTTPNodeClient:
+    """
+    Minimal RPC client for a Qubic node HTTP API.
+    
+    Exposes the same methods as SimulatedQubicNode, so QubicClient can use
+    either interchangeably.
+    """
+    
+    def __init__(self, base_url: str, timeout: Optional[float] = None):
+        """
+        Initialize the node client.
+        
+        Args:
+            base_url: Node API root (e.g. "http://127.0.0.1:8999")
+            timeout: Per-request timeout in seconds
+                (default: QUBIC_NODE_TIMEOUT_SECONDS, read per request)
+        """
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        import httpx  # Only needed with a node configured
+        self._http = httpx.Client(base_url=self.base_url)
+    
+    def _request(self, method: str, path: str, **kwargs):
+        # Label by route prefix ("/balance", "/tx"), never by address
+        with metrics.upstream("qubic", f"{method} /{path.split('/')[1]}", **{"http.method": method, "http.target": path}):
+            response = self._http.request(
+                method, path, headers=tracing.inject({}),
+                timeout=self.timeout or config.settings.qubic.node_timeout_seconds, **kwargs
+            )
+            response.raise_for_status()
+        return response.json()
+    
+    def submit_transaction(self, transaction: Dict) -> str:
+        """Submit a transaction and return its hash."""
+        return self._request("POST", "/tx", json=transaction)["tx_hash"]
+    
+    def get_transaction_statuses(self, tx_hashes: List[str], required_confirmations: int = 1) -> Dict[str, Dict]:
+        """Get the status of many transactions in one request."""
+        return self._request("POST", "/tx/status", json={
+            "tx_hashes": tx_hashes,
+            "required_confirmations": required_confirmations
+        })
+    
+    def get_balance(self, address: str) -> int:
+        """Get the balance of an address."""
+        return self._request("GET", f"/balance/{address}")["balance"]
+    
+    def get_account(self, address: str) -> Dict:
+        """Get balance, next nonce and current tick for an address."""
+        return self._request("GET", f"/accounts/{address}")
+    
+    def get_tick(self) -> int:
+        """Get the current tip height."""
+        return self._request("GET", "/tick")["tick"]
+    
+    def get_blocks(self, from_height: int, limit: int = 100) -> List[Dict]:
+        """Get consecutive blocks starting at a height."""
+        return self._request("GET", "/blocks", params={"from_height": from_height, "limit": limit})
+    
+    def close(self) -> None:
+        self._http.close()
 
 
 class QubicClient:
@@ -63,18 +164,45 @@ class QubicClient:
     when integrating with the live testnet.
     """
     
-    def __init__(self, network: str = "testnet"):
+    def __init__(
+        self,
+        network: str = "testnet",
+        node=None,
+        node_url: Optional[str] = QUBIC_NODE_URL,
+        registry=None,
+        metadata_store=None
+    ):
         """
         Initialize the Qubic client.
         
         Args:
             network: Either "testnet" or "mainnet"
+            node: Node to talk to in-process (e.g. SimulatedQubicNode)
+            node_url: Node HTTP API to talk to when no in-process node is given
+            registry: Local NFT registry (nft_registry.NFTRegistry) updated on
+                mint/transfer and used for NFT lookups
+            metadata_store: Content-addressed store (metadata_store.MetadataStore)
+                that renders and hosts token metadata at mint time
         """
         self.network = network
         self.api_url = f"https://{network}.qubic.org/api"
         
+        # Node backend; None keeps the placeholder behaviour
+        self.node = node if node is not None else (HTTPNodeClient(node_url) if node_url else None)
+        self.registry = registry
+        self.metadata_store = metadata_store
+        
+        # Cached balances/nonces; nonces are reserved locally per sender
+        self.wallets = WalletCache(self.fetch_account)
+        
         # Placeholder for connection status
         self._connected = False
+        
+        # Disambiguates token IDs generated within the same clock tick
+        self._mint_counter = itertools.count()
+        
+        # Placeholder mempool: tx hash -> submission time
+        self._submitted: Dict[str, float] = {}
     
     def connect(self) -> bool:
         """
@@ -84,7 +212,7 @@ class QubicClient:
             True if connection successful
         """
         # Placeholder: In production, establish actual connection
-        print(f"Connecting to Qubic {self.network}...")
+        logger.info("Connecting to Qubic %s...", self.network)
         self._connected = True
         return True
     
@@ -121,9 +249,24 @@ class QubicClient:
         Returns:
             Balance in QU (Qubic units)
         """
+        return self.wallets.get_balance(address)
+    
+    def fetch_account(self, address: str) -> Dict:
+        """
+        Query the balance, next nonce and current tick of an address (uncached).
+        
+        Args:
+            address: Qubic wallet address
+        
+        Returns:
+            Dictionary with balance, nonce and tick
+        """
+        if self.node is not None:
+            return self.node.get_account(address)
+        
         # Placeholder: Return mock balance
         # In production, query the Qubic network
-        return 1000000  # 1M QU for testing
+        return {"address": address, "balance": 1000000, "nonce": 0, "tick": 0}  # 1M QU for testing
     
     def sign_transaction(
         self,
@@ -140,14 +283,29 @@ class QubicClient:
         Returns:
             Signed transaction hash
         """
-        # Placeholder: Create mock signature
+        # Placeholder: Keyed hash over the canonical encoding (see signing.py)
         # In production, use Qubic cryptographic signing
+        return get_signing_key(private_key).sign(encode_canonical(transaction_data))
+    
+    def sign_transactions_batch(
+        self,
+        private_key: str,
+        transactions: List[Dict]
+    ) -> List[SignedTransaction]:
+        """
+        Sign many transactions with one key.
         
-        data_str = json.dumps(transaction_data, sort_keys=True)
-        combined = f"{private_key}:{data_str}"
-        signature = hashlib.sha256(combined.encode()).hexdigest()
+        Each transaction is encoded once; the encoding, hash and signature
+        are returned together.
         
-        return signature
+        Args:
+            private_key: Wallet private key
+            transactions: Transactions to sign
+        
+        Returns:
+            SignedTransaction per transaction, in order
+        """
+        return sign_batch(private_key, transactions)
     
     def mint_devscore_nft(
         self,
@@ -172,50 +330,168 @@ class QubicClient:
         Returns:
             Dictionary with token_id and transaction_hash
         """
-        # Generate unique token ID
-        mint_data = f"{wallet_address}:{score}:{time.time()}"
-        token_id = hashlib.sha256(mint_data.encode()).hexdigest()[:16].upper()
+        return self.mint_devscore_nfts_batch([
+            NFTMintRequest(
+                wallet_address=wallet_address,
+                score=score,
+                commits=commits,
+                pull_requests=pull_requests,
+                issues=issues,
+                discord_messages=discord_messages
+            )
+        ])[0]
+    
+    @metrics.timed("qubic.mint_batch")
+    def mint_devscore_nfts_batch(self, requests: List[NFTMintRequest]) -> List[Dict]:
+        """
+        Mint several DevScore NFTs in a single bundled transaction.
+        
+        Metadata for every token is built up front and all mints are
+        submitted to the chain as one bundle, so the per-mint cost is a
+        fraction of a standalone transaction.
         
-        # Create NFT metadata
-        nft_metadata = {
+        Args:
+            requests: NFTs to mint
+        
+        Returns:
+            One dictionary per request (same order) with token_id,
+            transaction_hash, bundle_index and metadata
+        """
+        if not requests:
+            return []
+        
+        minted_at = int(time.time())
+        mints = []
+        for request in requests:
+            token_id = self._new_token_id(request.wallet_address, request.score)
+            metadata = self._build_nft_metadata(token_id, request, minted_at)
+            metadata_uri = self.metadata_store.publish(metadata)["metadata_uri"] if self.metadata_store else ""
+            mints.append({
+                "token_id": token_id,
+                "owner": request.wallet_address,
+                "metadata": metadata,
+                "metadata_uri": metadata_uri
+            })
+        
+        # Placeholder: Create mock bundle transaction
+        # In production, submit actual batched NFT minting transaction
+        
+        bundle = {
+            "type": "NFT_MINT_BATCH",
+            "network": self.network,
+            "mints": mints
+        }
+        if QUBIC_SERVICE_ADDRESS:
+            bundle["from"] = QUBIC_SERVICE_ADDRESS
+            bundle["nonce"] = self.wallets.reserve_nonce(QUBIC_SERVICE_ADDRESS)
+        
+        # Encode once for both the bundle hash and the service signature
+        if QUBIC_SERVICE_PRIVATE_KEY:
+            signed = get_signing_key(QUBIC_SERVICE_PRIVATE_KEY).sign_transaction(bundle)
+            local_hash = signed.tx_hash
+            bundle = {**bundle, "signature": signed.signature}
+        else:
+            local_hash = transaction_hash(encode_canonical(bundle))
+        
+        if self.node is not None:
+            try:
+                tx_hash = self.node.submit_transaction(bundle)
+            except Exception:
+                if QUBIC_SERVICE_ADDRESS:
+                    self.wallets.release_nonce(QUBIC_SERVICE_ADDRESS, bundle["nonce"])
+                raise
+        else:
+            # Mock transaction hash for the whole bundle
+            tx_hash = local_hash
+            self._submitted[tx_hash] = time.time()
+        logger.info("Minting %d DevScore NFT(s) in bundle %s...", len(mints), tx_hash[:16])
+        if QUBIC_SERVICE_ADDRESS:
+            self.wallets.invalidate(QUBIC_SERVICE_ADDRESS)
+        
+        if self.registry is not None:
+            self.registry.record_mints([
+                DevScoreNFT(
+                    token_id=mint["token_id"],
+                    owner=request.wallet_address,
+                    score=request.score,
+                    commits=request.commits,
+                    pull_requests=request.pull_requests,
+                    issues=request.issues,
+                    discord_messages=request.discord_messages,
+                    minted_at=minted_at,
+                    metadata_uri=mint["metadata_uri"],
+                    transaction_hash=tx_hash
+                )
+                for mint, request in zip(mints, requests)
+            ])
+        
+        return [
+            {
+                "token_id": mint["token_id"],
+                "transaction_hash": tx_hash,
+                "bundle_index": index,
+                "bundle_size": len(mints),
+                "metadata": mint["metadata"],
+                "metadata_uri": mint["metadata_uri"]
+            }
+            for index, mint in enumerate(mints)
+        ]
+    
+    def _new_token_id(self, wallet_address: str, score: int) -> str:
+        """Generate a unique token ID."""
+        mint_data = f"{wallet_address}:{score}:{time.time_ns()}:{next(self._mint_counter)}"
+        return hashlib.sha256(mint_data.encode()).hexdigest()[:16].upper()
+    
+    def _build_nft_metadata(self, token_id: str, request: NFTMintRequest, minted_at: int) -> Dict:
+        """Create NFT metadata for a mint request."""
+        return {
             "name": f"DevScore #{token_id}",
             "description": "Blockchain-verified developer reputation score",
             "attributes": [
-                {"trait_type": "Score", "value": score},
-                {"trait_type": "Commits", "value": commits},
-                {"trait_type": "Pull Requests", "value": pull_requests},
-                {"trait_type": "Issues", "value": issues},
-                {"trait_type": "Discord Messages", "value": discord_messages},
-                {"trait_type": "Tier", "value": self._get_tier(score)}
+                {"trait_type": "Score", "value": request.score},
+                {"trait_type": "Commits", "value": request.commits},
+                {"trait_type": "Pull Requests", "value": request.pull_requests},
+                {"trait_type": "Issues", "value": request.issues},
+                {"trait_type": "Discord Messages", "value": request.discord_messages},
+                {"trait_type": "Tier", "value": self._get_tier(request.score)}
             ],
-            "minted_at": int(time.time()),
+            "minted_at": minted_at,
             "network": self.network
         }
+    
+    def get_transaction_statuses(self, tx_hashes: List[str]) -> Dict[str, Dict]:
+        """
+        Get the confirmation status of many transactions in one query.
         
-        # Placeholder: Create mock transaction
-        # In production, submit actual NFT minting transaction
-        
-        transaction_data = {
-            "type": "NFT_MINT",
-            "token_id": token_id,
-            "owner": wallet_address,
-            "metadata": nft_metadata
-        }
-        
-        # Generate mock transaction hash
-        tx_hash = hashlib.sha256(
-            json.dumps(transaction_data).encode()
-        ).hexdigest()
-        
-        print(f"Minting DevScore NFT #{token_id} for {wallet_address[:20]}...")
-        print(f"Score: {score}, Tier: {self._get_tier(score)}")
-        print(f"Transaction hash: {tx_hash[:16]}...")
+        Args:
+            tx_hashes: Transaction hashes to look up
         
-        return {
-            "token_id": token_id,
-            "transaction_hash": tx_hash,
-            "metadata": nft_metadata
-        }
+        Returns:
+            Mapping of tx hash -> {"status", "confirmations"}; status is
+            "pending", "confirmed" or "unknown"
+        """
+        if self.node is not None:
+            return self.node.get_transaction_statuses(tx_hashes, QUBIC_REQUIRED_CONFIRMATIONS)
+        
+        # Placeholder: Derive confirmations from time since submission
+        # In production, query transaction status from the Qubic network
+        now = time.time()
+        per_confirmation = QUBIC_CONFIRMATION_SECONDS / max(QUBIC_REQUIRED_CONFIRMATIONS, 1)
+        statuses = {}
+        for tx_hash in tx_hashes:
+            submitted_at = self._submitted.get(tx_hash)
+            if submitted_at is None:
+                statuses[tx_hash] = {"status": "unknown", "confirmations": 0}
+                continue
+            confirmations = int((now - submitted_at) / per_confirmation) if per_confirmation else QUBIC_REQUIRED_CONFIRMATIONS
+            confirmed = confirmations >= QUBIC_REQUIRED_CONFIRMATIONS
+            statuses[tx_hash] = {
+                "status": "confirmed" if confirmed else "pending",
+                "confirmations": confirmations
+            }
+            if confirmed:
+                self._submitted.pop(tx_hash, None)
+        return statuses
     
     def get_nft(self, token_id: str) -> Optional[DevScoreNFT]:
         """
@@ -227,10 +503,13 @@ class QubicClient:
         Returns:
             DevScoreNFT object or None if not found
         """
-        # Placeholder: Return mock NFT data
-        # In production, query the blockchain
+        # Served from the local registry (kept current on mint/transfer and
+        # by the chain indexer) rather than a chain query
+        if self.registry is not None:
+            return self.registry.get(token_id)
         return None
     
+    @metrics.timed("qubic.transfer")
     def transfer_nft(
         self,
         token_id: str,
@@ -258,11 +537,23 @@ class QubicClient:
             "token_id": token_id,
             "from": from_address,
             "to": to_address,
-            "timestamp": int(time.time())
+            "timestamp": int(time.time()),
+            "nonce": self.wallets.reserve_nonce(from_address)
         }
         
-        signature = self.sign_transaction(private_key, transfer_data)
-        tx_hash = hashlib.sha256(signature.encode()).hexdigest()
+        signed = get_signing_key(private_key).sign_transaction(transfer_data)
+        if self.node is not None:
+            try:
+                tx_hash = self.node.submit_transaction({**transfer_data, "signature": signed.signature})
+            except Exception:
+                self.wallets.release_nonce(from_address, transfer_data["nonce"])
+                raise
+        else:
+            tx_hash = signed.tx_hash
+        self.wallets.invalidate(from_address)
+        
+        if self.registry is not None:
+            self.registry.record_transfer(token_id, to_address)
         
         return {
             "success": True,
@@ -284,6 +575,45 @@ class QubicClient:
         return "Newcomer"
 
 
+class AsyncQubicClient:
+    """
+    Asyncio front end for QubicClient.
+    
+    Blocking client calls run on worker threads so chain submission and
+    status polling never stall the API event loop.
+    """
+    
+    def __init__(self, client: Optional[QubicClient] = None, network: str = "testnet"):
+        """
+        Initialize the async client.
+        
+        Args:
+            client: Underlying synchronous client (created if omitted)
+            network: Network for a newly created client
+        """
+        self.client = client or QubicClient(network=network)
+    
+    @property
+    def network(self) -> str:
+        return self.client.network
+    
+    async def mint_devscore_nfts_batch(self, requests: List[NFTMintRequest]) -> List[Dict]:
+        """Submit a bundle of mints and return as soon as it is accepted."""
+        return await asyncio.to_thread(self.client.mint_devscore_nfts_batch, requests)
+    
+    async def get_transaction_statuses(self, tx_hashes: List[str]) -> Dict[str, Dict]:
+        """Look up the status of many transactions in one round trip."""
+        return await asyncio.to_thread(self.client.get_transaction_statuses, tx_hashes)
+    
+    async def get_balance(self, address: str) -> int:
+        """Get the balance of a wallet address."""
+        return await asyncio.to_thread(self.client.get_balance, address)
+    
+    async def transfer_nft(self, token_id: str, from_address: str, to_address: str, private_key: str) -> Dict:
+        """Submit an NFT transfer."""
+        return await asyncio.to_thread(self.client.transfer_nft, token_id, from_address, to_address, private_key)
+
+
 # Nostromo Launchpad Integration Placeholder
 class NostromoIntegration:
     """
@@ -316,7 +646,7 @@ class NostromoIntegration:
             Deployment result with contract address
         """
         # Placeholder for Nostromo deployment
-        print("Deploying contract via Nostromo Launchpad...")
+        logger.info("Deploying contract via Nostromo Launchpad...")
         
         return {
             "success": True,
@@ -343,6 +673,9 @@ class NostromoIntegration:
 
 # Example usage
 if __name__ == "__main__":
+    import logs
+    logs.setup(fmt="text")
+
     # Test the Qubic client
     client = QubicClient(network="testnet")
     client.connect()
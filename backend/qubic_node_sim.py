@@ -0,0 +1,489 @@
+"""
+Simulated Qubic Node
+
+Local stand-in for a Qubic node, used to benchmark the mint, transfer and
+confirmation paths offline and reproducibly.
+
+Features:
+- Block production every `block_time` seconds (background thread) or on
+  demand via mine_block()
+- Configurable RPC latency distribution (log-normal around a median)
+- Failure injection (fraction of RPCs that raise)
+- Bounded mempool and per-block transaction limit
+- Contract events (NFTMinted, Transfer, ScoreUpdated) recorded per block
+- Chain reorganisations on demand via reorg() (or the /reorg endpoint)
+
+Can be used in-process (QubicClient(node=node)) or over HTTP:
+    python qubic_node_sim.py --port 8999 --block-time 1 --latency-ms 20
+    QUBIC_NODE_URL=http://127.0.0.1:8999 uvicorn main:app
+"""
+
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional
+
+
+class NodeError(Exception):
+    """Base class for simulated node errors."""
+
+
+class MempoolFullError(NodeError):
+    """Raised when the mempool cannot accept more transactions."""
+
+
+class InjectedFailureError(NodeError):
+    """Raised when failure injection rejects an RPC."""
+
+
+@dataclass
+class LatencyModel:
+    """Log-normal RPC latency around a median, in milliseconds."""
+    median_ms: float = 0.0
+    sigma: float = 0.5
+    max_ms: float = 5000.0
+
+    def sample(self, rng: random.Random) -> float:
+        """Return a latency in seconds."""
+        if self.median_ms <= 0:
+            return 0.0
+        value = self.median_ms * math.exp(rng.gauss(0.0, self.sigma))
+        return min(value, self.max_ms) / 1000.0
+
+
+@dataclass
+class Block:
+    """A block produced by the simulated node."""
+    height: int
+    hash: str
+    parent_hash: str
+    timestamp: float
+    tx_hashes: List[str] = field(default_factory=list)
+    events: List[Dict] = field(default_factory=list)
+
+
+class SimulatedQubicNode:
+    """In-memory Qubic node simulation."""
+
+    def __init__(
+        self,
+        block_time: float = 1.0,
+        latency: Optional[LatencyModel] = None,
+        failure_rate: float = 0.0,
+        mempool_limit: int = 10000,
+        max_txs_per_block: int = 1000,
+        initial_balance: int = 1000000,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize the simulated node.
+
+        Args:
+            block_time: Seconds between blocks when running
+            latency: RPC latency model (no added latency if omitted)
+            failure_rate: Fraction of RPCs that fail (0.0 - 1.0)
+            mempool_limit: Maximum pending transactions
+            max_txs_per_block: Maximum transactions included per block
+            initial_balance: Balance reported for unknown addresses
+            seed: Random seed for reproducible latency and failures
+        """
+        self.block_time = block_time
+        self.latency = latency or LatencyModel()
+        self.failure_rate = failure_rate
+        self.mempool_limit = mempool_limit
+        self.max_txs_per_block = max_txs_per_block
+        self.initial_balance = initial_balance
+
+        self._rng = random.Random(seed)
+        self._lock = threading.RLock()
+        self._mempool: "OrderedDict[str, Dict]" = OrderedDict()
+        self._tx_heights: Dict[str, int] = {}
+        self._transactions: Dict[str, Dict] = {}
+        self._failed: Dict[str, str] = {}
+        self._balances: Dict[str, int] = {}
+        self._nonces: Dict[str, int] = {}
+        self._owners: Dict[str, str] = {}
+        self.blocks: List[Block] = [Block(0, "0" * 64, "0" * 64, time.time())]
+        self.reorgs = 0
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.rpc_calls = 0
+        self.rpc_failures = 0
+
+    # Lifecycle
+
+    def start(self) -> "SimulatedQubicNode":
+        """Start producing blocks every block_time seconds."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._produce_blocks, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop block production."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.block_time + 1)
+            self._thread = None
+
+    def _produce_blocks(self) -> None:
+        while not self._stop.wait(self.block_time):
+            self.mine_block()
+
+    # RPC helpers
+
+    def _rpc(self) -> None:
+        """Apply simulated latency and failure injection to an RPC."""
+        with self._lock:
+            self.rpc_calls += 1
+            delay = self.latency.sample(self._rng)
+            fail = self.failure_rate > 0 and self._rng.random() < self.failure_rate
+            if fail:
+                self.rpc_failures += 1
+        if delay:
+            time.sleep(delay)
+        if fail:
+            raise InjectedFailureError("Injected node failure")
+
+    @staticmethod
+    def transaction_hash(transaction: Dict) -> str:
+        """Hash a transaction the same way the node identifies it."""
+        return hashlib.sha256(
+            json.dumps(transaction, sort_keys=True, separators=(",", ":")).encode()
+        ).hexdigest()
+
+    # RPCs
+
+    def submit_transaction(self, transaction: Dict) -> str:
+        """
+        Add a transaction to the mempool.
+
+        Args:
+            transaction: Transaction payload (must include "type")
+
+        Returns:
+            Transaction hash
+        """
+        self._rpc()
+        tx_hash = self.transaction_hash(transaction)
+        with self._lock:
+            if tx_hash in self._mempool or tx_hash in self._tx_heights:
+                return tx_hash
+            if len(self._mempool) >= self.mempool_limit:
+                raise MempoolFullError(f"Mempool full ({self.mempool_limit} transactions)")
+            self._mempool[tx_hash] = transaction
+        return tx_hash
+
+    def get_transaction_statuses(self, tx_hashes: List[str], required_confirmations: int = 1) -> Dict[str, Dict]:
+        """
+        Get the status of many transactions.
+
+        Args:
+            tx_hashes: Transaction hashes
+            required_confirmations: Confirmations needed to report "confirmed"
+
+        Returns:
+            Mapping of tx hash -> {"status", "confirmations", "height"}
+        """
+        self._rpc()
+        statuses = {}
+        with self._lock:
+            tip = self.blocks[-1].height
+            for tx_hash in tx_hashes:
+                if tx_hash in self._failed:
+                    statuses[tx_hash] = {"status": "failed", "confirmations": 0, "error": self._failed[tx_hash]}
+                elif tx_hash in self._tx_heights:
+                    height = self._tx_heights[tx_hash]
+                    confirmations = tip - height + 1
+                    statuses[tx_hash] = {
+                        "status": "confirmed" if confirmations >= required_confirmations else "pending",
+                        "confirmations": confirmations,
+                        "height": height
+                    }
+                elif tx_hash in self._mempool:
+                    statuses[tx_hash] = {"status": "pending", "confirmations": 0}
+                else:
+                    statuses[tx_hash] = {"status": "unknown", "confirmations": 0}
+        return statuses
+
+    def get_balance(self, address: str) -> int:
+        """Get the balance of an address."""
+        self._rpc()
+        with self._lock:
+            return self._balances.get(address, self.initial_balance)
+
+    def get_account(self, address: str) -> Dict:
+        """Get balance, next nonce and current tick for an address."""
+        self._rpc()
+        with self._lock:
+            return {
+                "address": address,
+                "balance": self._balances.get(address, self.initial_balance),
+                "nonce": self._nonces.get(address, 0),
+                "tick": self.blocks[-1].height
+            }
+
+    def get_tick(self) -> int:
+        """Get the current tip height."""
+        self._rpc()
+        with self._lock:
+            return self.blocks[-1].height
+
+    def get_blocks(self, from_height: int, limit: int = 100) -> List[Dict]:
+        """
+        Get consecutive blocks starting at a height.
+
+        Args:
+            from_height: First block height to return
+            limit: Maximum number of blocks
+
+        Returns:
+            List of block dictionaries
+        """
+        self._rpc()
+        with self._lock:
+            return [asdict(block) for block in self.blocks[max(from_height, 0):max(from_height, 0) + limit]]
+
+    # Block production
+
+    def mine_block(self) -> Block:
+        """Include pending transactions in a new block and apply them."""
+        with self._lock:
+            parent = self.blocks[-1]
+            height = parent.height + 1
+            included = []
+            events = []
+            while self._mempool and len(included) < self.max_txs_per_block:
+                tx_hash, transaction = self._mempool.popitem(last=False)
+                error = self._apply(transaction, tx_hash, height, events)
+                if error:
+                    self._failed[tx_hash] = error
+                    continue
+                included.append(tx_hash)
+                self._tx_heights[tx_hash] = height
+                self._transactions[tx_hash] = transaction
+
+            # The reorg count makes blocks on a new fork hash differently
+            block_hash = hashlib.sha256(
+                f"{parent.hash}:{height}:{self.reorgs}:{','.join(included)}".encode()
+            ).hexdigest()
+            block = Block(height, block_hash, parent.hash, time.time(), included, events)
+            self.blocks.append(block)
+            return block
+
+    def reorg(self, depth: int, drop_transactions: bool = False) -> int:
+        """
+        Discard the newest blocks, as if a competing fork had won.
+
+        Transactions from discarded blocks return to the front of the
+        mempool (or are forgotten with drop_transactions) and are included
+        again by the next blocks, which hash differently from the originals.
+
+        Args:
+            depth: Number of blocks to discard (the genesis block is kept)
+            drop_transactions: Forget the discarded transactions entirely
+
+        Returns:
+            New tip height
+        """
+        with self._lock:
+            depth = max(0, min(depth, len(self.blocks) - 1))
+            if not depth:
+                return self.blocks[-1].height
+            discarded = self.blocks[-depth:]
+            del self.blocks[-depth:]
+            self.reorgs += 1
+
+            returned = OrderedDict()
+            for block in discarded:
+                for tx_hash in block.tx_hashes:
+                    self._tx_heights.pop(tx_hash, None)
+                    transaction = self._transactions.pop(tx_hash)
+                    if not drop_transactions:
+                        returned[tx_hash] = transaction
+            returned.update(self._mempool)
+            self._mempool = returned
+
+            # Rebuild ownership and nonces from the surviving chain
+            self._owners.clear()
+            self._nonces.clear()
+            for block in self.blocks:
+                for tx_hash in block.tx_hashes:
+                    self._apply(self._transactions[tx_hash], tx_hash, block.height, [])
+            return self.blocks[-1].height
+
+    def _apply(self, transaction: Dict, tx_hash: str, height: int, events: List[Dict]) -> Optional[str]:
+        """Apply a transaction's state changes; return an error message on failure."""
+        tx_type = transaction.get("type")
+        sender = transaction.get("from") or transaction.get("owner")
+        if sender:
+            self._nonces[sender] = self._nonces.get(sender, 0) + 1
+
+        if tx_type == "NFT_MINT_BATCH":
+            for mint in transaction.get("mints", []):
+                self._owners[mint["token_id"]] = mint["owner"]
+                score = next(
+                    (a["value"] for a in mint.get("metadata", {}).get("attributes", []) if a.get("trait_type") == "Score"),
+                    0
+                )
+                events.append({
+                    "event": "NFTMinted",
+                    "owner": mint["owner"],
+                    "token_id": mint["token_id"],
+                    "score": score,
+                    "metadata": mint.get("metadata", {}),
+                    "metadata_uri": mint.get("metadata_uri", ""),
+                    "height": height,
+                    "tx_hash": tx_hash
+                })
+            return None
+
+        if tx_type == "NFT_TRANSFER":
+            token_id = transaction.get("token_id")
+            if self._owners.get(token_id, transaction.get("from")) != transaction.get("from"):
+                return "Not the owner"
+            self._owners[token_id] = transaction.get("to")
+            events.append({
+                "event": "Transfer",
+                "token_id": token_id,
+                "from": transaction.get("from"),
+                "to": transaction.get("to"),
+                "height": height,
+                "tx_hash": tx_hash
+            })
+            return None
+
+        if tx_type == "SCORE_UPDATE":
+            events.append({
+                "event": "ScoreUpdated",
+                "token_id": transaction.get("token_id"),
+                "score": transaction.get("score"),
+                "height": height,
+                "tx_hash": tx_hash
+            })
+            return None
+
+        if tx_type == "CONTRACT_DEPLOY":
+            events.append({
+                "event": "ContractDeployed",
+                "contract_name": transaction.get("contract_name"),
+                "owner": transaction.get("owner"),
+                "height": height,
+                "tx_hash": tx_hash
+            })
+            return None
+
+        return None
+
+    def status(self) -> Dict:
+        """Return node counters."""
+        with self._lock:
+            return {
+                "height": self.blocks[-1].height,
+                "mempool_size": len(self._mempool),
+                "mempool_limit": self.mempool_limit,
+                "included_transactions": len(self._tx_heights),
+                "failed_transactions": len(self._failed),
+                "rpc_calls": self.rpc_calls,
+                "rpc_failures": self.rpc_failures,
+                "reorgs": self.reorgs,
+                "block_time": self.block_time
+            }
+
+
+def create_node_app(node: SimulatedQubicNode):
+    """
+    Create an HTTP API for a simulated node.
+
+    Args:
+        node: Node to expose
+
+    Returns:
+        FastAPI application
+    """
+    import asyncio
+    from fastapi import FastAPI, HTTPException
+    from pydantic import BaseModel
+
+    app = FastAPI(title="Simulated Qubic Node")
+
+    class StatusQuery(BaseModel):
+        tx_hashes: List[str]
+        required_confirmations: int = 1
+
+    async def call(fn, *args):
+        try:
+            return await asyncio.to_thread(fn, *args)
+        except MempoolFullError as e:
+            raise HTTPException(status_code=429, detail=str(e))
+        except NodeError as e:
+            raise HTTPException(status_code=503, detail=str(e))
+
+    @app.post("/tx")
+    async def submit(transaction: Dict):
+        return {"tx_hash": await call(node.submit_transaction, transaction)}
+
+    @app.post("/tx/status")
+    async def statuses(query: StatusQuery):
+        return await call(node.get_transaction_statuses, query.tx_hashes, query.required_confirmations)
+
+    @app.get("/accounts/{address}")
+    async def account(address: str):
+        return await call(node.get_account, address)
+
+    @app.get("/balance/{address}")
+    async def balance(address: str):
+        return {"address": address, "balance": await call(node.get_balance, address)}
+
+    @app.get("/tick")
+    async def tick():
+        return {"tick": await call(node.get_tick)}
+
+    @app.get("/blocks")
+    async def blocks(from_height: int = 0, limit: int = 100):
+        return await call(node.get_blocks, from_height, min(limit, 1000))
+
+    @app.post("/reorg")
+    async def reorg(depth: int = 1, drop_transactions: bool = False):
+        return {"tick": node.reorg(depth, drop_transactions)}
+
+    @app.get("/status")
+    async def status():
+        return node.status()
+
+    return app
+
+
+if __name__ == "__main__":
+    import argparse
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run a simulated Qubic node")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8999)
+    parser.add_argument("--block-time", type=float, default=1.0)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Median RPC latency")
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--mempool-limit", type=int, default=10000)
+    parser.add_argument("--max-txs-per-block", type=int, default=1000)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    sim = SimulatedQubicNode(
+        block_time=args.block_time,
+        latency=LatencyModel(args.latency_ms, args.latency_sigma),
+        failure_rate=args.failure_rate,
+        mempool_limit=args.mempool_limit,
+        max_txs_per_block=args.max_txs_per_block,
+        seed=args.seed
+    ).start()
+    uvicorn.run(create_node_app(sim), host=args.host, port=args.port)
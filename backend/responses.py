@@ -0,0 +1,146 @@
+"""
+Responses
+
+Fast JSON encoding and response compression for the API.
+
+- FastJSONResponse is the app's default response class. It encodes with
+  orjson when installed (several times faster than the standard library on
+  the large activity payloads) and falls back to compact json.dumps
+- Endpoints with large payloads declare a Pydantic response_model, so
+  FastAPI serializes their return values with the model's compiled
+  pydantic-core serializer instead of walking them with jsonable_encoder
+- CompressionMiddleware compresses complete responses above
+  COMPRESSION_MIN_SIZE with brotli (when installed and accepted by the
+  client) or gzip. Streaming and already-encoded responses pass through
+"""
+
+import gzip
+import json
+import os
+from typing import Any, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() in ("1", "true", "yes")
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1400"))  # ~one TCP segment
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "5"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "4"))
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode a JSON-compatible value.
+
+    Args:
+        content: Value to encode (dicts may have non-string keys)
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson when available."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick a content encoding the client accepts.
+
+    Args:
+        accept_encoding: Accept-Encoding request header
+
+    Returns:
+        "br", "gzip" or None
+    """
+    accepted = {
+        part.split(";", 1)[0].strip().lower()
+        for part in accept_encoding.split(",")
+        if not part.strip().endswith(";q=0")
+    }
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a body with the given content encoding."""
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses above a size threshold.
+
+    Only single-message bodies are compressed (every JSON and metadata
+    response); streamed bodies are forwarded unchanged so nothing is
+    buffered.
+    """
+
+    def __init__(self, app, min_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.min_size = min_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+
+        async def send_wrapper(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                # Hold the headers until the body shows whether to compress
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=list(start.get("headers", [])))
+            if (
+                not message.get("more_body", False)
+                and len(body) >= self.min_size
+                and "content-encoding" not in headers
+                and headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+            ):
+                body = compress(body, encoding)
+                headers["content-encoding"] = encoding
+                headers["content-length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+                message = {**message, "body": body}
+            await send({**start, "headers": headers.raw})
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -10,29 +10,28 @@ Score Components:
 - Issues: Community engagement and bug reporting
 - Discord Messages: Community participation
 
-The maximum score is capped at 1000.
+Weights, per-category caps (to prevent gaming) and the total cap (1000 by
+default) come from config.settings.scoring and can be reloaded at runtime.
+WEIGHTS, MAX_SCORES and MAX_TOTAL_SCORE remain as read-only aliases of the
+settings in effect.
 """
 
-from typing import Dict
+from typing import Any, Dict
 
-# Scoring weights
-WEIGHTS = {
-    "commit": 2,           # Each commit is worth 2 points
-    "pull_request": 5,     # PRs are worth more due to code review value
-    "issue": 3,            # Issues show community engagement
-    "discord_message": 0.5 # Community participation (capped contribution)
-}
+import config
 
-# Maximum scores per category (to prevent gaming)
-MAX_SCORES = {
-    "commits": 400,        # Max 200 commits at 2 points each
-    "pull_requests": 250,  # Max 50 PRs at 5 points each
-    "issues": 150,         # Max 50 issues at 3 points each
-    "discord": 200,        # Max 400 messages at 0.5 points each
+# Module attributes resolved from config.settings.scoring on every access
+_SCORING_ALIASES = {
+    "WEIGHTS": "weights",
+    "MAX_SCORES": "max_scores",
+    "MAX_TOTAL_SCORE": "max_total"
 }
 
-# Total maximum score
-MAX_TOTAL_SCORE = 1000
+
+def __getattr__(name: str) -> Any:
+    if name in _SCORING_ALIASES:
+        return getattr(config.settings.scoring, _SCORING_ALIASES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def calculate_devscore(
@@ -51,19 +50,9 @@ def calculate_devscore(
         discord_messages: Number of Discord messages
     
     Returns:
-        Integer score between 0 and 1000
+        Integer score between 0 and the configured maximum (1000)
     """
-    # Calculate raw scores
-    commit_score = min(commits * WEIGHTS["commit"], MAX_SCORES["commits"])
-    pr_score = min(pull_requests * WEIGHTS["pull_request"], MAX_SCORES["pull_requests"])
-    issue_score = min(issues * WEIGHTS["issue"], MAX_SCORES["issues"])
-    discord_score = min(discord_messages * WEIGHTS["discord_message"], MAX_SCORES["discord"])
-    
-    # Sum all scores
-    total_score = commit_score + pr_score + issue_score + discord_score
-    
-    # Cap at maximum
-    return min(int(total_score), MAX_TOTAL_SCORE)
+    return get_score_breakdown(commits, pull_requests, issues, discord_messages)["total"]
 
 
 def get_score_breakdown(
@@ -84,12 +73,15 @@ def get_score_breakdown(
     Returns:
         Dictionary with score breakdown by category
     """
-    commit_score = min(commits * WEIGHTS["commit"], MAX_SCORES["commits"])
-    pr_score = min(pull_requests * WEIGHTS["pull_request"], MAX_SCORES["pull_requests"])
-    issue_score = min(issues * WEIGHTS["issue"], MAX_SCORES["issues"])
-    discord_score = min(discord_messages * WEIGHTS["discord_message"], MAX_SCORES["discord"])
+    # One snapshot, so a concurrent reload cannot mix old and new weights
+    scoring = config.settings.scoring
+    weights, max_scores = scoring.weights, scoring.max_scores
+    commit_score = min(commits * weights["commit"], max_scores["commits"])
+    pr_score = min(pull_requests * weights["pull_request"], max_scores["pull_requests"])
+    issue_score = min(issues * weights["issue"], max_scores["issues"])
+    discord_score = min(discord_messages * weights["discord_message"], max_scores["discord"])
     
-    total = min(int(commit_score + pr_score + issue_score + discord_score), MAX_TOTAL_SCORE)
+    total = min(int(commit_score + pr_score + issue_score + discord_score), scoring.max_total)
     
     return {
         "commits": int(commit_score),
@@ -0,0 +1,159 @@
+"""
+Production Launcher
+
+Runs the API with several worker processes, sized to the CPUs the process
+may actually use.
+
+Run from the backend directory:
+    python serve.py                 # one worker per available CPU
+    python serve.py --workers 4 --port 8080
+
+- Worker count: --workers, else WEB_CONCURRENCY, else cpu_count(), which
+  honours CPU affinity and cgroup (container) CPU limits
+- gunicorn with uvicorn workers when gunicorn is installed (restarts
+  crashed workers; SIGHUP reloads settings in every worker), otherwise
+  uvicorn's own process manager
+- With more than one worker, SHARED_STATE_PATH defaults to a file in
+  /dev/shm, so the workers share caches, locks and nonce counters (see
+  shared_state.py)
+"""
+
+import argparse
+import logging
+import math
+import multiprocessing
+import os
+import signal
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+BACKEND_DIR = Path(__file__).resolve().parent
+
+logger = logging.getLogger(__name__)
+
+
+def _cgroup_cpu_limit() -> Optional[float]:
+    """CPU quota of this container in CPUs (cgroup v2, then v1), or None if unlimited."""
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()[:2]
+        if quota != "max":
+            return int(quota) / int(period)
+        return None
+    except (OSError, ValueError):
+        pass
+    try:
+        quota = int(Path("/sys/fs/cgroup/cpu/cpu.cfs_quota_us").read_text())
+        period = int(Path("/sys/fs/cgroup/cpu/cpu.cfs_period_us").read_text())
+        if quota > 0 and period > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def cpu_count() -> int:
+    """
+    Number of CPUs this process can use.
+
+    Returns:
+        Smallest of the CPU affinity mask and the cgroup quota (rounded up), at least 1
+    """
+    try:
+        available = len(os.sched_getaffinity(0))
+    except AttributeError:
+        # No affinity API (macOS, Windows)
+        available = os.cpu_count() or 1
+    limit = _cgroup_cpu_limit()
+    if limit is not None:
+        available = min(available, math.ceil(limit))
+    return max(available, 1)
+
+
+def _default_shared_state_path(port: int) -> str:
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(directory, f"devscore-shared-{port}.db")
+
+
+def _run_gunicorn(host: str, port: int, workers: int) -> None:
+    from gunicorn.app.base import BaseApplication
+
+    class Application(BaseApplication):
+        def load_config(self):
+            self.cfg.set("bind", f"{host}:{port}")
+            self.cfg.set("workers", workers)
+            self.cfg.set("worker_class", "uvicorn.workers.UvicornWorker")
+            self.cfg.set("chdir", str(BACKEND_DIR))
+            # Workers import the app themselves: no state shared by fork
+            self.cfg.set("preload_app", False)
+            # Let mint queues flush before a worker is killed
+            self.cfg.set("graceful_timeout", 30)
+
+        def load(self):
+            from main import app
+            return app
+
+    Application().run()
+
+
+def _run_uvicorn(host: str, port: int, workers: int) -> None:
+    import uvicorn
+
+    if workers > 1:
+        # uvicorn's supervisor does not handle SIGHUP; pass it on so every
+        # worker reloads its settings
+        def forward(signum, frame):
+            for child in multiprocessing.active_children():
+                os.kill(child.pid, signum)
+
+        signal.signal(signal.SIGHUP, forward)
+    uvicorn.run("main:app", host=host, port=port, workers=workers, app_dir=str(BACKEND_DIR))
+
+
+def serve(host: Optional[str] = None, port: Optional[int] = None, workers: Optional[int] = None) -> None:
+    """
+    Start the API server.
+
+    Args:
+        host: Bind address (default: HOST)
+        port: Bind port (default: PORT)
+        workers: Worker processes (default: WEB_CONCURRENCY, else cpu_count())
+    """
+    import config
+
+    server = config.settings.server
+    host = host or server.host
+    port = port or server.port
+    workers = workers or server.workers or cpu_count()
+
+    if workers > 1 and not server.shared_state_path:
+        # Inherited by spawned workers; forked (gunicorn) workers inherit
+        # the rebuilt settings
+        os.environ["SHARED_STATE_PATH"] = _default_shared_state_path(port)
+        config.settings = config.Settings.from_env()
+    logger.info(
+        "Starting %d worker(s) on %s:%d (shared state: %s)",
+        workers, host, port, os.environ.get("SHARED_STATE_PATH", "none")
+    )
+
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        _run_uvicorn(host, port, workers)
+    else:
+        _run_gunicorn(host, port, workers)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the DevScore API with multiple workers")
+    parser.add_argument("--host", help="Bind address (default: HOST or 0.0.0.0)")
+    parser.add_argument("--port", type=int, help="Bind port (default: PORT or 8000)")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: WEB_CONCURRENCY or one per CPU)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+    serve(args.host, args.port, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,439 @@
+"""
+Shared Worker State
+
+Cross-process state for running the API with several worker processes on
+one host (see serve.py), kept in a single SQLite file (SHARED_STATE_PATH)
+that every worker opens. Point it at tmpfs (e.g. /dev/shm) to keep it in
+memory; swap this module for Redis when workers span hosts.
+
+- get() / set() / scan(): TTL key-value cache of JSON values, so a result
+  loaded by one worker is served by all of them
+- load_once(): single-flight across workers; one worker loads a missing
+  key while the others wait for its result (or load it themselves if it
+  takes too long)
+- lock(): named async lock with a lease that the holder renews while it
+  runs, so a crashed holder never blocks the others for longer than the
+  lease, however long a live holder takes
+- Leadership: renewable lease for background jobs that must run once per
+  host (chain indexer, transaction status polling)
+- reserve_nonce(): atomic per-address nonce counter, so transactions signed
+  in different workers never reuse a nonce
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional
+
+import responses
+
+logger = logging.getLogger(__name__)
+
+# Seconds a lock or lease is held without renewal before others may take it
+LOCK_LEASE_SECONDS = 30.0
+# Seconds load_once() waits for another worker's load before loading itself
+LOAD_TIMEOUT_SECONDS = 60.0
+# Expired cache rows are purged once every this many writes
+_PURGE_EVERY = 1000
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS cache (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL,
+        expires_at REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS locks (
+        name TEXT PRIMARY KEY,
+        owner TEXT NOT NULL,
+        expires_at REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS nonces (
+        address TEXT PRIMARY KEY,
+        next_nonce INTEGER NOT NULL
+    );
+"""
+
+
+class LockTimeoutError(Exception):
+    """Raised when a shared lock could not be acquired in time."""
+
+
+def key_string(key: Hashable) -> str:
+    """
+    Stable string form of a cache key, identical in every process.
+
+    Tuples, lists and (frozen)sets are rendered element by element, sets in
+    sorted order (their iteration order depends on the per-process hash seed).
+    """
+    if isinstance(key, (set, frozenset)):
+        return "{" + ",".join(sorted(key_string(item) for item in key)) + "}"
+    if isinstance(key, (tuple, list)):
+        return "(" + ",".join(key_string(item) for item in key) + ")"
+    return json.dumps(key)
+
+
+class SharedState:
+    """SQLite-backed cache, locks and counters shared by the workers of a host."""
+
+    def __init__(self, path: str, owner: Optional[str] = None):
+        """
+        Initialize the shared state (creating the file if needed).
+
+        Args:
+            path: SQLite file shared by all workers
+            owner: Identity of this process in locks (default: host:pid:random)
+        """
+        self.path = path
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._local = threading.local()
+        self._writes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.lock_waits = 0
+
+        conn = self._conn()
+        # WAL: readers never block the writer; synchronous=NORMAL is enough
+        # for data that can always be reloaded
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        """This thread's connection (autocommit; explicit BEGIN IMMEDIATE for read-modify-write)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # Cache
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key (see key_string)
+
+        Returns:
+            Decoded value, or None on miss or expiry
+        """
+        row = self._conn().execute(
+            "SELECT value FROM cache WHERE key = ? AND expires_at > ?",
+            (key_string(key), time.time())
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """
+        Store a JSON-serializable value for `ttl` seconds.
+
+        Args:
+            key: Cache key (see key_string)
+            value: Value to store
+            ttl: Time-to-live in seconds
+        """
+        now = time.time()
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key_string(key), responses.dumps(value).decode(), now + ttl)
+        )
+        self._writes += 1
+        if self._writes % _PURGE_EVERY == 0:
+            conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+
+    def scan(self, namespace: str) -> List[Any]:
+        """
+        Get every live cached value whose key is a tuple starting with `namespace`.
+
+        Args:
+            namespace: First element of the keys, e.g. "metrics" for ("metrics", pid)
+
+        Returns:
+            Decoded values, in no particular order
+        """
+        prefix = "(" + key_string(namespace) + ","
+        rows = self._conn().execute(
+            "SELECT value FROM cache WHERE substr(key, 1, ?) = ? AND expires_at > ?",
+            (len(prefix), prefix, time.time())
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def delete(self, key: Hashable) -> None:
+        """Remove a cached value."""
+        self._conn().execute("DELETE FROM cache WHERE key = ?", (key_string(key),))
+
+    async def load_once(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: float,
+        timeout: float = LOAD_TIMEOUT_SECONDS
+    ) -> Any:
+        """
+        Get a cached value, loading it in one worker at a time on a miss.
+
+        Workers missing the same key queue on a shared lock; the first runs
+        `loader` and caches the result, the rest find it once they get the
+        lock. Failures are not cached, so the next worker in line retries.
+        A worker that waits longer than `timeout` loads the value itself
+        rather than failing the request.
+
+        Args:
+            key: Cache key (see key_string)
+            loader: Zero-argument coroutine function producing the value
+            ttl: Seconds the loaded value is cached
+            timeout: Maximum seconds to wait for another worker's load
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        value = await asyncio.to_thread(self.get, key)
+        if value is not None:
+            return value
+        try:
+            async with self.lock(f"load:{key_string(key)}", timeout=timeout):
+                return await self._load(key, loader, ttl)
+        except LockTimeoutError:
+            logger.info("Loading %s without the shared lock after waiting %.0fs", key_string(key), timeout)
+            return await self._load(key, loader, ttl)
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: float) -> Any:
+        value = await asyncio.to_thread(self.get, key)
+        if value is None:
+            value = await loader()
+            await asyncio.to_thread(self.set, key, value, ttl)
+        return value
+
+    # Locks and leases
+
+    def try_acquire(self, name: str, lease: float = LOCK_LEASE_SECONDS, owner: Optional[str] = None) -> bool:
+        """
+        Take (or renew, if already held by `owner`) a named lease.
+
+        Args:
+            name: Lock name
+            lease: Seconds until the lock expires unless renewed
+            owner: Holder identity (default: this process)
+
+        Returns:
+            True if `owner` holds the lock
+        """
+        now = time.time()
+        cursor = self._conn().execute(
+            """INSERT INTO locks (name, owner, expires_at) VALUES (?, ?, ?)
+               ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at
+               WHERE locks.owner = excluded.owner OR locks.expires_at <= ?""",
+            (name, owner or self.owner, now + lease, now)
+        )
+        return cursor.rowcount == 1
+
+    def release(self, name: str, owner: Optional[str] = None) -> None:
+        """Release a lock held by `owner` (default: this process)."""
+        self._conn().execute("DELETE FROM locks WHERE name = ? AND owner = ?", (name, owner or self.owner))
+
+    @asynccontextmanager
+    async def lock(
+        self,
+        name: str,
+        timeout: Optional[float] = LOCK_LEASE_SECONDS,
+        lease: float = LOCK_LEASE_SECONDS
+    ) -> AsyncIterator[None]:
+        """
+        Hold a named lock across workers for the duration of the block.
+
+        Waiters poll with backoff (5ms up to 100ms). The holder renews the
+        lease every `lease / 3` seconds while the block runs, so the block
+        may take longer than the lease; the lease only bounds how long a
+        crashed holder blocks the others.
+
+        Args:
+            name: Lock name
+            timeout: Maximum seconds to wait (None: as long as the lock is held)
+            lease: Seconds the lock is held without renewal before others may take it
+
+        Raises:
+            LockTimeoutError: The lock was not acquired within `timeout`
+        """
+        # Unique per acquisition: not re-entrant, even within one process
+        token = f"{self.owner}:{uuid.uuid4().hex[:8]}"
+        deadline = None if timeout is None else time.monotonic() + timeout
+        delay = 0.005
+        while not await asyncio.to_thread(self.try_acquire, name, lease, token):
+            if deadline is not None and time.monotonic() >= deadline:
+                raise LockTimeoutError(f"Timed out waiting for shared lock '{name}'")
+            self.lock_waits += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.1)
+        done = asyncio.Event()
+        heartbeat = asyncio.create_task(self._renew(name, lease, token, done))
+        try:
+            yield
+        finally:
+            # Let an in-progress renewal finish first, so it cannot re-take
+            # the lock after the release
+            done.set()
+            await heartbeat
+            await asyncio.to_thread(self.release, name, token)
+
+    async def _renew(self, name: str, lease: float, token: str, done: asyncio.Event) -> None:
+        """Renew a held lock every `lease / 3` seconds until `done` is set."""
+        while True:
+            try:
+                await asyncio.wait_for(done.wait(), lease / 3)
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                held = await asyncio.to_thread(self.try_acquire, name, lease, token)
+            except Exception as e:
+                logger.warning("Renewing shared lock '%s' failed: %s", name, e)
+                continue
+            if not held:
+                logger.warning("Shared lock '%s' expired before it was renewed", name)
+                return
+
+    # Nonces
+
+    def reserve_nonce(self, address: str, floor: int) -> int:
+        """
+        Reserve the next nonce of an address for this process.
+
+        Args:
+            address: Sending wallet address
+            floor: Next nonce according to the chain (never hand out less)
+
+        Returns:
+            Nonce to put in the transaction
+        """
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT next_nonce FROM nonces WHERE address = ?", (address,)).fetchone()
+            nonce = max(row[0] if row else 0, floor)
+            conn.execute(
+                "INSERT OR REPLACE INTO nonces (address, next_nonce) VALUES (?, ?)",
+                (address, nonce + 1)
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return nonce
+
+    def release_nonce(self, address: str, nonce: int) -> None:
+        """Return a reserved nonce whose transaction was never submitted (most recent only)."""
+        self._conn().execute(
+            "UPDATE nonces SET next_nonce = ? WHERE address = ? AND next_nonce = ?",
+            (nonce, address, nonce + 1)
+        )
+
+    def reset_nonce(self, address: str) -> None:
+        """Forget reservations for an address (the next one starts from the chain)."""
+        self._conn().execute("DELETE FROM nonces WHERE address = ?", (address,))
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache and lock counters of this process."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "lock_waits": self.lock_waits
+        }
+
+
+class Leadership:
+    """
+    Runs callbacks when this worker gains or loses a shared lease.
+
+    Every worker competes for the lease; the holder renews it every
+    `lease / 3` seconds. If it dies, another worker takes over once the
+    lease expires.
+    """
+
+    def __init__(
+        self,
+        state: SharedState,
+        name: str,
+        on_elected: Callable[[], Awaitable[None]],
+        on_demoted: Callable[[], Awaitable[None]],
+        lease: float = 15.0
+    ):
+        """
+        Initialize the election.
+
+        Args:
+            state: Shared state holding the lease
+            name: Lease name
+            on_elected: Called when this worker becomes leader
+            on_demoted: Called when it stops being leader (including on stop())
+            lease: Seconds a leader keeps the lease without renewing
+        """
+        self.state = state
+        self.name = f"leader:{name}"
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.lease = lease
+        self.is_leader = False
+        self.elections = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start competing for the lease."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop competing and hand the lease back."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.is_leader:
+            await self._set_leader(False)
+            await asyncio.to_thread(self.state.release, self.name)
+
+    async def _set_leader(self, leader: bool) -> None:
+        self.is_leader = leader
+        if leader:
+            self.elections += 1
+            logger.info("Worker %s became leader for %s", self.state.owner, self.name)
+            await self.on_elected()
+        else:
+            logger.info("Worker %s is no longer leader for %s", self.state.owner, self.name)
+            await self.on_demoted()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                held = await asyncio.to_thread(self.state.try_acquire, self.name, self.lease)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Treat an unreachable state file as a lost lease
+                logger.warning("Leadership renewal failed: %s", e)
+                held = False
+            if held != self.is_leader:
+                await self._set_leader(held)
+            await asyncio.sleep(self.lease / 3)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return election state."""
+        return {"leader": self.is_leader, "elections": self.elections}
@@ -0,0 +1,212 @@
+"""
+Transaction Signing
+
+Fast, reusable signing for Qubic transactions.
+
+- encode_canonical(): deterministic, compact, type-tagged binary encoding
+  (dict keys sorted), computed once per transaction and used for both the
+  transaction hash and the signature
+- SigningKey: per-wallet key object holding a precomputed keyed-hash
+  (HMAC-SHA256) state; signing a message only copies that state and hashes
+  the message
+- get_signing_key(): LRU cache of key objects, so repeat signers never
+  rebuild their key material
+- sign_batch(): signs many transactions, optionally spread over a process
+  pool for very large batches
+
+This is a placeholder scheme mirroring the rest of the Qubic client; swap
+SigningKey for the Qubic SDK's key type when integrating with the network.
+"""
+
+import hashlib
+import hmac
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+import config
+import metrics
+
+_pack_length = struct.Struct(">I").pack
+_pack_int = struct.Struct(">q").pack
+_pack_float = struct.Struct(">d").pack
+_INT_MIN, _INT_MAX = -(2 ** 63), 2 ** 63 - 1
+
+
+def _encode(value: Any, out: bytearray) -> None:
+    kind = type(value)
+    if kind is str:
+        data = value.encode()
+        out += b"s"
+        out += _pack_length(len(data))
+        out += data
+    elif kind is int:
+        if _INT_MIN <= value <= _INT_MAX:
+            out += b"i"
+            out += _pack_int(value)
+        else:
+            data = value.to_bytes((value.bit_length() + 8) // 8, "big", signed=True)
+            out += b"I"
+            out += _pack_length(len(data))
+            out += data
+    elif kind is dict:
+        out += b"d"
+        out += _pack_length(len(value))
+        for key in sorted(value):
+            if type(key) is not str:
+                raise TypeError(f"Transaction keys must be strings, got {type(key).__name__}")
+            data = key.encode()
+            out += _pack_length(len(data))
+            out += data
+            _encode(value[key], out)
+    elif kind is list or kind is tuple:
+        out += b"l"
+        out += _pack_length(len(value))
+        for item in value:
+            _encode(item, out)
+    elif value is None:
+        out += b"n"
+    elif kind is bool:
+        out += b"t" if value else b"f"
+    elif kind is float:
+        out += b"F"
+        out += _pack_float(value)
+    elif kind is bytes:
+        out += b"b"
+        out += _pack_length(len(value))
+        out += value
+    else:
+        raise TypeError(f"Cannot encode {kind.__name__} in a transaction")
+
+
+def encode_canonical(value: Any) -> bytes:
+    """
+    Encode a transaction (or any JSON-like value) canonically.
+
+    Equal values always produce identical bytes: dict keys are sorted and
+    every value is type-tagged and length-prefixed.
+
+    Args:
+        value: Dict/list/str/int/float/bool/None/bytes structure
+
+    Returns:
+        Encoded bytes
+    """
+    out = bytearray()
+    _encode(value, out)
+    return bytes(out)
+
+
+def transaction_hash(encoded: bytes) -> str:
+    """Hash of an encoded transaction."""
+    return hashlib.sha256(encoded).hexdigest()
+
+
+@dataclass
+class SignedTransaction:
+    """A transaction with its canonical encoding, hash and signature."""
+    transaction: Dict
+    encoded: bytes
+    tx_hash: str
+    signature: str
+
+
+class SigningKey:
+    """Signing key with precomputed keyed-hash state."""
+
+    __slots__ = ("_state",)
+
+    def __init__(self, private_key: str):
+        """
+        Initialize the key.
+
+        Args:
+            private_key: Wallet private key
+        """
+        self._state = hmac.new(private_key.encode(), digestmod=hashlib.sha256)
+
+    def sign(self, message: bytes) -> str:
+        """Sign an encoded message."""
+        state = self._state.copy()
+        state.update(message)
+        return state.hexdigest()
+
+    def sign_transaction(self, transaction: Dict) -> SignedTransaction:
+        """
+        Encode, hash and sign a transaction in one pass.
+
+        Args:
+            transaction: Transaction data
+
+        Returns:
+            SignedTransaction
+        """
+        encoded = encode_canonical(transaction)
+        return SignedTransaction(
+            transaction=transaction,
+            encoded=encoded,
+            tx_hash=transaction_hash(encoded),
+            signature=self.sign(encoded)
+        )
+
+
+# Sized once at import (SIGNING_KEY_CACHE_SIZE is restart-only)
+@lru_cache(maxsize=config.settings.qubic.signing_key_cache_size)
+def get_signing_key(private_key: str) -> SigningKey:
+    """Get the cached key object for a private key."""
+    return SigningKey(private_key)
+
+
+def _sign_chunk(private_key: str, transactions: List[Dict]) -> List[SignedTransaction]:
+    key = get_signing_key(private_key)
+    return [key.sign_transaction(transaction) for transaction in transactions]
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool(processes: int) -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None or _pool._max_workers != processes:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+        _pool = ProcessPoolExecutor(max_workers=processes)
+    return _pool
+
+
+@metrics.timed("signing.sign_batch")
+def sign_batch(
+    private_key: str,
+    transactions: List[Dict],
+    processes: Optional[int] = None,
+    min_pool_batch: Optional[int] = None
+) -> List[SignedTransaction]:
+    """
+    Sign many transactions with one key.
+
+    Args:
+        private_key: Wallet private key
+        transactions: Transactions to sign
+        processes: Worker processes for large batches, 0 signs in-process
+            (default: SIGNING_POOL_PROCESSES)
+        min_pool_batch: Smallest batch worth shipping to the process pool
+            (default: SIGNING_POOL_MIN_BATCH)
+
+    Returns:
+        SignedTransaction per input transaction, in order
+    """
+    settings = config.settings.qubic
+    processes = settings.signing_pool_processes if processes is None else processes
+    min_pool_batch = min_pool_batch or settings.signing_pool_min_batch
+    if processes <= 1 or len(transactions) < min_pool_batch:
+        return _sign_chunk(private_key, transactions)
+
+    chunk_size = -(-len(transactions) // processes)
+    chunks = [transactions[i:i + chunk_size] for i in range(0, len(transactions), chunk_size)]
+    pool = _get_pool(processes)
+    results: List[SignedTransaction] = []
+    for signed in pool.map(_sign_chunk, [private_key] * len(chunks), chunks):
+        results.extend(signed)
+    return results
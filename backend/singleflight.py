@@ -0,0 +1,149 @@
+"""
+Request Coalescing
+
+Single-flight execution for expensive async loads.
+
+- SingleFlight: concurrent callers with the same key await one in-flight call
+- CoalescingCache: SingleFlight plus a short-TTL result cache, so a burst of
+  identical requests costs a single upstream load; with a SharedState the
+  cache and the single-flight extend across worker processes
+"""
+
+import asyncio
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from cache import TTLCache
+
+if TYPE_CHECKING:
+    from shared_state import SharedState
+
+
+class SingleFlight:
+    """Deduplicates concurrent async calls that share a key."""
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run `fn` once per key at a time.
+
+        Callers arriving while a call for the same key is running wait for
+        that call's result (or exception) instead of starting their own.
+        A caller being cancelled does not cancel the shared call.
+
+        Args:
+            key: Deduplication key
+            fn: Zero-argument coroutine function performing the load
+
+        Returns:
+            Result of the shared call
+        """
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        self.calls += 1
+        future = asyncio.ensure_future(fn())
+        self._in_flight[key] = future
+
+        def _forget(_: asyncio.Future) -> None:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+            # Mark the exception as retrieved if every caller was cancelled
+            if not future.cancelled():
+                future.exception()
+
+        future.add_done_callback(_forget)
+        return await asyncio.shield(future)
+
+    @property
+    def in_flight(self) -> int:
+        """Number of keys currently being loaded."""
+        return len(self._in_flight)
+
+
+class CoalescingCache:
+    """Short-TTL cache whose misses are loaded through a SingleFlight."""
+
+    def __init__(
+        self,
+        ttl: float = 30.0,
+        maxsize: int = 256,
+        shared: Optional["SharedState"] = None,
+        namespace: str = ""
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds a successful result is reused
+            maxsize: Maximum number of cached results
+            shared: Cross-worker state; results must then be JSON-serializable
+                and may be served for up to twice `ttl` (shared, then local)
+            namespace: Prefix of this cache's keys in the shared state
+        """
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.flight = SingleFlight()
+        self.shared = shared
+        self.namespace = namespace
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None
+    ) -> Any:
+        """
+        Return a cached result or load it once for all concurrent callers.
+
+        Failures are not cached.
+
+        Args:
+            key: Cache key
+            loader: Zero-argument coroutine function producing the value
+            ttl: Optional TTL override for this value
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        value = self.cache.get(key)
+        if value is not None:
+            return value
+
+        async def load() -> Any:
+            if self.shared is not None:
+                result = await self.shared.load_once(
+                    (self.namespace, key), loader, self.cache.ttl if ttl is None else ttl
+                )
+            else:
+                result = await loader()
+            self.cache.set(key, result, ttl=ttl)
+            return result
+
+        return await self.flight.do(key, load)
+
+    async def peek(self, key: Hashable) -> Optional[Any]:
+        """Return a cached result (local, then shared) without loading it."""
+        value = self.cache.get(key)
+        if value is None and self.shared is not None:
+            value = await asyncio.to_thread(self.shared.get, (self.namespace, key))
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a cached result (in this worker and the shared state)."""
+        self.cache.delete(key)
+        if self.shared is not None:
+            self.shared.delete((self.namespace, key))
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache statistics and coalescing counters."""
+        return {
+            **self.cache.stats(),
+            "loads": self.flight.calls,
+            "coalesced": self.flight.coalesced,
+            "in_flight": self.flight.in_flight
+        }
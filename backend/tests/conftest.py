@@ -0,0 +1,6 @@
+"""Test setup: import backend modules by name, as the app does."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,105 @@
+"""Reorg handling of ChainIndexer."""
+
+import sqlite3
+from contextlib import contextmanager
+
+import pytest
+
+from chain_indexer import ChainIndexer
+from nft_registry import NFTRegistry
+from qubic_node_sim import SimulatedQubicNode
+
+_SCHEMA = """
+    CREATE TABLE nfts (
+        token_id TEXT PRIMARY KEY, owner TEXT NOT NULL, score INTEGER NOT NULL,
+        commits INTEGER DEFAULT 0, pull_requests INTEGER DEFAULT 0, issues INTEGER DEFAULT 0,
+        discord_messages INTEGER DEFAULT 0, minted_at INTEGER, metadata_uri TEXT,
+        transaction_hash TEXT, updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE chain_events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, height INTEGER NOT NULL, block_hash TEXT NOT NULL,
+        log_index INTEGER NOT NULL, event TEXT NOT NULL, token_id TEXT, tx_hash TEXT, data TEXT NOT NULL
+    );
+    CREATE TABLE indexed_blocks (height INTEGER PRIMARY KEY, block_hash TEXT NOT NULL, parent_hash TEXT NOT NULL);
+    CREATE TABLE indexer_checkpoints (
+        name TEXT PRIMARY KEY, height INTEGER NOT NULL, block_hash TEXT,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+"""
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = str(tmp_path / "index.db")
+    with sqlite3.connect(path) as conn:
+        conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def get_db():
+        conn = sqlite3.connect(path)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    return get_db
+
+
+def mint(node: SimulatedQubicNode, token_id: str, owner: str) -> None:
+    node.submit_transaction({
+        "type": "NFT_MINT_BATCH",
+        "mints": [{"token_id": token_id, "owner": owner, "metadata": {"attributes": []}}]
+    })
+    node.mine_block()
+
+
+def sync(indexer: ChainIndexer) -> None:
+    """Index up to the node's tip (a rollback round indexes nothing)."""
+    for _ in range(20):
+        indexer.sync_once()
+        if indexer.checkpoint()[0] == indexer.node.blocks[-1].height:
+            return
+    raise AssertionError("indexer did not reach the tip")
+
+
+def test_reorg_that_drops_a_mint_removes_the_token(db):
+    node = SimulatedQubicNode()
+    registry = NFTRegistry(db)
+    indexer = ChainIndexer(node, registry, db, batch_size=10)
+
+    mint(node, "kept", "alice")
+    mint(node, "orphan", "bob")
+    node.mine_block()
+    sync(indexer)
+    assert registry.get("orphan") is not None
+    assert [nft.token_id for nft in registry.by_owner("bob")] == ["orphan"]
+
+    # The winning fork is one block longer, so the indexer sees a parent mismatch
+    node.reorg(2, drop_transactions=True)
+    for _ in range(3):
+        node.mine_block()
+    sync(indexer)
+
+    assert registry.get("orphan") is None
+    assert registry.by_owner("bob") == []
+    assert registry.get("kept").owner == "alice"
+    assert indexer.reorgs == 1
+    assert indexer.checkpoint() == (node.blocks[-1].height, node.blocks[-1].hash)
+    assert indexer.token_events("orphan") == []
+
+
+def test_rollback_below_the_retained_window_keeps_the_checkpoint(db):
+    node = SimulatedQubicNode()
+    registry = NFTRegistry(db)
+    indexer = ChainIndexer(node, registry, db, batch_size=10, reorg_depth=2)
+
+    mint(node, "early", "alice")
+    for _ in range(5):
+        node.mine_block()
+    sync(indexer)
+
+    # Height 1 is no longer in indexed_blocks; resume from it, not from genesis
+    indexer.rollback(1)
+    assert indexer.checkpoint() == (1, node.blocks[1].hash)
+    assert registry.get("early").owner == "alice"
@@ -0,0 +1,69 @@
+"""IdempotencyStore replay reporting."""
+
+import asyncio
+import sqlite3
+from contextlib import contextmanager
+
+import pytest
+
+from idempotency import IdempotencyConflictError, IdempotencyStore, fingerprint
+
+
+@pytest.fixture
+def store():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("""
+        CREATE TABLE idempotency_keys (
+            key TEXT PRIMARY KEY,
+            request_hash TEXT NOT NULL,
+            response TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    @contextmanager
+    def get_db():
+        yield conn
+
+    yield IdempotencyStore(get_db)
+    conn.close()
+
+
+def test_concurrent_duplicates_are_reported_as_replayed(store):
+    request_hash = fingerprint({"wallet": "A"})
+    calls = 0
+
+    async def mint():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"token_id": 1}
+
+    async def scenario():
+        return await asyncio.gather(*(store.run("mint-nft", "k", request_hash, mint) for _ in range(3)))
+
+    results = asyncio.run(scenario())
+
+    assert calls == 1
+    assert [replayed for _, replayed in results] == [False, True, True]
+    assert all(response == {"token_id": 1} for response, _ in results)
+    assert store.stats()["replayed"] == 2
+
+
+def test_concurrent_duplicate_with_another_body_conflicts(store):
+    async def mint():
+        await asyncio.sleep(0.01)
+        return {"token_id": 1}
+
+    async def scenario():
+        return await asyncio.gather(
+            store.run("mint-nft", "k", fingerprint({"wallet": "A"}), mint),
+            store.run("mint-nft", "k", fingerprint({"wallet": "B"}), mint),
+            return_exceptions=True
+        )
+
+    first, second = asyncio.run(scenario())
+
+    assert first == ({"token_id": 1}, False)
+    assert isinstance(second, IdempotencyConflictError)
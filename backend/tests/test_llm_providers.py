@@ -0,0 +1,70 @@
+"""Circuit breaker bookkeeping of LLMProvider.complete."""
+
+import asyncio
+
+from circuit_breaker import CircuitOpenError, CircuitState
+from llm_providers import Completion, LLMProvider
+
+
+class SlowProvider(LLMProvider):
+    name = "slow"
+    default_model = "slow-model"
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.started = asyncio.Event()
+
+    async def _complete(self, messages, max_tokens, temperature, activity_data):
+        self.started.set()
+        await asyncio.sleep(60)
+        return Completion(text="", provider=self.name, model=self.model)
+
+
+def half_open(provider: LLMProvider) -> None:
+    provider.breaker.open_seconds = 0.0
+    provider.breaker._open()
+    assert provider.breaker.state is CircuitState.HALF_OPEN
+
+
+def test_cancelled_half_open_probe_frees_its_slot():
+    async def scenario():
+        provider = SlowProvider(max_concurrency=1)
+        half_open(provider)
+
+        probe = asyncio.ensure_future(provider.complete([], max_tokens=10))
+        await provider.started.wait()
+        # The only probe slot is taken
+        try:
+            await provider.complete([], max_tokens=10)
+        except CircuitOpenError:
+            pass
+        else:
+            raise AssertionError("second probe was admitted")
+
+        probe.cancel()
+        await asyncio.gather(probe, return_exceptions=True)
+        assert provider.breaker.state is CircuitState.HALF_OPEN
+        assert provider.breaker.allow_request()
+
+    asyncio.run(scenario())
+
+
+def test_probe_cancelled_while_queued_frees_its_slot():
+    async def scenario():
+        provider = SlowProvider(max_concurrency=1)
+        busy = asyncio.ensure_future(provider.complete([], max_tokens=10))
+        await provider.started.wait()
+
+        half_open(provider)
+        queued = asyncio.ensure_future(provider.complete([], max_tokens=10))
+        await asyncio.sleep(0)
+        assert provider.status()["waiting"] == 1
+
+        queued.cancel()
+        await asyncio.gather(queued, return_exceptions=True)
+        assert provider.breaker.allow_request()
+
+        busy.cancel()
+        await asyncio.gather(busy, return_exceptions=True)
+
+    asyncio.run(scenario())
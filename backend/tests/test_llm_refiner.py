@@ -0,0 +1,37 @@
+"""LLMRefiner with the extractive local model."""
+
+import asyncio
+
+import llm_refiner
+from llm_providers import LocalModelProvider
+from llm_refiner import LLMRefiner
+
+
+ACTIVITY = {
+    "username": "octocat",
+    "user_info": {"name": "The Octocat", "followers": 12},
+    "summary": {
+        "total_commits": 42,
+        "total_prs": 7,
+        "total_issues": 3,
+        "public_repos": 5,
+        "time_period": "last 30 days"
+    },
+    "activity": {
+        "commits": {
+            "by_repository": {"octocat/hello-world": {"count": 42}},
+            "language_breakdown": {"Python": 30, "Go": 12}
+        }
+    }
+}
+
+
+def test_local_description_uses_the_real_counts():
+    llm_refiner.refinement_cache.clear()
+    refiner = LLMRefiner(provider=LocalModelProvider())
+
+    enhanced = asyncio.run(refiner.enhance_activity_data(ACTIVITY, premium=True))
+
+    description = enhanced["refined"]["description"]
+    assert description.startswith("The Octocat is ")
+    assert "42 commits and 7 pull requests" in description
@@ -0,0 +1,40 @@
+"""Merging the metrics of several workers into one scrape."""
+
+from metrics import Counter, Histogram, Registry
+from shared_state import SharedState
+
+
+def worker_registry(worker: str, requests: int) -> Registry:
+    registry = Registry()
+    registry.worker = worker
+    counter = Counter("requests_total", "Requests served", registry=registry)
+    counter.inc(requests)
+    Histogram("latency_seconds", "Latency", ["route"], buckets=(0.1,), registry=registry).labels("/a").observe(0.05)
+    registry.register_stats("queue", lambda: {"depth": requests})
+    return registry
+
+
+def test_workers_are_merged_per_family(tmp_path):
+    state = SharedState(str(tmp_path / "shared.db"))
+    first, second = worker_registry("1", 3), worker_registry("2", 4)
+    state.set(("metrics", "2"), {"worker": "2", "families": second.families()}, ttl=60)
+
+    text = first.render(snapshot["families"] for snapshot in state.scan("metrics"))
+    lines = text.splitlines()
+
+    for name in ("requests_total", "latency_seconds", "devscore_queue_depth"):
+        assert sum(line.startswith(f"# TYPE {name} ") for line in lines) == 1
+    assert 'requests_total{worker="1"} 3' in lines
+    assert 'requests_total{worker="2"} 4' in lines
+    assert 'latency_seconds_bucket{route="/a",worker="2",le="0.1"} 1' in lines
+    assert 'devscore_queue_depth{worker="2"} 4' in lines
+    # Samples of a family directly follow its header
+    type_line = lines.index("# TYPE requests_total counter")
+    assert lines[type_line + 1:type_line + 3] == ['requests_total{worker="1"} 3', 'requests_total{worker="2"} 4']
+
+
+def test_single_worker_output_is_unlabelled():
+    registry = worker_registry("1", 3)
+    registry.worker = None
+
+    assert "requests_total 3" in registry.render().splitlines()
@@ -0,0 +1,69 @@
+"""Shared locks held longer than their lease."""
+
+import asyncio
+
+import pytest
+
+from shared_state import SharedState, key_string
+
+
+@pytest.fixture
+def workers(tmp_path):
+    path = str(tmp_path / "shared.db")
+    return SharedState(path, owner="worker-1"), SharedState(path, owner="worker-2")
+
+
+def test_holder_renews_its_lease(workers):
+    first, second = workers
+
+    async def scenario():
+        async with first.lock("job", lease=0.15):
+            await asyncio.sleep(0.5)
+            assert not second.try_acquire("job", lease=0.15)
+        assert second.try_acquire("job", lease=0.15)
+
+    asyncio.run(scenario())
+
+
+def test_waiter_without_timeout_waits_for_a_renewing_holder(workers):
+    first, second = workers
+    order = []
+
+    async def hold():
+        async with first.lock("job", lease=0.15):
+            await asyncio.sleep(0.5)
+            order.append("first")
+
+    async def wait():
+        await asyncio.sleep(0.05)
+        async with second.lock("job", timeout=None, lease=0.15):
+            order.append("second")
+
+    async def scenario():
+        await asyncio.gather(hold(), wait())
+
+    asyncio.run(scenario())
+    assert order == ["first", "second"]
+
+
+def test_load_once_loads_locally_when_the_wait_times_out(workers):
+    first, second = workers
+    key = ("activity", "octocat")
+
+    async def slow_loader():
+        await asyncio.sleep(0.5)
+        return {"from": "first"}
+
+    async def fast_loader():
+        return {"from": "second"}
+
+    async def scenario():
+        loading = asyncio.ensure_future(first.load_once(key, slow_loader, ttl=60))
+        await asyncio.sleep(0.05)
+        assert first.try_acquire(f"load:{key_string(key)}", owner="probe") is False
+        waited = await second.load_once(key, fast_loader, ttl=60, timeout=0.1)
+        return waited, await loading
+
+    waited, loaded = asyncio.run(scenario())
+    assert waited == {"from": "second"}
+    assert loaded == {"from": "first"}
@@ -0,0 +1,589 @@
+"""
+Tracing
+
+Lightweight OpenTelemetry-compatible tracing.
+
+- Spans follow the OpenTelemetry data model (128-bit trace IDs, 64-bit
+  span IDs, kind, attributes, events, links, status) and are exported as
+  OTLP/JSON, so any OpenTelemetry collector, Jaeger or Tempo can ingest them
+- The current span is kept in a contextvar, so it follows asyncio tasks and
+  asyncio.to_thread() calls; background jobs start their own root spans and
+  link to the requests they serve (e.g. mint batches)
+- Incoming W3C `traceparent` headers are continued and outgoing node RPCs
+  carry one
+- Finished spans are queued and exported in batches from a background
+  thread; the request path never waits on the exporter
+
+Configuration:
+- TRACING_EXPORTER: none | file | otlp | console (default: none)
+- TRACING_FILE: JSON-lines file for the file exporter (one OTLP export
+  request per line, readable by the collector's otlpjsonfile receiver)
+- OTEL_EXPORTER_OTLP_ENDPOINT: collector for the otlp exporter
+  (default: http://127.0.0.1:4318, OTLP/HTTP JSON)
+- OTEL_SERVICE_NAME: service.name resource attribute
+- TRACING_SAMPLE_RATIO: fraction of new traces recorded (default: 1.0)
+
+Print the span tree and critical path of traces in a file:
+    python tracing.py traces.jsonl [--trace <trace_id>]
+"""
+
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import Enum
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "none").lower()
+TRACING_FILE = os.getenv("TRACING_FILE", "traces.jsonl")
+OTLP_ENDPOINT = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://127.0.0.1:4318").rstrip("/")
+SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "devscore-api")
+TRACING_SAMPLE_RATIO = float(os.getenv("TRACING_SAMPLE_RATIO", "1.0"))
+TRACING_BATCH_SIZE = int(os.getenv("TRACING_BATCH_SIZE", "512"))
+TRACING_FLUSH_SECONDS = float(os.getenv("TRACING_FLUSH_SECONDS", "2"))
+TRACING_QUEUE_SIZE = int(os.getenv("TRACING_QUEUE_SIZE", "8192"))
+
+# Longest attribute value exported (SQL statements, URLs)
+MAX_ATTRIBUTE_LENGTH = 1024
+
+
+class SpanKind(Enum):
+    """OTLP span kinds."""
+    INTERNAL = 1
+    SERVER = 2
+    CLIENT = 3
+    PRODUCER = 4
+    CONSUMER = 5
+
+
+class SpanContext:
+    """Identifies a span within a trace."""
+
+    __slots__ = ("trace_id", "span_id", "sampled")
+
+    def __init__(self, trace_id: str, span_id: str, sampled: bool = True):
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.sampled = sampled
+
+    def traceparent(self) -> str:
+        """W3C traceparent header value."""
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[SpanContext]:
+    """Parse a W3C traceparent header; None if missing or malformed."""
+    if not header:
+        return None
+    parts = header.strip().split("-")
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        int(parts[1], 16)
+        int(parts[2], 16)
+        flags = int(parts[3][:2], 16)
+    except ValueError:
+        return None
+    if parts[1] == "0" * 32 or parts[2] == "0" * 16:
+        return None
+    return SpanContext(parts[1], parts[2], bool(flags & 1))
+
+
+def _new_id(bits: int) -> str:
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+class Span:
+    """A timed operation within a trace."""
+
+    __slots__ = ("name", "context", "parent_id", "kind", "start_ns", "end_ns",
+                 "attributes", "events", "links", "status_code", "status_message")
+
+    def __init__(
+        self,
+        name: str,
+        context: SpanContext,
+        parent_id: Optional[str] = None,
+        kind: SpanKind = SpanKind.INTERNAL,
+        attributes: Optional[Dict[str, Any]] = None,
+        links: Optional[List[SpanContext]] = None
+    ):
+        self.name = name
+        self.context = context
+        self.parent_id = parent_id
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = dict(attributes) if attributes else {}
+        self.events: List[Dict[str, Any]] = []
+        self.links = links or []
+        self.status_code = 0  # Unset
+        self.status_message = ""
+
+    @property
+    def recording(self) -> bool:
+        return self.context.sampled
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if self.context.sampled:
+            self.attributes[key] = value
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+        if self.context.sampled:
+            self.events.append({"name": name, "time_ns": time.time_ns(), "attributes": attributes or {}})
+
+    def record_exception(self, error: BaseException) -> None:
+        """Mark the span failed and record the exception as an event."""
+        if not self.context.sampled:
+            return
+        self.status_code = 2  # Error
+        self.status_message = str(error)[:MAX_ATTRIBUTE_LENGTH]
+        self.add_event("exception", {
+            "exception.type": type(error).__name__,
+            "exception.message": str(error)
+        })
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """Encode the span as OTLP/JSON."""
+        span = {
+            "traceId": self.context.trace_id,
+            "spanId": self.context.span_id,
+            "name": self.name,
+            "kind": self.kind.value,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": {"code": self.status_code, "message": self.status_message}
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        if self.events:
+            span["events"] = [
+                {"name": e["name"], "timeUnixNano": str(e["time_ns"]), "attributes": _otlp_attributes(e["attributes"])}
+                for e in self.events
+            ]
+        if self.links:
+            span["links"] = [{"traceId": link.trace_id, "spanId": link.span_id} for link in self.links]
+        return span
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)[:MAX_ATTRIBUTE_LENGTH]}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items() if value is not None]
+
+
+# Exporters
+
+class SpanExporter:
+    """Sends a batch of finished spans somewhere."""
+
+    def export(self, spans: List[Span]) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+def export_request(spans: List[Span]) -> Dict[str, Any]:
+    """OTLP ExportTraceServiceRequest for a batch of spans."""
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": _otlp_attributes({"service.name": SERVICE_NAME})},
+            "scopeSpans": [{
+                "scope": {"name": "devscore"},
+                "spans": [span.to_otlp() for span in spans]
+            }]
+        }]
+    }
+
+
+class FileExporter(SpanExporter):
+    """Appends one OTLP/JSON export request per batch to a file."""
+
+    def __init__(self, path: str = TRACING_FILE):
+        self.path = path
+
+    def export(self, spans: List[Span]) -> None:
+        with open(self.path, "a") as f:
+            f.write(json.dumps(export_request(spans), separators=(",", ":")) + "\n")
+
+
+class OTLPHTTPExporter(SpanExporter):
+    """Posts OTLP/JSON to a collector's /v1/traces endpoint."""
+
+    def __init__(self, endpoint: str = OTLP_ENDPOINT, timeout: float = 5.0):
+        self.url = f"{endpoint}/v1/traces"
+        import httpx  # Only needed with TRACING_EXPORTER=otlp
+        self._http = httpx.Client(timeout=timeout)
+
+    def export(self, spans: List[Span]) -> None:
+        self._http.post(self.url, json=export_request(spans)).raise_for_status()
+
+    def close(self) -> None:
+        self._http.close()
+
+
+class ConsoleExporter(SpanExporter):
+    """Prints one line per span (for local debugging)."""
+
+    def export(self, spans: List[Span]) -> None:
+        for span in spans:
+            duration_ms = ((span.end_ns or span.start_ns) - span.start_ns) / 1e6
+            print(f"[trace {span.context.trace_id[:8]}] {span.name} {duration_ms:.2f}ms")
+
+
+class BatchSpanProcessor:
+    """Queues finished spans and exports them in batches on a daemon thread."""
+
+    def __init__(
+        self,
+        exporter: SpanExporter,
+        batch_size: int = TRACING_BATCH_SIZE,
+        flush_seconds: float = TRACING_FLUSH_SECONDS,
+        queue_size: int = TRACING_QUEUE_SIZE
+    ):
+        self.exporter = exporter
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._queue: "queue.Queue[Optional[Span]]" = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.exported = 0
+        self.dropped = 0
+        self.export_errors = 0
+
+    def on_end(self, span: Span) -> None:
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        batch: List[Span] = []
+        deadline = time.monotonic() + self.flush_seconds
+        while True:
+            try:
+                span = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                if span is None:
+                    self._export(batch)
+                    return
+                batch.append(span)
+            except queue.Empty:
+                pass
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                self._export(batch)
+                batch = []
+                deadline = time.monotonic() + self.flush_seconds
+
+    def _export(self, batch: List[Span]) -> None:
+        if not batch:
+            return
+        try:
+            self.exporter.export(batch)
+            self.exported += len(batch)
+        except Exception as e:
+            self.export_errors += 1
+            logger.warning("Span export failed (%d spans dropped): %s", len(batch), e)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Export everything queued and stop the export thread."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+        self.exporter.close()
+
+
+# Tracer
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+# Parent for blocks whose spans should not be recorded (e.g. idle polls)
+_SUPPRESSED = Span("suppressed", SpanContext("0" * 32, "0" * 16, sampled=False))
+
+
+class Tracer:
+    """Creates spans and hands finished ones to the processor."""
+
+    def __init__(self, processor: Optional[BatchSpanProcessor] = None, sample_ratio: float = TRACING_SAMPLE_RATIO):
+        """
+        Initialize the tracer.
+
+        Args:
+            processor: Where finished spans go (None disables tracing)
+            sample_ratio: Fraction of new traces that are recorded
+        """
+        self.processor = processor
+        self.sample_ratio = sample_ratio
+
+    @property
+    def enabled(self) -> bool:
+        return self.processor is not None
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        kind: SpanKind = SpanKind.INTERNAL,
+        attributes: Optional[Dict[str, Any]] = None,
+        links: Optional[List[SpanContext]] = None,
+        parent: Optional[SpanContext] = None,
+        root: bool = False
+    ) -> Iterator[Span]:
+        """
+        Run a block inside a new span.
+
+        Args:
+            name: Span name
+            kind: Span kind (CLIENT for outgoing calls, SERVER for requests)
+            attributes: Initial attributes
+            links: Related spans in other traces (e.g. requests served by a batch)
+            parent: Remote parent (from a traceparent header); defaults to the current span
+            root: Start a new trace even if a span is current
+
+        Yields:
+            The span (non-recording when tracing is off or not sampled)
+        """
+        if self.processor is None:
+            yield _SUPPRESSED
+            return
+
+        if parent is None and not root:
+            current = _current_span.get()
+            parent = current.context if current is not None else None
+
+        if parent is not None:
+            context = SpanContext(parent.trace_id, _new_id(64), parent.sampled)
+        else:
+            context = SpanContext(_new_id(128), _new_id(64), random.random() < self.sample_ratio)
+        span = Span(name, context, parent.span_id if parent is not None else None, kind, attributes, links)
+
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            if context.sampled:
+                span.end_ns = time.time_ns()
+                self.processor.on_end(span)
+
+    @contextmanager
+    def suppressed(self) -> Iterator[None]:
+        """Record no spans inside a block (e.g. the idle check of a poller)."""
+        token = _current_span.set(_SUPPRESSED)
+        try:
+            yield
+        finally:
+            _current_span.reset(token)
+
+    def shutdown(self) -> None:
+        if self.processor is not None:
+            self.processor.shutdown()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return exporter counters."""
+        return {
+            "exporter": TRACING_EXPORTER,
+            "sample_ratio": self.sample_ratio,
+            "exported": self.processor.exported if self.processor else 0,
+            "dropped": self.processor.dropped if self.processor else 0,
+            "export_errors": self.processor.export_errors if self.processor else 0
+        }
+
+
+def _create_tracer() -> Tracer:
+    exporters = {"file": FileExporter, "otlp": OTLPHTTPExporter, "console": ConsoleExporter}
+    if TRACING_EXPORTER not in exporters:
+        return Tracer(None)
+    return Tracer(BatchSpanProcessor(exporters[TRACING_EXPORTER]()))
+
+
+tracer = _create_tracer()
+
+
+def span(name: str, kind: SpanKind = SpanKind.INTERNAL, **kwargs):
+    """Start a span on the process tracer (see Tracer.span)."""
+    return tracer.span(name, kind, **kwargs)
+
+
+def suppressed():
+    """Record no spans inside a block (see Tracer.suppressed)."""
+    return tracer.suppressed()
+
+
+def current_span() -> Optional[Span]:
+    """The active span, if any."""
+    current = _current_span.get()
+    return current if current is not None and current.recording else None
+
+
+def current_context() -> Optional[SpanContext]:
+    """Context of the active span (to link a background job back to it)."""
+    current = current_span()
+    return current.context if current is not None else None
+
+
+def inject(headers: Dict[str, str]) -> Dict[str, str]:
+    """Add a traceparent header for the active span to outgoing request headers."""
+    current = current_span()
+    if current is not None:
+        headers["traceparent"] = current.context.traceparent()
+    return headers
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware opening a SERVER span per request.
+
+    Continues an incoming traceparent and returns the trace ID in the
+    X-Trace-Id response header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        parent = parse_traceparent(headers.get(b"traceparent", b"").decode("latin-1"))
+        with tracer.span(f"{scope['method']} {scope['path']}", SpanKind.SERVER, parent=parent, attributes={
+            "http.method": scope["method"],
+            "http.target": scope["path"]
+        }) as request_span:
+
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start" and request_span.recording:
+                    request_span.set_attribute("http.status_code", message["status"])
+                    if message["status"] >= 500:
+                        request_span.status_code = 2
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"x-trace-id", request_span.context.trace_id.encode())
+                    ]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = scope.get("route")
+                if route is not None:
+                    # Name by route template so traces group by endpoint
+                    request_span.name = f"{scope['method']} {route.path}"
+                    request_span.set_attribute("http.route", route.path)
+
+
+# Trace analysis
+
+def load_spans(path: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Load spans from a file written by FileExporter, grouped by trace ID."""
+    traces: Dict[str, List[Dict[str, Any]]] = {}
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            for resource in json.loads(line).get("resourceSpans", []):
+                for scope in resource.get("scopeSpans", []):
+                    for span in scope.get("spans", []):
+                        traces.setdefault(span["traceId"], []).append(span)
+    return traces
+
+
+def critical_path(spans: List[Dict[str, Any]]) -> List[str]:
+    """
+    Span IDs on the critical path of a trace.
+
+    Starting at the root, repeatedly follow the child that finished last:
+    the work the parent was still waiting on.
+    """
+    children: Dict[Optional[str], List[Dict[str, Any]]] = {}
+    ids = {span["spanId"] for span in spans}
+    for span in spans:
+        parent = span.get("parentSpanId")
+        children.setdefault(parent if parent in ids else None, []).append(span)
+
+    path = []
+    level = children.get(None, [])
+    while level:
+        last = max(level, key=lambda s: int(s["endTimeUnixNano"]))
+        path.append(last["spanId"])
+        level = children.get(last["spanId"], [])
+    return path
+
+
+def format_trace(spans: List[Dict[str, Any]]) -> str:
+    """Render a trace as an indented tree; critical-path spans are marked with *."""
+    on_path = set(critical_path(spans))
+    ids = {span["spanId"] for span in spans}
+    children: Dict[Optional[str], List[Dict[str, Any]]] = {}
+    for span in spans:
+        parent = span.get("parentSpanId")
+        children.setdefault(parent if parent in ids else None, []).append(span)
+    start = min(int(span["startTimeUnixNano"]) for span in spans)
+
+    lines = []
+
+    def walk(span: Dict[str, Any], depth: int) -> None:
+        begin = (int(span["startTimeUnixNano"]) - start) / 1e6
+        duration = (int(span["endTimeUnixNano"]) - int(span["startTimeUnixNano"])) / 1e6
+        marker = "*" if span["spanId"] in on_path else " "
+        error = "  ERROR" if span.get("status", {}).get("code") == 2 else ""
+        lines.append(f"{marker} {begin:>9.2f}ms {duration:>9.2f}ms  {'  ' * depth}{span['name']}{error}")
+        for child in sorted(children.get(span["spanId"], []), key=lambda s: int(s["startTimeUnixNano"])):
+            walk(child, depth + 1)
+
+    for root in sorted(children.get(None, []), key=lambda s: int(s["startTimeUnixNano"])):
+        walk(root, 0)
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Show span trees and critical paths from a trace file")
+    parser.add_argument("path", nargs="?", default=TRACING_FILE)
+    parser.add_argument("--trace", help="Trace ID (prefix) to show; default: the slowest traces")
+    parser.add_argument("--top", type=int, default=3, help="Number of slowest traces to show")
+    args = parser.parse_args()
+
+    traces = load_spans(args.path)
+    if args.trace:
+        selected = [trace_id for trace_id in traces if trace_id.startswith(args.trace)]
+    else:
+        def duration(trace_id: str) -> int:
+            spans = traces[trace_id]
+            return max(int(s["endTimeUnixNano"]) for s in spans) - min(int(s["startTimeUnixNano"]) for s in spans)
+        selected = sorted(traces, key=duration, reverse=True)[:args.top]
+
+    for trace_id in selected:
+        print(f"Trace {trace_id} ({len(traces[trace_id])} spans, * = critical path)")
+        print(format_trace(traces[trace_id]))
+        print()
@@ -0,0 +1,290 @@
+"""
+Transaction Tracker
+
+Tracks submitted Qubic transactions until they are final.
+
+- track(): records a pending transaction and returns immediately
+- A background poller queries the status of many pending transactions per
+  round (one batched status query per `batch_size` hashes) and persists
+  confirmation state in the `transactions` table
+- get() / wait_for(): clients query the current status or wait (long-poll)
+  until the transaction reaches a final state
+- With several workers only the leader polls the node (`polling`); the
+  others watch the table for the transactions their clients wait on
+
+Mint endpoints can therefore respond as soon as a transaction is accepted,
+independent of chain confirmation time.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+import config
+import metrics
+import tracing
+from qubic_client import AsyncQubicClient
+
+logger = logging.getLogger(__name__)
+
+FINAL_STATUSES = ("confirmed", "failed")
+
+
+class TransactionTracker:
+    """Persists and polls the confirmation state of submitted transactions."""
+
+    def __init__(
+        self,
+        client: AsyncQubicClient,
+        db: Callable,
+        poll_interval: Optional[float] = None,
+        batch_size: Optional[int] = None
+    ):
+        """
+        Initialize the tracker.
+
+        Args:
+            client: Async Qubic client used for status queries
+            db: Database connection context manager factory (main.get_db)
+            poll_interval: Seconds between polling rounds
+                (default: config.settings.qubic.tx_poll_interval_seconds)
+            batch_size: Maximum transactions per status query
+                (default: config.settings.qubic.tx_status_batch_size)
+        """
+        self.client = client
+        self.db = db
+        settings = config.settings.qubic
+        self.poll_interval = poll_interval or settings.tx_poll_interval_seconds
+        self.batch_size = batch_size or settings.tx_status_batch_size
+
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        # False: leave node queries to another worker, only wake local waiters
+        self.polling = True
+
+        self.rounds = 0
+        self.status_queries = 0
+
+    async def start(self) -> None:
+        """Start the background poller."""
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background poller."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def track(self, tx_hash: str, kind: str, token_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Start tracking a submitted transaction.
+
+        Args:
+            tx_hash: Transaction hash returned by the chain
+            kind: Transaction type (e.g. "NFT_MINT_BATCH")
+            token_ids: Token IDs affected by the transaction
+
+        Returns:
+            Current status record
+        """
+        await asyncio.to_thread(self._insert, tx_hash, kind, token_ids or [])
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return await self.get(tx_hash)
+
+    def _insert(self, tx_hash: str, kind: str, token_ids: List[str]) -> None:
+        with self.db() as conn:
+            conn.execute(
+                """INSERT OR IGNORE INTO transactions (tx_hash, kind, token_ids, status, network)
+                   VALUES (?, ?, ?, 'pending', ?)""",
+                (tx_hash, kind, json.dumps(token_ids), self.client.network)
+            )
+            conn.commit()
+
+    async def get(self, tx_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the stored status of a transaction.
+
+        Args:
+            tx_hash: Transaction hash
+
+        Returns:
+            Status record or None if the transaction is not tracked
+        """
+        return await asyncio.to_thread(self._select, tx_hash)
+
+    def _select(self, tx_hash: str) -> Optional[Dict[str, Any]]:
+        with self.db() as conn:
+            row = conn.execute(
+                "SELECT * FROM transactions WHERE tx_hash = ?",
+                (tx_hash,)
+            ).fetchone()
+        if not row:
+            return None
+        record = dict(row)
+        record["token_ids"] = json.loads(record["token_ids"] or "[]")
+        return record
+
+    async def wait_for(self, tx_hash: str, timeout: float = 30.0) -> Optional[Dict[str, Any]]:
+        """
+        Wait until a transaction is final or the timeout expires.
+
+        Args:
+            tx_hash: Transaction hash
+            timeout: Maximum seconds to wait
+
+        Returns:
+            Latest status record (final unless the timeout expired), or
+            None if the transaction is not tracked
+        """
+        record = await self.get(tx_hash)
+        if record is None or record["status"] in FINAL_STATUSES:
+            return record
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(tx_hash, []).append(future)
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            waiters = self._waiters.get(tx_hash, [])
+            if future in waiters:
+                waiters.remove(future)
+            if not waiters:
+                self._waiters.pop(tx_hash, None)
+        return await self.get(tx_hash)
+
+    async def _run(self) -> None:
+        """Poll pending transactions until cancelled."""
+        while True:
+            try:
+                if self.polling:
+                    await self.poll_once()
+                elif self._waiters:
+                    await self.watch_waiters()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception("Transaction poller error: %s", e)
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    @metrics.timed("tx_tracker.poll", trace=False)
+    async def poll_once(self) -> int:
+        """
+        Run one polling round over all pending transactions.
+
+        Returns:
+            Number of transactions that reached a final state
+        """
+        # Idle rounds are not traced
+        with tracing.suppressed():
+            pending = await asyncio.to_thread(self._pending_hashes)
+        if not pending:
+            return 0
+
+        self.rounds += 1
+        finalized = 0
+        with tracing.span("tx_tracker.poll", root=True, attributes={"tx.pending": len(pending)}) as span:
+            for start in range(0, len(pending), self.batch_size):
+                batch = pending[start:start + self.batch_size]
+                statuses = await self.client.get_transaction_statuses(batch)
+                self.status_queries += 1
+                updates = await asyncio.to_thread(self._apply_statuses, statuses)
+                for tx_hash, _ in updates:
+                    finalized += 1
+                    self._notify(tx_hash)
+            span.set_attribute("tx.finalized", finalized)
+        return finalized
+
+    async def watch_waiters(self) -> int:
+        """
+        Wake local waiters whose transaction another worker marked final.
+
+        Returns:
+            Number of transactions found final
+        """
+        final = await asyncio.to_thread(self._final_hashes, list(self._waiters))
+        for tx_hash in final:
+            self._notify(tx_hash)
+        return len(final)
+
+    def _final_hashes(self, tx_hashes: List[str]) -> List[str]:
+        final = []
+        with self.db() as conn:
+            for start in range(0, len(tx_hashes), self.batch_size):
+                batch = tx_hashes[start:start + self.batch_size]
+                rows = conn.execute(
+                    f"""SELECT tx_hash FROM transactions
+                        WHERE status IN ('confirmed', 'failed') AND tx_hash IN ({",".join("?" * len(batch))})""",
+                    batch
+                ).fetchall()
+                final.extend(row["tx_hash"] for row in rows)
+        return final
+
+    def _pending_hashes(self) -> List[str]:
+        with self.db() as conn:
+            rows = conn.execute(
+                "SELECT tx_hash FROM transactions WHERE status = 'pending' ORDER BY submitted_at"
+            ).fetchall()
+        return [row["tx_hash"] for row in rows]
+
+    def _apply_statuses(self, statuses: Dict[str, Dict]) -> List[tuple]:
+        """Persist a round of status results; return newly final transactions."""
+        finalized = []
+        with self.db() as conn:
+            for tx_hash, status in statuses.items():
+                state = status.get("status", "pending")
+                if state == "unknown":
+                    # Unknown to the node: fail it once it has been missing too long
+                    cursor = conn.execute(
+                        """UPDATE transactions SET status = 'failed', error = 'dropped from mempool',
+                           updated_at = CURRENT_TIMESTAMP
+                           WHERE tx_hash = ? AND status = 'pending'
+                           AND submitted_at <= datetime('now', ?)""",
+                        (tx_hash, f"-{int(config.settings.qubic.tx_unknown_timeout_seconds)} seconds")
+                    )
+                    if cursor.rowcount:
+                        finalized.append((tx_hash, "failed"))
+                    continue
+                conn.execute(
+                    """UPDATE transactions SET status = ?, confirmations = ?, error = ?,
+                       updated_at = CURRENT_TIMESTAMP,
+                       confirmed_at = CASE WHEN ? = 'confirmed' THEN CURRENT_TIMESTAMP ELSE confirmed_at END
+                       WHERE tx_hash = ?""",
+                    (state, status.get("confirmations", 0), status.get("error"), state, tx_hash)
+                )
+                if state in FINAL_STATUSES:
+                    finalized.append((tx_hash, state))
+            conn.commit()
+        return finalized
+
+    def _notify(self, tx_hash: str) -> None:
+        for future in self._waiters.pop(tx_hash, []):
+            if not future.done():
+                future.set_result(True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return poller counters."""
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "polling": self.polling,
+            "rounds": self.rounds,
+            "status_queries": self.status_queries,
+            "waiters": sum(len(w) for w in self._waiters.values()),
+            "poll_interval": self.poll_interval,
+            "batch_size": self.batch_size
+        }
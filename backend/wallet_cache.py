@@ -0,0 +1,260 @@
+"""
+Wallet Cache
+
+Per-address cache of balance, nonce and tick in front of the Qubic node.
+
+- Reads are served from the cache for `ttl` seconds; concurrent misses for
+  the same address share one node query. At most `maxsize` accounts are
+  kept (least recently used evicted first)
+- A background task refreshes hot addresses before their entries expire,
+  so steady readers never wait on the node. Only internal reads (nonce
+  reservation for signing) mark an address hot; public lookups of
+  arbitrary addresses are cached but never refreshed in the background
+- reserve_nonce() hands out nonces locally, so concurrent transactions from
+  one wallet (e.g. the treasury signing mint bundles) never reuse a nonce;
+  with a `nonce_store` (SharedState) the counter is shared by all workers
+- invalidate() drops the cached balance after a transaction is submitted;
+  reserved nonces are kept
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, Optional
+
+import config
+import tracing
+from cache import TTLCache
+
+if TYPE_CHECKING:
+    from shared_state import SharedState
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AccountState:
+    """Cached on-chain state of an address."""
+    address: str
+    balance: int
+    nonce: int  # Next nonce according to the chain
+    tick: int
+    fetched_at: float
+
+
+class WalletCache:
+    """Balance/nonce cache with background refresh and local nonce reservation."""
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Dict],
+        ttl: Optional[float] = None,
+        refresh_interval: Optional[float] = None,
+        hot_window: Optional[float] = None,
+        maxsize: Optional[int] = None
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            fetch: Blocking function returning {"balance", "nonce", "tick"}
+                for an address (QubicClient.fetch_account)
+            ttl: Seconds a cached account is served
+                (default: WALLET_CACHE_TTL_SECONDS)
+            refresh_interval: Seconds between background refresh rounds
+                (default: WALLET_REFRESH_INTERVAL_SECONDS)
+            hot_window: Hot addresses read this recently are refreshed
+                proactively (default: WALLET_HOT_WINDOW_SECONDS)
+            maxsize: Maximum cached accounts (default: WALLET_CACHE_SIZE)
+        """
+        settings = config.settings.cache
+        self.fetch = fetch
+        self.ttl = settings.wallet_ttl_seconds if ttl is None else ttl
+        self.refresh_interval = refresh_interval or settings.wallet_refresh_interval_seconds
+        self.hot_window = settings.wallet_hot_window_seconds if hot_window is None else hot_window
+
+        # Bounds the number of accounts only; freshness is checked against
+        # fetched_at so a reloaded `ttl` applies to cached entries at once
+        self.cache = TTLCache(maxsize=maxsize or settings.wallet_size, ttl=float("inf"))
+        self._last_read: Dict[str, float] = {}
+        self._next_nonce: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._fetch_locks: Dict[str, threading.Lock] = {}
+        self._task: Optional[asyncio.Task] = None
+        # Set by the app in multi-worker mode; None keeps nonces in-process
+        self.nonce_store: Optional["SharedState"] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.reserved = 0
+
+    # Reads
+
+    def get_account(self, address: str, hot: bool = False) -> AccountState:
+        """
+        Get the cached state of an address, fetching it if missing or stale.
+
+        Args:
+            address: Qubic wallet address
+            hot: Keep the address refreshed in the background (internal
+                callers only; never for addresses taken from requests)
+
+        Returns:
+            AccountState
+        """
+        now = time.monotonic()
+        with self._lock:
+            if hot:
+                self._last_read[address] = now
+            account = self.cache.get(address)
+            if account is not None and now - account.fetched_at < self.ttl:
+                self.hits += 1
+                return account
+            self.misses += 1
+            fetch_lock = self._fetch_locks.setdefault(address, threading.Lock())
+
+        # One fetch per address at a time; waiters reuse its result
+        try:
+            with fetch_lock:
+                account = self.cache.get(address)
+                if account is not None and time.monotonic() - account.fetched_at < self.ttl:
+                    return account
+                return self.refresh(address)
+        finally:
+            with self._lock:
+                # Hot addresses keep their lock until they cool down
+                if address not in self._last_read and self._fetch_locks.get(address) is fetch_lock:
+                    del self._fetch_locks[address]
+
+    def get_balance(self, address: str) -> int:
+        """Get the cached balance of an address."""
+        return self.get_account(address).balance
+
+    def refresh(self, address: str) -> AccountState:
+        """Fetch an address from the node and update the cache."""
+        state = self.fetch(address)
+        account = AccountState(
+            address=address,
+            balance=state["balance"],
+            nonce=state.get("nonce", 0),
+            tick=state.get("tick", 0),
+            fetched_at=time.monotonic()
+        )
+        self.cache.set(address, account)
+        with self._lock:
+            # Never hand out a nonce the chain has already used
+            if self._next_nonce.get(address, 0) < account.nonce:
+                self._next_nonce[address] = account.nonce
+        self.refreshes += 1
+        return account
+
+    # Nonces
+
+    def reserve_nonce(self, address: str) -> int:
+        """
+        Reserve the next nonce for a transaction from `address`.
+
+        Args:
+            address: Sending wallet address
+
+        Returns:
+            Nonce to put in the transaction
+        """
+        if self.nonce_store is not None:
+            nonce = self.nonce_store.reserve_nonce(address, floor=self.get_account(address, hot=True).nonce)
+            self.reserved += 1
+            return nonce
+        with self._lock:
+            known = address in self._next_nonce
+        if not known:
+            self.get_account(address, hot=True)
+        with self._lock:
+            nonce = self._next_nonce.get(address, 0)
+            self._next_nonce[address] = nonce + 1
+            self.reserved += 1
+            return nonce
+
+    def release_nonce(self, address: str, nonce: int) -> None:
+        """Return a reserved nonce whose transaction was never submitted."""
+        if self.nonce_store is not None:
+            self.nonce_store.release_nonce(address, nonce)
+            return
+        with self._lock:
+            # Only the most recent reservation can be rolled back without a gap
+            if self._next_nonce.get(address) == nonce + 1:
+                self._next_nonce[address] = nonce
+
+    def resync_nonce(self, address: str) -> int:
+        """Discard local reservations and restart from the chain's nonce."""
+        if self.nonce_store is not None:
+            self.nonce_store.reset_nonce(address)
+        with self._lock:
+            self._next_nonce.pop(address, None)
+        return self.refresh(address).nonce
+
+    def invalidate(self, address: str) -> None:
+        """Drop the cached balance of an address (e.g. after submitting a transaction)."""
+        self.cache.delete(address)
+
+    # Background refresh
+
+    async def start(self) -> None:
+        """Start refreshing hot addresses in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background refresh."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            due = self._due_for_refresh()
+            if not due:
+                continue
+            with tracing.span("wallets.refresh", root=True, attributes={"wallets.addresses": len(due)}):
+                for address in due:
+                    try:
+                        await asyncio.to_thread(self.refresh, address)
+                    except Exception as e:
+                        logger.warning("Wallet refresh failed for %s...: %s", address[:12], e)
+
+    def _due_for_refresh(self):
+        """Hot addresses whose entry expires before the next round."""
+        now = time.monotonic()
+        horizon = self.ttl - self.refresh_interval
+        with self._lock:
+            for address in [a for a, at in self._last_read.items() if now - at > self.hot_window]:
+                del self._last_read[address]
+                self._fetch_locks.pop(address, None)
+            due = []
+            for address in self._last_read:
+                account = self.cache.get(address)
+                if account is None or now - account.fetched_at >= horizon:
+                    due.append(address)
+            return due
+
+    def stats(self) -> Dict:
+        """Return cache counters."""
+        lookups = self.hits + self.misses
+        return {
+            "accounts": len(self.cache),
+            "max_accounts": self.cache.maxsize,
+            "hot_addresses": len(self._last_read),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "refreshes": self.refreshes,
+            "nonces_reserved": self.reserved,
+            "ttl": self.ttl
+        }